@@ -0,0 +1,68 @@
+"""
+⏱️ VidderTech Filter Engine Benchmark
+Built by VidderTech - The Future of Quiz Bots
+
+remove_unwanted_words cost per message as the filter set grows:
+- before: str.replace / re.sub per filter entry
+- after: compiled filter set (str.find or Aho-Corasick for words, precompiled patterns)
+
+Usage: python benchmarks/bench_filter_engine.py [--messages N] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vidder_utils.filter_engine_vidder import compile_filters
+
+PATTERNS = ['regex:@\\w+', 'regex:https?://\\S+', 'regex:t\\.me/\\S+']
+
+def legacy_remove(text: str, filter_words: List[str]) -> str:
+    """Previous loop: one replace or uncompiled re.sub per entry"""
+    for word in filter_words:
+        if word.startswith('regex:'):
+            text = re.sub(word[6:], '', text, flags=re.IGNORECASE)
+        else:
+            text = text.replace(word, '')
+    return text
+
+def measure(func: Callable[[str], str], messages: List[str], repeat: int) -> float:
+    """Best-of-N microseconds per message"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for message in messages:
+            func(message)
+        best = min(best, time.perf_counter() - started)
+    return best / len(messages) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="VidderTech filter engine benchmark")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocab = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(1000)]
+    common = ['the', 'quiz', 'answer', 'question', 'join', '@channel', 'https://t.me/x'] * 30
+    messages = [' '.join(rng.choices(vocab + common, k=80)) for _ in range(args.messages)]
+
+    print(f"⏱️ {args.messages} messages (~{sum(map(len, messages)) // len(messages)} chars), best of {args.repeat}")
+    for count in (10, 50, 100, 250, 500, 1000):
+        filters = vocab[:count] + PATTERNS
+        compiled = compile_filters(frozenset(filters))
+        before = measure(lambda text: legacy_remove(text, filters), messages, args.repeat)
+        after = measure(compiled.apply, messages, args.repeat)
+        engine = "automaton" if compiled._delta else "str.find"
+        print(f"{count:>5} words + {len(PATTERNS)} patterns   before {before:>8.1f}us   "
+              f"after {after:>8.1f}us   x{before / after:.2f}   ({engine})")
+
+if __name__ == "__main__":
+    main()
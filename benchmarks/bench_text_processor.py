@@ -0,0 +1,197 @@
+"""
+⏱️ VidderTech Text Processor Benchmark
+Built by VidderTech - The Future of Quiz Bots
+
+Microbenchmark for question parsing throughput:
+- Line classification: per-line lower()+re.match (before) vs single-pass tokenizer (after)
+- clean_text: chained replace + uncompiled re.sub (before) vs translate table + compiled patterns (after)
+- clean_text throughput on a noisy corpus (CRLF, CR, U+2028/U+2029, NEL, zero-width characters)
+- End-to-end parse_bulk_questions on a generated question bank
+- Peak memory of parse_bulk_questions vs streaming iter_bulk_questions from a file
+- parse_bulk_questions_parallel throughput and event-loop stalls while it runs
+
+Usage: python benchmarks/bench_text_processor.py [--questions N] [--repeat R]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import re
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vidder_utils.text_processor_vidder import VidderTextProcessor, tokenize_lines
+
+# Line endings seen in pasted and imported text
+NOISY_LINE_BREAKS = ('\r\n', '\n', '\u2028', '\r', '\x85', '\u2029')
+
+def build_corpus(count: int, noisy: bool = False) -> List[str]:
+    """Generate question blocks in the ✅ format users paste (noisy: mixed line breaks and zero-width characters)"""
+    blocks = []
+    for i in range(count):
+        correct = i % 4
+        options = [
+            f"{letter}) Option {letter} for question {i}{' ✅' if n == correct else ''}"
+            for n, letter in enumerate("ABCD")
+        ]
+        lines = [
+            f"[{i % 10 + 1}/10] Question {i}: What is the value of item number {i} in the series?",
+            *options,
+            f"Explanation: Item {i} follows the rule described in chapter {i % 12}."
+        ]
+        if noisy:
+            lines[0] = "\ufeff" + lines[0].replace("value", "val\u200bue")
+            lines[2] = "  " + lines[2].replace(" ", "\u200c ", 1) + "\t "
+            blocks.append(NOISY_LINE_BREAKS[i % len(NOISY_LINE_BREAKS)].join(lines))
+        else:
+            blocks.append("\n".join(lines))
+    return blocks
+
+# Reference implementations of the previous code paths
+def legacy_classify(text: str) -> List[tuple]:
+    """Previous per-line loop: lower()+startswith and an uncompiled re.match for each line"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    tokens = [('question', lines[0])] if lines else []
+    for line in lines[1:]:
+        line = line.strip()
+        if line.lower().startswith(('explanation:', 'explain:', 'note:')):
+            tokens.append(('explanation', line.split(':', 1)[1].strip()))
+            continue
+        option_match = re.match(r'^[A-Za-z]\)\s*(.+)$', line)
+        if option_match:
+            tokens.append(('option', option_match.group(1).strip()))
+        else:
+            tokens.append(('text', line))
+    return tokens
+
+def legacy_clean_text(text: str) -> str:
+    """Previous clean_text"""
+    if not text:
+        return ""
+    text = text.replace('\u200c', '')
+    text = text.replace('\u200d', '')
+    text = text.replace('\ufeff', '')
+    text = ' '.join(text.split())
+    text = re.sub(r'\[\d+/\d+\]', '', text)
+    text = re.sub(r'Question \d+:', '', text, flags=re.IGNORECASE)
+    return text.strip()
+
+def measure(func: Callable[[str], object], blocks: List[str], repeat: int) -> float:
+    """Best-of-N blocks per second"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for block in blocks:
+            func(block)
+        best = min(best, time.perf_counter() - started)
+    return len(blocks) / best
+
+async def drain(processor: VidderTextProcessor, source: io.BytesIO) -> int:
+    """Consume the stream the way an importer would: handle one question, drop it"""
+    count = 0
+    async for _ in processor.iter_bulk_questions(source):
+        count += 1
+    return count
+
+async def loop_stall(coro) -> Tuple[object, float]:
+    """Run coro while a 1 ms ticker measures the longest gap the event loop went without running"""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            worst = max(worst, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    result = await coro
+    done = True
+    await task
+    return result, worst
+
+async def compare_parallel(processor: VidderTextProcessor, bulk: str):
+    """Serial vs process-pool bulk parse of the same text"""
+    for title, parse in (("serial", processor.parse_bulk_questions),
+                         (f"parallel x{processor.workers}", processor.parse_bulk_questions_parallel)):
+        started = time.perf_counter()
+        parsed, stall = await loop_stall(parse(bulk))
+        elapsed = time.perf_counter() - started
+        print(f"  {title:<20} {len(parsed) / elapsed:>10,.0f} questions/s   longest loop stall {stall * 1000:>8.1f} ms")
+    processor.close()
+
+def peak_memory(func: Callable[[], object]) -> float:
+    """Peak traced allocation in MB while running func"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def throughput(processor: VidderTextProcessor, blocks: List[str], repeat: int):
+    """clean_text MB/s over a large corpus"""
+    size = sum(len(block.encode('utf-8')) for block in blocks) / (1024 * 1024)
+    rate = measure(processor.clean_text, blocks, repeat)
+    print(f"  {len(blocks):,} blocks, {size:.1f} MB: {rate:,.0f} blocks/s = {rate * size / len(blocks):.1f} MB/s")
+
+def report(title: str, before: float, after: float):
+    print(f"{title:<22} before {before:>12,.0f}/s   after {after:>12,.0f}/s   x{after / before:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="VidderTech text processor benchmark")
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    processor = VidderTextProcessor()
+    blocks = build_corpus(args.questions)
+
+    # Both classifiers must agree before timing them
+    for block in blocks[:100]:
+        assert legacy_classify(block) == tokenize_lines(block), block
+
+    print(f"⏱️ {args.questions} questions, best of {args.repeat}")
+    report("line classification", measure(legacy_classify, blocks, args.repeat),
+           measure(tokenize_lines, blocks, args.repeat))
+    report("clean_text", measure(legacy_clean_text, blocks, args.repeat),
+           measure(processor.clean_text, blocks, args.repeat))
+
+    # Noisy input must normalise to exactly what the clean corpus does
+    noisy = build_corpus(args.questions, noisy=True)
+    for clean_block, noisy_block in zip(blocks, noisy):
+        assert processor.clean_text(noisy_block) == processor.clean_text(clean_block), repr(noisy_block)
+    print("clean_text throughput (clean corpus)")
+    throughput(processor, blocks, args.repeat)
+    print("clean_text throughput (noisy corpus)")
+    throughput(processor, noisy, args.repeat)
+
+    bulk = "\n---\n".join(blocks)
+    started = time.perf_counter()
+    parsed = asyncio.run(processor.parse_bulk_questions(bulk))
+    elapsed = time.perf_counter() - started
+    valid = sum(1 for question in parsed if 'error' not in question)
+    print(f"{'parse_bulk_questions':<22} {len(parsed) / elapsed:,.0f} questions/s ({valid} parsed without error)")
+
+    print("bulk parse event-loop impact")
+    asyncio.run(compare_parallel(processor, bulk))
+
+    # Streaming keeps one block in memory instead of the text plus every result dict
+    payload = bulk.encode('utf-8')
+    del parsed, bulk
+    listed = peak_memory(lambda: asyncio.run(processor.parse_bulk_questions(payload.decode('utf-8'))))
+    streamed = peak_memory(lambda: asyncio.run(drain(processor, io.BytesIO(payload))))
+    print(f"{'peak memory':<22} list {listed:>8.1f} MB   stream {streamed:>8.1f} MB   "
+          f"(input {len(payload) / (1024 * 1024):.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -205,7 +205,7 @@ async def test_database():
             return False
         
         # Test analytics
-        await db_manager._log_analytics("setup_test", 123456789, metadata={"test": True})
+        db_manager._log_analytics("setup_test", 123456789, metadata={"test": True})
         print("✅ Analytics logging test passed")
         
         # Test system stats
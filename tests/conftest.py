@@ -0,0 +1,42 @@
+"""
+🧪 VidderTech Test Configuration
+Built by VidderTech - The Future of Quiz Bots
+
+Shared fixtures: a throwaway database per test and helpers to run coroutines
+and load vidder_core modules.
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Importing vidder_database opens the global database (and its folders) in the working directory
+os.chdir(tempfile.mkdtemp(prefix='vidder-tests-'))
+
+from vidder_database.vidder_database import VidderDatabase
+
+def run(coroutine):
+    """Run a coroutine on a fresh event loop"""
+    return asyncio.run(coroutine)
+
+def load_core_module(name: str):
+    """Load a vidder_core module on its own (the package __init__ pulls in the Telegram application)"""
+    spec = importlib.util.spec_from_file_location(f'{name}_under_test', ROOT / 'vidder_core' / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def database(tmp_path):
+    """A migrated VidderDatabase in a temporary file"""
+    db = VidderDatabase(str(tmp_path / 'vidder_test.db'))
+    yield db
+    db.close()
@@ -0,0 +1,58 @@
+"""
+🧪 Chat actors: answers ordered against control commands (user-022)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import asyncio
+import sqlite3
+
+from conftest import load_core_module, run
+
+VidderActorSystem = load_core_module('vidder_actors').VidderActorSystem
+
+CHAT_ID = -100
+
+def test_answers_follow_pause_and_resume_in_arrival_order(database):
+    sessions = database.sessions
+
+    def set_status(status):
+        return sessions.stage('live', {'status': status})
+
+    def answer(user_id, question):
+        return database.apply_response({
+            'session_id': 'live', 'question_id': f'q{question}', 'user_id': user_id,
+            'selected_answer': 0, 'is_correct': True
+        })
+
+    async def scenario():
+        await database.journal.start(database._snapshot_sessions)
+        actors = VidderActorSystem(sessions, checkpoint_interval=60, idle_timeout=5)
+        actors.start()
+        await sessions.register({'session_id': 'live', 'quiz_id': None, 'group_id': CHAT_ID,
+                                 'participant_id': 1, 'total_questions': 3})
+
+        # Every message is posted before the actor runs any of them
+        calls = [actors.ask(CHAT_ID, answer, user_id, 0) for user_id in range(10)]
+        calls.append(actors.ask(CHAT_ID, set_status, 'paused'))
+        calls += [actors.ask(CHAT_ID, answer, user_id, 1) for user_id in range(5)]
+        calls.append(actors.ask(CHAT_ID, set_status, 'active'))
+        calls += [actors.ask(CHAT_ID, answer, user_id, 2) for user_id in range(5)]
+        results = await asyncio.gather(*calls)
+
+        await database.response_writer.flush()
+        await actors.stop()
+        await database.journal.stop()
+        return results, actors.get_stats()
+
+    results, stats = run(scenario())
+    stored = [result is not None for result in results]
+    assert stored == [True] * 10 + [True] + [False] * 5 + [True] + [True] * 5
+    # Answers were normalised to the option letter and scored on the live board
+    assert {result['selected_answer'] for result in results[:10]} == {'A'}
+    assert all(result['marks_awarded'] == 1.0 for result in results[:10])
+    assert stats['spawned'] == 1
+
+    conn = sqlite3.connect(database.db_path)
+    rows = conn.execute("SELECT question_id, COUNT(*) FROM vidder_responses GROUP BY question_id").fetchall()
+    conn.close()
+    assert sorted(rows) == [('q0', 10), ('q2', 5)]
@@ -0,0 +1,96 @@
+"""
+🧪 Write-behind response batches (user-004)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import sqlite3
+
+from conftest import run
+from vidder_database.vidder_batch import VidderResponseWriter, is_transient_error
+
+def _session_counters(db_path):
+    conn = sqlite3.connect(db_path)
+    row = conn.execute(
+        "SELECT questions_attempted, questions_correct, questions_wrong, questions_skipped, total_score, "
+        "(SELECT COUNT(*) FROM vidder_responses) FROM vidder_quiz_sessions WHERE session_id = 'batch'"
+    ).fetchone()
+    conn.close()
+    return row
+
+def _answers():
+    return [
+        {'response_id': 'r1', 'session_id': 'batch', 'selected_answer': 'A', 'is_correct': True, 'marks_awarded': 1.0},
+        {'response_id': 'r2', 'session_id': 'batch', 'selected_answer': 'B', 'negative_marks_applied': 0.25},
+        {'response_id': 'r3', 'session_id': 'batch', 'selected_answer': None}
+    ]
+
+def _create_session(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO vidder_quiz_sessions (session_id, status) VALUES ('batch', 'active')")
+    conn.commit()
+    conn.close()
+
+def test_a_response_written_twice_is_counted_once(database):
+    _create_session(database.db_path)
+    written = []
+
+    async def scenario():
+        writer = VidderResponseWriter(database.executor, batch_size=2, flush_interval_ms=10,
+                                      on_written=written.append)
+        # The second round replays the same response_ids (e.g. a journal replay after a crash)
+        for answer in _answers() + _answers():
+            await writer.submit(answer)
+        await writer.stop()
+        return writer.get_stats()
+
+    stats = run(scenario())
+    assert _session_counters(database.db_path) == (2, 1, 1, 1, 0.75, 3)
+    assert stats['rows_written'] == 3
+    assert stats['rows_duplicate'] == 3
+    assert sum(written) == 3 and 0 not in written
+
+def test_a_busy_batch_is_retried_not_dropped(database, monkeypatch):
+    _create_session(database.db_path)
+    failures = [sqlite3.OperationalError('database is locked')] * 2
+    commit_batch = VidderResponseWriter._commit_batch
+
+    def flaky_commit(conn, rows):
+        if failures:
+            raise failures.pop()
+        return commit_batch(conn, rows)
+
+    async def scenario():
+        writer = VidderResponseWriter(database.executor, batch_size=10, flush_interval_ms=10)
+        monkeypatch.setattr(writer, '_commit_batch', flaky_commit)
+        for answer in _answers():
+            await writer.submit(answer)
+        await writer.flush()
+        await writer.stop()
+        return writer.get_stats()
+
+    stats = run(scenario())
+    assert stats['retries'] == 2
+    assert stats['rows_failed'] == 0
+    assert _session_counters(database.db_path) == (2, 1, 1, 1, 0.75, 3)
+
+def test_only_busy_and_locked_errors_are_transient():
+    assert is_transient_error(sqlite3.OperationalError('database is locked'))
+    assert is_transient_error(sqlite3.OperationalError('database table is busy'))
+    assert not is_transient_error(sqlite3.OperationalError('no such table: vidder_responses'))
+    assert not is_transient_error(sqlite3.IntegrityError('NOT NULL constraint failed'))
+
+def test_only_the_participants_answers_move_the_session_counters(database):
+    conn = sqlite3.connect(database.db_path)
+    conn.execute("INSERT INTO vidder_quiz_sessions (session_id, participant_id, status) VALUES ('batch', 1, 'active')")
+    conn.commit()
+    conn.close()
+
+    async def scenario():
+        writer = VidderResponseWriter(database.executor, batch_size=10, flush_interval_ms=10)
+        for user_id in (1, 2, 3):
+            await writer.submit({'response_id': f'g{user_id}', 'session_id': 'batch', 'user_id': user_id,
+                                 'selected_answer': 'A', 'is_correct': True, 'marks_awarded': 1.0})
+        await writer.stop()
+
+    run(scenario())
+    assert _session_counters(database.db_path) == (1, 1, 0, 0, 1.0, 3)
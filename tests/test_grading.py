@@ -0,0 +1,198 @@
+"""
+🧪 Vectorized re-grading against a row-by-row reference (user-025)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from conftest import run
+
+pytest.importorskip('numpy')
+
+from vidder_database.vidder_grading import grade_quiz
+from vidder_database.vidder_scoreboard import VidderScoringRules
+
+QUIZ_ID = 'quiz_grading'
+POSITIVE, NEGATIVE = 2.0, 0.5
+RULES = VidderScoringRules(POSITIVE, NEGATIVE, True)
+KEYS = ['A', 'b', ' C ', 'D', None, 'A']
+
+def _populate(db_path: str, seed: int = 7):
+    """A quiz with finished and running attempts; returns the session rows"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO vidder_quizzes (quiz_id, title, total_questions, positive_marks, negative_marks, "
+        "negative_marking_enabled) VALUES (?, 'Grading', ?, ?, ?, 1)",
+        (QUIZ_ID, len(KEYS), POSITIVE, NEGATIVE)
+    )
+    for index, key in enumerate(KEYS):
+        conn.execute(
+            "INSERT INTO vidder_questions (question_id, quiz_id, question_text, correct_answer) VALUES (?, ?, ?, ?)",
+            (f'q{index}', QUIZ_ID, f'Question {index}', key)
+        )
+
+    sessions = []
+    for number in range(60):
+        session_id = f's{number}'
+        status = rng.choice(['completed'] * 5 + ['expired', 'active', 'paused'])
+        conn.execute("INSERT OR IGNORE INTO vidder_users (user_id) VALUES (?)", (number,))
+        conn.execute(
+            "INSERT INTO vidder_quiz_sessions (session_id, quiz_id, participant_id, status, "
+            "total_questions, rank) VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, QUIZ_ID, number, status, rng.choice([0, len(KEYS)]), rng.randint(1, 5))
+        )
+        sessions.append((session_id, status))
+        for index in rng.sample(range(len(KEYS)), rng.randint(0, len(KEYS))):
+            selected = rng.choice(['A', 'a ', 'B', 'C', 'D', None])
+            conn.execute(
+                "INSERT INTO vidder_responses (response_id, session_id, question_id, user_id, selected_answer, "
+                "is_correct, partial_score, marks_awarded, negative_marks_applied) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (f'r{number}_{index}', session_id, f'q{index}', number, selected, rng.randint(0, 1),
+                 rng.choice([0.0, 0.0, 0.0, 0.5, 1.5]), rng.choice([0.0, 1.0]), 0.0)
+            )
+    conn.commit()
+    conn.close()
+    return sessions
+
+def _reference(db_path: str):
+    """Grade every finished attempt one response at a time with the live scoring rule"""
+    conn = sqlite3.connect(db_path)
+    keys = dict(conn.execute("SELECT question_id, correct_answer FROM vidder_questions"))
+    sessions = conn.execute(
+        "SELECT session_id, COALESCE(total_questions, 0) FROM vidder_quiz_sessions "
+        "WHERE quiz_id = ? AND status NOT IN ('active', 'paused')", (QUIZ_ID,)
+    ).fetchall()
+
+    responses, results = {}, {}
+    for session_id, session_questions in sessions:
+        score, attempted, correct_count, skipped = 0.0, 0, 0, 0
+        rows = conn.execute(
+            "SELECT response_id, question_id, selected_answer, is_correct, partial_score "
+            "FROM vidder_responses WHERE session_id = ?", (session_id,)
+        ).fetchall()
+        for response_id, question_id, selected, stored_correct, partial in rows:
+            key = keys.get(question_id)
+            if selected is None:
+                skipped += 1
+                correct = False
+            else:
+                attempted += 1
+                if key is None:
+                    correct = bool(stored_correct)
+                else:
+                    correct = selected.strip().lower() == key.strip().lower()
+                correct_count += correct
+            awarded, negative = RULES.marks(correct, selected is None, partial)
+            responses[response_id] = (int(correct), awarded, negative)
+            score += awarded - negative
+
+        questions = session_questions or len(KEYS) or (attempted + skipped)
+        percentage = round(max(score, 0.0) / (questions * POSITIVE) * 100, 2)
+        results[session_id] = [round(score, 2), percentage, attempted, correct_count,
+                               attempted - correct_count, skipped]
+    conn.close()
+
+    # Competition ranks: 1 + attempts with a strictly higher score
+    units = {session_id: int(round(result[0] * 100)) for session_id, result in results.items()}
+    for session_id, result in results.items():
+        result.append(1 + sum(other > units[session_id] for other in units.values()))
+    return responses, results
+
+def test_grades_match_row_by_row_reference(database):
+    sessions = _populate(database.db_path)
+    expected_responses, expected_sessions = _reference(database.db_path)
+    stored_ranks = dict(sqlite3.connect(database.db_path).execute(
+        "SELECT session_id, rank FROM vidder_quiz_sessions"
+    ))
+
+    report = run(database.regrade_quiz(QUIZ_ID))
+    assert report.sessions == len(expected_sessions)
+    assert report.responses == len(expected_responses)
+
+    conn = sqlite3.connect(database.db_path)
+    for response_id, (correct, awarded, negative) in expected_responses.items():
+        row = conn.execute(
+            "SELECT is_correct, marks_awarded, negative_marks_applied FROM vidder_responses WHERE response_id = ?",
+            (response_id,)
+        ).fetchone()
+        assert row[0] == correct
+        assert row[1] == pytest.approx(awarded)
+        assert row[2] == pytest.approx(negative)
+
+    for session_id, status in sessions:
+        row = conn.execute(
+            "SELECT total_score, percentage, questions_attempted, questions_correct, questions_wrong, "
+            "questions_skipped, quiz_rank, rank FROM vidder_quiz_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        # The live board's per-session rank is never overwritten
+        assert row[7] == stored_ranks[session_id]
+        if status in ('active', 'paused'):
+            assert row[6] is None
+            continue
+        score, percentage, attempted, correct, wrong, skipped, quiz_rank = expected_sessions[session_id]
+        assert row[0] == pytest.approx(score)
+        assert row[1] == pytest.approx(percentage)
+        assert tuple(row[2:7]) == (attempted, correct, wrong, skipped, quiz_rank)
+    conn.close()
+
+def test_regrading_twice_changes_nothing(database):
+    _populate(database.db_path, seed=11)
+    run(database.regrade_quiz(QUIZ_ID))
+
+    report = run(database.regrade_quiz(QUIZ_ID))
+    assert report.responses_changed == 0
+
+    conn = sqlite3.connect(database.db_path)
+    grades = grade_quiz(conn, QUIZ_ID)
+    conn.close()
+    assert len(grades.session_rowids) == 0
+
+def test_tied_attempts_share_a_quiz_rank(database):
+    conn = sqlite3.connect(database.db_path)
+    conn.execute("INSERT INTO vidder_quizzes (quiz_id, title, total_questions) VALUES ('tie', 'Ties', 1)")
+    conn.execute("INSERT INTO vidder_questions (question_id, quiz_id, question_text, correct_answer) "
+                 "VALUES ('tq', 'tie', 'Only question', 'A')")
+    for number, answer in enumerate(['A', 'A', 'B', 'A', None]):
+        conn.execute("INSERT INTO vidder_quiz_sessions (session_id, quiz_id, status) VALUES (?, 'tie', 'completed')",
+                     (f't{number}',))
+        conn.execute("INSERT INTO vidder_responses (response_id, session_id, question_id, selected_answer) "
+                     "VALUES (?, ?, 'tq', ?)", (f'tr{number}', f't{number}', answer))
+    conn.commit()
+
+    run(database.regrade_quiz('tie'))
+    ranks = [row[0] for row in conn.execute(
+        "SELECT quiz_rank FROM vidder_quiz_sessions WHERE quiz_id = 'tie' ORDER BY session_id"
+    )]
+    conn.close()
+    # Right, right, wrong (penalty), right, skipped
+    assert ranks == [1, 1, 5, 1, 4]
+
+def test_group_session_result_counts_only_its_participant(database):
+    conn = sqlite3.connect(database.db_path)
+    conn.execute("INSERT INTO vidder_quizzes (quiz_id, title, total_questions, negative_marking_enabled) "
+                 "VALUES ('group', 'Group', 2, 0)")
+    for index in range(2):
+        conn.execute("INSERT INTO vidder_questions (question_id, quiz_id, question_text, correct_answer) "
+                     "VALUES (?, 'group', ?, 'A')", (f'gq{index}', f'Question {index}'))
+    conn.execute("INSERT INTO vidder_quiz_sessions (session_id, quiz_id, participant_id, group_id, status, "
+                 "total_questions, rank, percentage) VALUES ('g', 'group', 1, -100, 'completed', 2, 1, 100.0)")
+    for user_id in (1, 2, 3):
+        for index in range(2):
+            conn.execute("INSERT INTO vidder_responses (response_id, session_id, question_id, user_id, "
+                         "selected_answer) VALUES (?, 'g', ?, ?, 'A')", (f'g{user_id}_{index}', f'gq{index}', user_id))
+    conn.commit()
+
+    run(database.regrade_quiz('group'))
+    session = conn.execute("SELECT total_score, percentage, questions_attempted, questions_correct, rank "
+                           "FROM vidder_quiz_sessions WHERE session_id = 'g'").fetchone()
+    average = conn.execute("SELECT average_score FROM vidder_quizzes WHERE quiz_id = 'group'").fetchone()[0]
+    # Every player's answers are re-graded, but the session row is the participant's attempt
+    graded = conn.execute("SELECT COUNT(*) FROM vidder_responses WHERE session_id = 'g' AND marks_awarded = 1.0").fetchone()
+    conn.close()
+    assert session == (2.0, 100.0, 2, 2, 1)
+    assert average == 100.0
+    assert graded == (6,)
@@ -0,0 +1,147 @@
+"""
+🧪 Session journal and crash recovery (user-023)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from conftest import run
+from vidder_database.vidder_journal import (
+    FRAME_HEADER, VidderSessionJournal, decode_records, encode_record
+)
+
+async def _noop_snapshot():
+    return None
+
+def _segment_numbers(directory):
+    return sorted(int(path.name[len('session-'):-len('.journal')]) for path in directory.glob('session-*.journal'))
+
+def test_records_round_trip():
+    records = [['open', {'session_id': 's1', 'status': 'active'}], ['set', 's1', {'current_question': 2}, None]]
+    data = b''.join(encode_record(record) for record in records)
+    assert decode_records(data) == (records, len(data))
+
+@pytest.mark.parametrize('cut', [1, FRAME_HEADER.size - 1, FRAME_HEADER.size + 3])
+def test_torn_tail_is_dropped(cut):
+    intact = encode_record(['set', 's1', {'current_question': 1}, None])
+    torn = encode_record(['set', 's1', {'current_question': 2}, None])[:cut]
+    records, end = decode_records(intact + torn)
+    assert records == [['set', 's1', {'current_question': 1}, None]]
+    assert end == len(intact)
+
+def test_corrupt_record_stops_replay():
+    first = encode_record(['answer', {'response_id': 'r1'}])
+    second = bytearray(encode_record(['answer', {'response_id': 'r2'}]))
+    second[-2] ^= 0xFF
+    third = encode_record(['answer', {'response_id': 'r3'}])
+    records, end = decode_records(first + bytes(second) + third)
+    assert records == [['answer', {'response_id': 'r1'}]]
+    assert end == len(first)
+
+def test_replay_reads_segments_in_order_up_to_a_torn_write(tmp_path):
+    async def scenario():
+        journal = VidderSessionJournal(str(tmp_path), fsync_interval_ms=0)
+        await journal.start(_noop_snapshot)
+        journal.append('open', {'session_id': 's1'})
+        journal.append('set', 's1', {'current_question': 1}, None)
+        await journal.sync()
+        # Simulate a crash: the file handle is abandoned without a final snapshot
+        journal._flush_task.cancel()
+        journal._snapshot_task.cancel()
+        journal._file.close()
+        with open(journal._segment_path(journal.segment), 'ab') as handle:
+            handle.write(encode_record(['set', 's1', {'current_question': 2}, None])[:-4])
+
+        recovered = VidderSessionJournal(str(tmp_path))
+        return await recovered.replay(), recovered.stats['torn_bytes']
+
+    records, torn_bytes = run(scenario())
+    assert records == [['open', {'session_id': 's1'}], ['set', 's1', {'current_question': 1}, None]]
+    assert torn_bytes > 0
+
+def test_snapshot_drops_older_segments_of_this_run(tmp_path):
+    async def scenario():
+        journal = VidderSessionJournal(str(tmp_path), fsync_interval_ms=0, snapshot_interval=3600)
+        await journal.start(_noop_snapshot)
+        journal.append('set', 's1', {'current_question': 1}, None)
+        await journal.sync()
+        await journal.snapshot()
+        numbers = _segment_numbers(tmp_path)
+        await journal.stop()
+        return numbers
+
+    assert run(scenario()) == [2]
+    # stop() took a final snapshot and removed its empty segment
+    assert _segment_numbers(tmp_path) == []
+
+def test_unreplayed_segments_survive_snapshots_and_stop(tmp_path):
+    (tmp_path / 'session-0000000001.journal').write_bytes(encode_record(['set', 's1', {'current_question': 4}, None]))
+
+    async def scenario():
+        journal = VidderSessionJournal(str(tmp_path), fsync_interval_ms=0, snapshot_interval=3600)
+        await journal.replay()
+        # Replay failed, so discard_replayed() is never called
+        await journal.start(_noop_snapshot)
+        journal.append('set', 's2', {'current_question': 1}, None)
+        await journal.snapshot()
+        await journal.stop()
+
+        again = VidderSessionJournal(str(tmp_path))
+        return await again.replay()
+
+    assert run(scenario()) == [['set', 's1', {'current_question': 4}, None]]
+
+def test_discard_replayed_removes_previous_run(tmp_path):
+    (tmp_path / 'session-0000000001.journal').write_bytes(encode_record(['set', 's1', {'current_question': 4}, None]))
+
+    async def scenario():
+        journal = VidderSessionJournal(str(tmp_path), fsync_interval_ms=0, snapshot_interval=3600)
+        await journal.replay()
+        await journal.start(_noop_snapshot)
+        await journal.discard_replayed()
+        numbers = _segment_numbers(tmp_path)
+        await journal.stop()
+        return numbers
+
+    assert run(scenario()) == [2]
+
+def test_snapshot_waits_for_a_checkpoint_already_in_flight(database, monkeypatch):
+    sessions = database.sessions
+    committed = []
+    release = threading.Event()
+    original = sessions._write_many
+
+    def slow_write_many(conn, rows, inserts=None):
+        # Holds the first checkpoint's transaction open until the snapshot has started
+        release.wait(5)
+        written = original(conn, rows, inserts)
+        committed.append(set(rows))
+        return written
+
+    async def scenario():
+        await database.journal.start(database._snapshot_sessions)
+        await sessions.register({'session_id': 's1', 'quiz_id': 'q', 'group_id': -1, 'total_questions': 5})
+        monkeypatch.setattr(sessions, '_write_many', slow_write_many)
+
+        sessions.stage('s1', {'current_question': 3})
+        actor_checkpoint = asyncio.create_task(sessions.checkpoint())
+        await asyncio.sleep(0.05)
+        snapshot = asyncio.create_task(database.journal.snapshot())
+        await asyncio.sleep(0.05)
+        # The snapshot must not have finished (or dropped segments) before the commit
+        finished_early = snapshot.done()
+        release.set()
+        await asyncio.gather(actor_checkpoint, snapshot)
+        await database.journal.stop()
+        return finished_early
+
+    assert run(scenario()) is False
+    assert committed and committed[0] == {'s1'}
+    row = sqlite3.connect(database.db_path).execute(
+        "SELECT current_question FROM vidder_quiz_sessions WHERE session_id = 's1'"
+    ).fetchone()
+    assert row == (3,)
@@ -0,0 +1,42 @@
+"""
+🧪 Hot query plans on a migrated schema (user-008)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import sqlite3
+
+import pytest
+
+from vidder_database.vidder_migrations import VidderMigrator
+from vidder_database.vidder_models import VIDDER_DATABASE_SCHEMA
+from vidder_database.vidder_query_plans import (
+    VidderQueryPlanError, check_query_plans, verify_query_plans
+)
+
+@pytest.fixture
+def schema():
+    """A fresh in-memory database with the baseline schema and every migration"""
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(VIDDER_DATABASE_SCHEMA)
+    VidderMigrator().migrate(conn)
+    yield conn
+    conn.close()
+
+def test_every_hot_query_uses_its_index_without_sorting(schema):
+    assert check_query_plans(schema) == {}
+
+def test_a_dropped_index_fails_the_strict_check(schema):
+    schema.execute("DROP INDEX idx_sessions_group_paused")
+    failures = check_query_plans(schema)
+    assert list(failures) == ['group_paused_session']
+
+    with pytest.raises(VidderQueryPlanError):
+        verify_query_plans(schema, strict=True)
+
+def test_a_sort_fails_the_check_even_when_the_index_is_used(schema):
+    # Without paused_at in an index the planner still searches by group, then sorts
+    schema.execute("DROP INDEX idx_sessions_group_paused")
+    schema.execute("CREATE INDEX idx_sessions_group_paused ON vidder_quiz_sessions(group_id) WHERE status = 'paused'")
+    failures = check_query_plans(schema)
+    assert list(failures) == ['group_paused_session']
+    assert 'USE TEMP B-TREE' in failures['group_paused_session']
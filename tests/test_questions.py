@@ -0,0 +1,54 @@
+"""
+🧪 Question import: duplicates and answer keys (user-019)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import sqlite3
+
+from conftest import run
+
+QUESTION = {
+    'question_text': 'Which planet is known as the Red Planet?',
+    'options': ['Venus', 'Mars', 'Jupiter', 'Saturn'],
+    'correct_answer': 1
+}
+
+def _create_quizzes(db_path, *quiz_ids):
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO vidder_quizzes (quiz_id, title) VALUES (?, ?)",
+                     [(quiz_id, quiz_id) for quiz_id in quiz_ids])
+    conn.commit()
+    conn.close()
+
+def _stored(db_path, quiz_id):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT correct_answer FROM vidder_questions WHERE quiz_id = ?", (quiz_id,)).fetchall()
+    total = conn.execute("SELECT total_questions FROM vidder_quizzes WHERE quiz_id = ?", (quiz_id,)).fetchone()[0]
+    conn.close()
+    return rows, total
+
+def test_the_same_question_can_be_added_to_another_quiz(database):
+    _create_quizzes(database.db_path, 'qa', 'qb')
+
+    first = run(database.add_questions('qa', [QUESTION]))
+    second = run(database.add_questions('qb', [dict(QUESTION)]))
+
+    assert len(first['added']) == 1 and len(second['added']) == 1
+    assert second['duplicates'] == []
+    assert _stored(database.db_path, 'qb') == ([('B',)], 1)
+
+def test_a_repeat_in_the_same_quiz_is_skipped(database):
+    _create_quizzes(database.db_path, 'qa')
+    run(database.add_questions('qa', [QUESTION]))
+
+    near_copy = {**QUESTION, 'question_text': 'Which planet is known as the Red Planet ?'}
+    result = run(database.add_questions('qa', [near_copy]))
+
+    assert result['added'] == []
+    assert [duplicate['position'] for duplicate in result['duplicates']] == [0]
+    assert _stored(database.db_path, 'qa') == ([('B',)], 1)
+
+def test_missing_answer_keys_are_stored_as_null(database):
+    _create_quizzes(database.db_path, 'qa')
+    run(database.add_questions('qa', [{**QUESTION, 'correct_answer': None}]))
+    assert _stored(database.db_path, 'qa') == ([(None,)], 1)
@@ -0,0 +1,227 @@
+"""
+🧪 Timer wheel on a fake clock (user-021)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import load_core_module, run
+
+vidder_scheduler_module = load_core_module('vidder_scheduler')
+VidderScheduler = vidder_scheduler_module.VidderScheduler
+MAX_CATCH_UP_TICKS = vidder_scheduler_module.MAX_CATCH_UP_TICKS
+WHEEL_SIZE = vidder_scheduler_module.WHEEL_SIZE
+
+# A power of two, so tick arithmetic on the fake clock is exact
+TICK = 0.125
+
+class FakeClock:
+    """Stands in for the time module inside the scheduler"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(vidder_scheduler_module, 'time', fake)
+    return fake
+
+@pytest.fixture
+def scheduler(clock):
+    return VidderScheduler(tick=TICK)
+
+class Recorder:
+    """Timer callback that remembers each batch it was given"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, batch):
+        self.batches.append(sorted(timer.key for timer in batch))
+
+    @property
+    def fired(self):
+        return sorted(key for batch in self.batches for key in batch)
+
+async def advance(scheduler, clock, seconds):
+    """Move the fake clock and run one scheduler pass, as _run does after its sleep"""
+    clock.now += seconds
+    fired = scheduler._advance(scheduler._now_tick())
+    if fired:
+        scheduler._dispatch(fired)
+    # Let the dispatched callbacks run
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+def test_a_timer_fires_at_its_deadline_and_never_early(scheduler, clock):
+    recorder = Recorder()
+
+    async def scenario():
+        scheduler.schedule('q', 1.0, recorder)
+        await advance(scheduler, clock, 1.0 - TICK)
+        early = list(recorder.fired)
+        await advance(scheduler, clock, TICK)
+        return early
+
+    assert run(scenario()) == []
+    assert recorder.fired == ['q']
+    assert 'q' not in scheduler and scheduler.get_stats()['running'] == 0
+
+def test_timers_due_on_the_same_tick_fire_as_one_batch_per_callback(scheduler, clock):
+    first, second = Recorder(), Recorder()
+
+    async def scenario():
+        for key in range(5):
+            scheduler.schedule(f'a{key}', 2.0, first)
+        scheduler.schedule('b', 2.0, second)
+        scheduler.schedule('later', 3.0, first)
+        await advance(scheduler, clock, 2.0)
+
+    run(scenario())
+    assert first.batches == [['a0', 'a1', 'a2', 'a3', 'a4']]
+    assert second.batches == [['b']]
+    assert scheduler.stats['batches'] == 2 and scheduler.stats['largest_batch'] == 5
+    assert list(scheduler._timers) == ['later']
+
+def test_pause_keeps_the_time_left_until_resume(scheduler, clock):
+    recorder = Recorder()
+
+    async def scenario():
+        scheduler.schedule('q', 4.0, recorder)
+        await advance(scheduler, clock, 1.0)
+        left = scheduler.pause('q')
+        # Time spent paused does not count
+        await advance(scheduler, clock, 30.0)
+        paused_fired = list(recorder.fired)
+        scheduler.resume('q')
+        await advance(scheduler, clock, 3.0 - TICK)
+        before = list(recorder.fired)
+        await advance(scheduler, clock, TICK)
+        return left, paused_fired, before
+
+    left, paused_fired, before = run(scenario())
+    assert left == pytest.approx(3.0)
+    assert paused_fired == [] and before == []
+    assert recorder.fired == ['q']
+
+def test_rerate_keeps_the_quiz_time_left(scheduler, clock):
+    recorder = Recorder()
+
+    async def scenario():
+        scheduler.schedule('fast', 4.0, recorder)
+        scheduler.schedule('slow', 4.0, recorder)
+        await advance(scheduler, clock, 1.0)
+        # 3 quiz seconds left each: 1.5 real seconds at double speed, 6 at half speed
+        scheduler.rerate('fast', 2.0)
+        scheduler.rerate('slow', 0.5)
+        left = (scheduler.remaining('fast'), scheduler.remaining('slow'))
+        await advance(scheduler, clock, 1.5 - TICK)
+        none_yet = list(recorder.fired)
+        await advance(scheduler, clock, TICK)
+        fast_only = list(recorder.fired)
+        await advance(scheduler, clock, 4.5)
+        return left, none_yet, fast_only
+
+    left, none_yet, fast_only = run(scenario())
+    assert left == (pytest.approx(3.0), pytest.approx(3.0))
+    assert none_yet == [] and fast_only == ['fast']
+    assert recorder.fired == ['fast', 'slow']
+
+def test_rerate_while_paused_applies_on_resume(scheduler, clock):
+    recorder = Recorder()
+
+    async def scenario():
+        scheduler.schedule('q', 2.0, recorder)
+        scheduler.pause('q')
+        scheduler.rerate('q', 4.0)
+        scheduler.resume('q')
+        await advance(scheduler, clock, 0.5)
+
+    run(scenario())
+    assert recorder.fired == ['q']
+
+def test_timers_cascade_down_the_wheel_levels_to_their_exact_tick(scheduler, clock):
+    deadlines = [1, WHEEL_SIZE - 1, WHEEL_SIZE, WHEEL_SIZE + 1, WHEEL_SIZE ** 2 - 1,
+                 WHEEL_SIZE ** 2, WHEEL_SIZE ** 2 + 1, WHEEL_SIZE ** 3 + 7]
+    for deadline in deadlines:
+        scheduler.schedule(deadline, deadline * TICK, None)
+    levels = {timer.key: timer.level for timer in scheduler._timers.values()}
+    assert levels[1] == 0 and levels[WHEEL_SIZE] == 1 and levels[WHEEL_SIZE ** 2] == 2
+    assert levels[WHEEL_SIZE ** 3 + 7] == 3
+
+    # Step by whole wheel turns (no catch-up) and note the window each timer fired in
+    fired_in = {}
+    while len(fired_in) < len(deadlines):
+        start = scheduler._tick
+        clock.now += MAX_CATCH_UP_TICKS * TICK
+        for timer in scheduler._advance(scheduler._now_tick()):
+            fired_in[timer.key] = (start, scheduler._tick)
+    assert all(start < deadline <= end for deadline, (start, end) in fired_in.items())
+
+    # Tick by tick, the last timer fires exactly on its deadline
+    scheduler.schedule('exact', (WHEEL_SIZE ** 2 + 3) * TICK, None)
+    deadline = scheduler.get('exact').deadline
+    fired_at = None
+    while fired_at is None:
+        clock.now += TICK
+        if scheduler._advance(scheduler._now_tick()):
+            fired_at = scheduler._tick
+    assert fired_at == deadline
+
+def test_a_clock_jump_fires_overdue_timers_in_one_pass(scheduler, clock):
+    recorder = Recorder()
+
+    async def scenario():
+        scheduler.schedule('one', 1.0, recorder)
+        scheduler.schedule('five', 5.0, recorder)
+        scheduler.schedule('hundred', 100.0, recorder)
+        # Far more than MAX_CATCH_UP_TICKS behind, e.g. after a suspended VM
+        await advance(scheduler, clock, 30.0)
+        overdue = list(recorder.batches)
+        await advance(scheduler, clock, 70.0 - TICK)
+        await advance(scheduler, clock, TICK)
+        return overdue
+
+    overdue = run(scenario())
+    assert overdue == [['five', 'one']]
+    assert scheduler.stats['catch_ups'] >= 1
+    assert recorder.fired == ['five', 'hundred', 'one']
+
+def test_a_callback_can_schedule_its_key_again(scheduler, clock):
+    rounds = []
+
+    async def next_question(batch):
+        rounds.append(batch[0].payload)
+        if batch[0].payload < 3:
+            scheduler.schedule('q', 1.0, next_question, payload=batch[0].payload + 1)
+
+    async def scenario():
+        scheduler.schedule('q', 1.0, next_question, payload=1)
+        for _ in range(5):
+            await advance(scheduler, clock, 1.0)
+
+    run(scenario())
+    assert rounds == [1, 2, 3]
+    assert 'q' not in scheduler
+
+def test_the_running_loop_delivers_timers_on_the_real_clock():
+    scheduler = VidderScheduler(tick=0.01)
+    recorder = Recorder()
+
+    async def scenario():
+        scheduler.start()
+        scheduler.schedule('q', 0.05, recorder)
+        for _ in range(100):
+            if recorder.fired:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    run(scenario())
+    assert recorder.fired == ['q']
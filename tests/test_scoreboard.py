@@ -0,0 +1,78 @@
+"""
+🧪 Live scoreboard ranks and ties (user-024)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+import random
+
+import pytest
+
+from conftest import run
+from vidder_database.vidder_scoreboard import (
+    SCORE_SCALE, VidderScoreboard, VidderScoreboards, VidderScoringRules
+)
+
+def _brute_force_ranks(board: VidderScoreboard):
+    """Competition ranks by sorting every participant's score"""
+    units = {user_id: round(board.standing(user_id).score * SCORE_SCALE) for user_id in board._entries}
+    return {user_id: 1 + sum(other > mine for other in units.values()) for user_id, mine in units.items()}
+
+def test_ties_share_a_rank_and_skip_the_next():
+    board = VidderScoreboard('s', VidderScoringRules(1.0, 0.25, True), total_questions=3)
+    for user_id, answers in {1: [True, True], 2: [True, False], 3: [True, True], 4: [False]}.items():
+        for is_correct in answers:
+            board.record(user_id, is_correct)
+
+    assert [board.rank(user_id) for user_id in (1, 2, 3, 4)] == [1, 3, 1, 4]
+    assert [(standing.rank, standing.user_id) for standing in board.top(10)] == [(1, 1), (1, 3), (3, 2), (4, 4)]
+    assert board.rank(99) is None
+
+def test_marks_follow_the_quiz_rules():
+    rules = VidderScoringRules(2.0, 0.5, True)
+    assert rules.marks(True, False) == (2.0, 0.0)
+    assert rules.marks(False, False) == (0.0, 0.5)
+    assert rules.marks(False, True) == (0.0, 0.0)
+    assert VidderScoringRules(2.0, 0.5, False).marks(False, False) == (0.0, 0.0)
+    # Partial credit replaces the penalty on a wrong answer
+    assert rules.marks(False, False, partial=0.25) == (0.5, 0.0)
+    assert rules.marks(False, False, partial=3.0) == (2.0, 0.0)
+    assert rules.marks(True, False, partial=0.25) == (2.0, 0.0)
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_random_answers_match_a_sorted_board(seed):
+    rng = random.Random(seed)
+    board = VidderScoreboard('s', VidderScoringRules(1.0, 0.33, True), total_questions=0)
+    for _ in range(3000):
+        user_id = rng.randrange(200)
+        board.record(user_id, rng.random() < 0.6, skipped=rng.random() < 0.1)
+
+    expected = _brute_force_ranks(board)
+    assert {user_id: board.rank(user_id) for user_id in expected} == expected
+
+    top = board.top(25)
+    assert len(top) == 25
+    assert [standing.rank for standing in top] == sorted(expected[standing.user_id] for standing in top)
+    assert all(standing.rank == expected[standing.user_id] for standing in top)
+
+def test_scores_outside_the_initial_range_widen_the_board():
+    board = VidderScoreboard('s', VidderScoringRules(1.0, 0.25, True), total_questions=2)
+    board.restore(1, 50.0, 50, 0, 0)
+    board.restore(2, -40.0, 0, 40, 0)
+    board.record(3, True)
+
+    assert [board.rank(user_id) for user_id in (1, 3, 2)] == [1, 2, 3]
+    assert _brute_force_ranks(board) == {1: 1, 3: 2, 2: 3}
+
+def test_registry_scores_answers_and_finishes_with_final_ranks(database):
+    async def scenario():
+        boards = VidderScoreboards(database.executor)
+        session = {'session_id': 'live', 'quiz_id': None, 'participant_id': 2, 'total_questions': 2}
+        for user_id, is_correct in [(1, True), (2, True), (1, True), (2, False), (3, True)]:
+            await boards.score(session, {'user_id': user_id, 'selected_answer': 'A', 'is_correct': is_correct})
+        return boards.finish(session), boards.peek('live')
+
+    (updates, patch), board = run(scenario())
+    # Default rules without a quiz row: 1 mark per right answer, 0.25 off per wrong one
+    assert updates == {'rank': 3, 'percentage': 37.5}
+    assert patch == {'standings': [[1, 1, 2.0], [2, 3, 1.0], [3, 2, 0.75]]}
+    assert board is None
@@ -0,0 +1,22 @@
+"""
+🧪 Live statistics counters (user-006, user-007)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+from conftest import run
+
+def test_active_quizzes_counts_running_sessions_across_restarts(database):
+    async def scenario():
+        # One quiz running in two chats
+        for session_id, group_id in (('chat_a', -1), ('chat_b', -2)):
+            await database.sessions.register({'session_id': session_id, 'quiz_id': 'shared',
+                                              'group_id': group_id, 'total_questions': 5})
+        live = database.stats.totals['active_quizzes']
+
+        # A restart seeds the counter from the database, and the registry keeps it in step
+        await database.stats.load()
+        seeded = database.stats.totals['active_quizzes']
+        await database.sessions.update('chat_a', {'status': 'completed'})
+        return live, seeded, database.stats.totals['active_quizzes']
+
+    assert run(scenario()) == (2, 2, 1)
@@ -0,0 +1,39 @@
+"""
+🧪 Per-user content filters (user-018)
+Built by VidderTech - The Future of Quiz Bots
+"""
+
+from conftest import run
+from vidder_utils.text_processor_vidder import vidder_text_processor
+
+MESSAGE = "Spoiler: the answer is B, call 555-1234"
+
+def test_user_filter_set_is_applied_to_text(database):
+    async def scenario():
+        await database.update_user_filters(42, add=['Spoiler:', r'regex:\d{3}-\d{4}'])
+        return await database.get_user_filters(42)
+
+    filters = run(scenario())
+    assert filters == frozenset({'Spoiler:', r'regex:\d{3}-\d{4}'})
+    assert vidder_text_processor.remove_unwanted_words(MESSAGE, filters) == "the answer is B, call"
+
+def test_removed_filter_stops_applying(database):
+    async def scenario():
+        await database.update_user_filters(42, add=['Spoiler:', r'regex:\d{3}-\d{4}'])
+        await database.get_user_filters(42)
+        await database.update_user_filters(42, remove=[r'regex:\d{3}-\d{4}'])
+        return await database.get_user_filters(42)
+
+    filters = run(scenario())
+    assert vidder_text_processor.remove_unwanted_words(MESSAGE, filters) == "the answer is B, call 555-1234"
+
+def test_incoming_text_goes_through_the_senders_filters(database):
+    async def scenario():
+        await database.update_user_filters(7, add=['Spoiler:'])
+        return (await database.apply_user_filters(7, MESSAGE),
+                await database.apply_user_filters(8, MESSAGE))
+
+    filtered, untouched = run(scenario())
+    assert filtered == "the answer is B, call 555-1234"
+    # Users without filters get their text back as sent
+    assert untouched == MESSAGE
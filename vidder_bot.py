@@ -13,14 +13,20 @@ Complete Telegram Bot with 35+ commands and advanced features:
 - Premium features and user management
 """
 
+import re
+import inspect
 import asyncio
 import logging
 import sys
 import signal
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable, List
 
-from telegram import Update, BotCommand
+from telegram import (
+    Update, BotCommand, InlineKeyboardButton, InlineKeyboardMarkup,
+    InlineQueryResultArticle, InputTextMessageContent
+)
 from telegram.ext import (
     Application, ApplicationBuilder, ContextTypes,
     CommandHandler, MessageHandler, CallbackQueryHandler,
@@ -31,6 +37,9 @@ from telegram.constants import ParseMode
 # Import VidderTech configuration and database
 from vidder_config import config, messages, VIDDER_BANNER
 from vidder_database.vidder_database import db_manager
+from vidder_utils.text_processor_vidder import vidder_text_processor
+from vidder_core.vidder_scheduler import vidder_scheduler
+from vidder_core.vidder_actors import vidder_actors
 
 # Import all VidderTech handlers
 from vidder_handlers.basic_vidder import register_basic_handlers
@@ -78,6 +87,7 @@ class VidderTechQuizBot:
     
     def __init__(self):
         self.app = None
+        self.control_handlers = None
         self.start_time = datetime.now()
         self.is_running = False
         self.shutdown_requested = False
@@ -105,9 +115,16 @@ class VidderTechQuizBot:
             # Print startup banner
             print(VIDDER_BANNER)
             
-            # Initialize database with comprehensive schema
+            # Database schema is created on import; start storage maintenance
             logger.info("🗄️ Initializing VidderTech database...")
-            db_manager._init_database()
+            await db_manager.start_maintenance()
+            await db_manager.response_writer.start()
+            await db_manager.stats.start()
+            await db_manager.sessions.load()
+            await db_manager.recover_sessions()
+            await db_manager.presence.start()
+            vidder_scheduler.start()
+            vidder_actors.start()
             
             # Create Telegram application
             logger.info("📱 Creating Telegram application...")
@@ -124,6 +141,10 @@ class VidderTechQuizBot:
             # Register all handlers
             await self.register_all_handlers()
             
+            # Restart question timers for quizzes that were running before a restart
+            if self.control_handlers:
+                self.control_handlers.resume_live_sessions()
+            
             # Setup error handling
             self.app.add_error_handler(self.error_handler)
             
@@ -230,7 +251,7 @@ class VidderTechQuizBot:
             register_basic_handlers(self.app)
             register_auth_handlers(self.app)  
             register_quiz_handlers(self.app)
-            register_control_handlers(self.app)
+            self.control_handlers = register_control_handlers(self.app)
             
             # Register remaining command handlers
             self._register_additional_commands()
@@ -368,8 +389,8 @@ Use /create to make quizzes and manually track submissions.
         """💎 Premium features and upgrade system"""
         await self._log_command_usage(update, "premium")
         
-        user_data = await db_manager.get_user(update.effective_user.id)
-        is_premium = user_data and user_data.get('is_premium', False)
+        access = await db_manager.get_user_access(update.effective_user.id)
+        is_premium = bool(access and access.is_premium)
         
         if is_premium:
             premium_message = f"""
@@ -390,7 +411,7 @@ Use /create to make quizzes and manually track submissions.
 
 📊 **Premium Account Status:**
 💳 Plan: `Premium Monthly`
-📅 Expires: `{user_data.get('premium_expires', 'Never')}`
+📅 Expires: `{access.premium_expires or 'Never'}`
 🔄 Auto-renewal: `Enabled`
 
 🚀 **Exclusive Premium Features:**
@@ -481,37 +502,104 @@ Get **7 days FREE trial** + 50% discount on first month!
     # ===== ALL REMAINING COMMAND IMPLEMENTATIONS =====
     
     # Filter Commands
+    @staticmethod
+    def _parse_filter_args(update: Update) -> List[str]:
+        """Filter entries after the command: one per line, or comma-separated (regex: entries take a whole line)"""
+        parts = (update.message.text or "").split(maxsplit=1)
+        if len(parts) < 2:
+            return []
+        entries = []
+        for line in parts[1].splitlines():
+            line = line.strip()
+            if line.startswith('regex:'):
+                entries.append(line)
+            else:
+                entries.extend(word.strip() for word in line.split(',') if word.strip())
+        return entries
+    
+    @staticmethod
+    def _format_filters(filters) -> str:
+        """Sorted filter list for Markdown replies"""
+        return "\n".join("• `" + entry.replace('`', "'") + "`" for entry in sorted(filters))
+    
     async def add_filter_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """➕ Add words to content filter"""
         await self._log_command_usage(update, "addfilter")
+        entries = self._parse_filter_args(update)
+        if not entries:
+            await update.message.reply_text(
+                "➕ **VidderTech Smart Filtering**\n\n"
+                "**Usage:** `/addfilter word1, word2`\n"
+                "Regex patterns go on their own line: `regex:@\\w+`\n\n"
+                f"🚀 **{config.COMPANY_NAME} - Intelligence in Every Feature!**",
+                parse_mode=ParseMode.MARKDOWN
+            )
+            return
+        
+        invalid = []
+        for entry in entries:
+            if entry.startswith('regex:'):
+                try:
+                    re.compile(entry[len('regex:'):])
+                except re.error:
+                    invalid.append(entry)
+        if invalid:
+            await update.message.reply_text(
+                f"❌ **Invalid regex pattern**\n\n{self._format_filters(invalid)}",
+                parse_mode=ParseMode.MARKDOWN
+            )
+            return
+        
+        filters = await db_manager.update_user_filters(update.effective_user.id, add=entries)
+        if filters is None:
+            await update.message.reply_text(messages.ERROR_DATABASE)
+            return
         await update.message.reply_text(
-            "➕ **VidderTech Smart Filtering**\n\n"
-            "🚧 Advanced filtering system coming soon!\n\n"
-            "🧠 **Will include:**\n"
-            "• AI-powered content filtering\n"
-            "• Custom word blacklists\n"
-            "• Regex pattern support\n"
-            "• Context-aware filtering\n\n"
-            f"🚀 **{config.COMPANY_NAME} - Intelligence in Every Feature!**",
+            f"✅ **Filters Added**\n\n{self._format_filters(entries)}\n\n"
+            f"📊 **Active filters:** {len(filters)}",
             parse_mode=ParseMode.MARKDOWN
         )
     
     async def remove_filter_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """➖ Remove words from filter"""
         await self._log_command_usage(update, "removefilter")
+        entries = self._parse_filter_args(update)
+        if not entries:
+            await update.message.reply_text(
+                "➖ **Remove Content Filters**\n\n"
+                "**Usage:** `/removefilter word1, word2`\n\n"
+                f"🚀 **{config.COMPANY_NAME} - Precision Control!**",
+                parse_mode=ParseMode.MARKDOWN
+            )
+            return
+        
+        user_id = update.effective_user.id
+        before = await db_manager.get_user_filters(user_id)
+        filters = await db_manager.update_user_filters(user_id, remove=entries)
+        if filters is None:
+            await update.message.reply_text(messages.ERROR_DATABASE)
+            return
+        removed = before - filters
         await update.message.reply_text(
-            "➖ **Remove Content Filters**\n\n"
-            "🚧 Filter management coming soon!\n\n"
-            f"🚀 **{config.COMPANY_NAME} - Precision Control!**",
+            (f"✅ **Filters Removed**\n\n{self._format_filters(removed)}" if removed
+             else "ℹ️ None of those words were in your filters.")
+            + f"\n\n📊 **Active filters:** {len(filters)}",
             parse_mode=ParseMode.MARKDOWN
         )
     
     async def list_filters_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """📋 List all active filters"""
         await self._log_command_usage(update, "listfilters")
+        filters = await db_manager.get_user_filters(update.effective_user.id)
+        if not filters:
+            await update.message.reply_text(
+                "📋 **Active Content Filters**\n\n"
+                "No filters yet. Add some with `/addfilter word1, word2`",
+                parse_mode=ParseMode.MARKDOWN
+            )
+            return
         await update.message.reply_text(
-            "📋 **Active Content Filters**\n\n"
-            "🚧 Filter dashboard coming soon!\n\n"
+            f"📋 **Active Content Filters ({len(filters)})**\n\n{self._format_filters(filters)}\n\n"
             f"🚀 **{config.COMPANY_NAME} - Complete Control!**",
             parse_mode=ParseMode.MARKDOWN
         )
@@ -519,9 +607,12 @@ Get **7 days FREE trial** + 50% discount on first month!
     async def clear_filters_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """🗑️ Clear all filters"""
         await self._log_command_usage(update, "clearfilters")
+        filters = await db_manager.update_user_filters(update.effective_user.id, clear=True)
+        if filters is None:
+            await update.message.reply_text(messages.ERROR_DATABASE)
+            return
         await update.message.reply_text(
-            "🗑️ **Clear All Filters**\n\n"
-            "🚧 Bulk filter operations coming soon!\n\n"
+            "🗑️ **All Filters Cleared**\n\n"
             f"🚀 **{config.COMPANY_NAME} - Efficient Management!**",
             parse_mode=ParseMode.MARKDOWN
         )
@@ -796,8 +887,17 @@ Get **7 days FREE trial** + 50% discount on first month!
         )
     
     async def leaderboard_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """🥇 Global leaderboards"""
+        """🥇 Live quiz standings in a chat with a running quiz, global leaderboards otherwise"""
         await self._log_command_usage(update, "leaderboard")
+        
+        session = db_manager.sessions.get(update.effective_chat.id)
+        if session:
+            board = await db_manager.scoreboards.get(session)
+            await update.message.reply_text(
+                await self._format_live_standings(board, update.effective_user.id)
+            )
+            return
+        
         await update.message.reply_text(
             "🥇 **VidderTech Global Leaderboards**\n\n"
             "🚧 Championship rankings coming soon!\n\n"
@@ -810,6 +910,29 @@ Get **7 days FREE trial** + 50% discount on first month!
             parse_mode=ParseMode.MARKDOWN
         )
     
+    async def _format_live_standings(self, board, user_id: int) -> str:
+        """Top participants and the caller's own place (plain text: names are user input)"""
+        top = board.top(config.LEADERBOARD_TOP_K)
+        if not top:
+            return "🥇 Live Standings\n\nNo answers yet - be the first!"
+        
+        users = await asyncio.gather(*(db_manager.get_user(standing.user_id) for standing in top))
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        lines = ["🥇 Live Standings", ""]
+        for standing, user in zip(top, users):
+            name = (user or {}).get('first_name') or f"Player {standing.user_id}"
+            lines.append(
+                f"{medals.get(standing.rank, f'{standing.rank}.')} {name} - {standing.score:g} pts "
+                f"(✅ {standing.correct} ❌ {standing.wrong})"
+            )
+        
+        mine = board.standing(user_id)
+        if mine and mine.rank > top[-1].rank:
+            lines.extend(["", f"📍 You: #{mine.rank} of {len(board)} - {mine.score:g} pts"])
+        elif not mine:
+            lines.extend(["", f"📍 {len(board)} players - answer a question to join the board"])
+        return "\n".join(lines)
+    
     async def support_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """🆘 Technical support"""
         await self._log_command_usage(update, "support")
@@ -952,8 +1075,8 @@ Simply reply to this message with your feedback, and our team will review it wit
             if user_id in config.ADMIN_IDS:
                 return True
             
-            user_data = await db_manager.get_user(user_id)
-            return user_data and user_data.get('role') in ['admin', 'super_admin', 'owner']
+            role = await db_manager.get_user_role(user_id)
+            return role in ('admin', 'super_admin', 'owner')
             
         except Exception as e:
             logger.error(f"❌ Error checking admin permission: {e}")
@@ -971,8 +1094,11 @@ Simply reply to this message with your feedback, and our team will review it wit
             if not poll or not user_id:
                 return
             
+            # The converted question carries the user's filters like typed questions do
+            question = await db_manager.apply_user_filters(user_id, poll.question)
+            
             # Log poll processing
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "poll_received",
                 user_id,
                 metadata={
@@ -989,7 +1115,7 @@ Simply reply to this message with your feedback, and our team will review it wit
 
 🔄 **Poll to Quiz Conversion**
 
-❓ **Question:** `{poll.question}`
+❓ **Question:** `{question}`
 📝 **Options:** `{len(poll.options)} choices`
 🎯 **Type:** `{poll.type.title()}`
 
@@ -1038,7 +1164,7 @@ Want to convert this poll to a VidderTech quiz?
             user_id = update.effective_user.id
             
             # Log document upload
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "document_uploaded",
                 user_id,
                 metadata={
@@ -1093,7 +1219,7 @@ Want to convert this poll to a VidderTech quiz?
             user_id = update.effective_user.id
             
             # Log photo upload
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "photo_uploaded",
                 user_id,
                 metadata={
@@ -1139,26 +1265,50 @@ Want to convert this poll to a VidderTech quiz?
         except Exception as e:
             logger.error(f"❌ Error in photo handler: {e}")
     
+    def _build_quiz_result(self, hit, bot_username: str) -> InlineQueryResultArticle:
+        """Shareable inline result for one quiz search hit"""
+        start_link = f"https://t.me/{bot_username}?start=quiz_{hit.quiz_id}"
+        details = f"📝 {hit.total_questions} questions" + (f" • {hit.category}" if hit.category else "")
+        
+        # Plain text: titles and descriptions are user content and may contain Markdown characters
+        message = f"🎯 {hit.title}\n{details}"
+        if hit.description:
+            message += f"\n\n{hit.description}"
+        message += f"\n\n🚀 Take this quiz with {config.BRAND_NAME}!"
+        
+        return InlineQueryResultArticle(
+            id=hit.quiz_id,
+            title=f"🎯 {hit.title}",
+            description=hit.description or details,
+            input_message_content=InputTextMessageContent(message),
+            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("▶️ Start Quiz", url=start_link)]])
+        )
+    
     async def inline_query_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """🔍 Handle inline queries for quiz sharing"""
         try:
-            logger.info("🔍 Inline query received - processing quiz sharing...")
-            
             query = update.inline_query
             user_id = query.from_user.id
             query_text = query.query.strip()
+            offset = int(query.offset) if query.offset.isdigit() else 0
+            
+            # Log the search once, not once per scrolled page
+            if not offset:
+                db_manager._log_analytics(
+                    "inline_query",
+                    user_id,
+                    metadata={"query": query_text}
+                )
             
-            # Log inline query
-            await db_manager._log_analytics(
-                "inline_query",
-                user_id,
-                metadata={"query": query_text}
-            )
+            hits, next_offset = await db_manager.search_quizzes(query_text, offset, config.INLINE_PAGE_SIZE)
+            results = [self._build_quiz_result(hit, context.bot.username) for hit in hits]
             
-            # This will be implemented with actual quiz search and sharing
+            # Results are the same for everyone, so Telegram may cache them across users too
             await query.answer(
-                results=[],
-                cache_time=0,
+                results=results,
+                cache_time=config.INLINE_CACHE_TIME,
+                is_personal=False,
+                next_offset=str(next_offset) if next_offset is not None else "",
                 switch_pm_text="🚀 Start VidderTech Bot",
                 switch_pm_parameter="inline_query"
             )
@@ -1173,7 +1323,7 @@ Want to convert this poll to a VidderTech quiz?
             await query.answer("🚧 Feature coming soon in next VidderTech update!")
             
             # Log unhandled callback
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "unhandled_callback",
                 query.from_user.id,
                 metadata={"callback_data": query.data}
@@ -1240,7 +1390,7 @@ Want to convert this poll to a VidderTech quiz?
             user_id = update.effective_user.id
             chat_id = update.effective_chat.id
             
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "command_executed",
                 user_id,
                 metadata={
@@ -1268,7 +1418,7 @@ Want to convert this poll to a VidderTech quiz?
             
             # Log error analytics
             if isinstance(update, Update) and update.effective_user:
-                await db_manager._log_analytics(
+                db_manager._log_analytics(
                     "bot_error",
                     update.effective_user.id,
                     metadata=error_info
@@ -1334,20 +1484,17 @@ Don't worry! Our advanced monitoring system has automatically detected and repor
         try:
             logger.info("🔄 VidderTech Bot shutting down gracefully...")
             
+            # Stop question timers, drain chat actors (final session checkpoint), then commit buffered answers
+            await vidder_scheduler.stop()
+            await vidder_actors.stop()
+            await db_manager.response_writer.stop()
+            
             # Cleanup active sessions
             await self._cleanup_active_sessions()
             
-            # Backup database
-            backup_success = await db_manager.backup_database()
-            if backup_success:
-                logger.info("✅ Database backup completed")
-            
-            # Close database connections
-            logger.info("🗄️ Closing database connections...")
-            
             # Final analytics log
             uptime = datetime.now() - self.start_time
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "bot_shutdown",
                 config.OWNER_ID,
                 metadata={
@@ -1358,18 +1505,39 @@ Don't worry! Our advanced monitoring system has automatically detected and repor
                 }
             )
             
-            logger.info("✅ VidderTech Bot shutdown completed successfully")
-            
         except Exception as e:
             logger.error(f"❌ Error during shutdown: {e}")
+        finally:
+            # Buffered writes are flushed even when an earlier step failed
+            await self._shutdown_step("analytics flush", db_manager.analytics.stop)
+            await self._shutdown_step("presence flush", db_manager.presence.stop)
+            await self._shutdown_step("stats roll-up", db_manager.stats.stop)
+            
+            # Checkpoint the WAL and close database connections
+            logger.info("🗄️ Closing database connections...")
+            await self._shutdown_step("WAL checkpoint", db_manager.stop_maintenance)
+            await self._shutdown_step("database close", db_manager.close)
+            
+            # Stop bulk-import parser workers
+            await self._shutdown_step("parser workers", vidder_text_processor.close)
+            
+            logger.info("✅ VidderTech Bot shutdown completed")
+    
+    async def _shutdown_step(self, name: str, step: Callable[[], Any]):
+        """Run one cleanup step; a failure is logged and the remaining steps still run"""
+        try:
+            result = step()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"❌ Shutdown step '{name}' failed: {e}")
     
     async def _cleanup_active_sessions(self):
-        """Cleanup active quiz sessions on shutdown"""
+        """Snapshot live quiz sessions on shutdown so they resume on the next start"""
         try:
-            # This would close all active sessions gracefully
-            logger.info("🧹 Cleaning up active quiz sessions...")
-            # Implementation would mark all active sessions as 'interrupted'
-            pass
+            logger.info(f"🧹 Saving {len(db_manager.sessions)} live quiz sessions...")
+            # Final snapshot: answers and session state are in the database, the journal is emptied
+            await db_manager.journal.stop()
         except Exception as e:
             logger.error(f"❌ Error cleaning up sessions: {e}")
     
@@ -53,6 +53,84 @@ class VidderBotInfo:
     github_repo: str = "https://github.com/VidderTech/Advanced-Quiz-Bot"
     license: str = "MIT"
 
+@dataclass
+class VidderStorageProfile:
+    """SQLite storage tuning applied to every pooled connection"""
+    name: str = "balanced"
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 268435456       # 256 MB memory-mapped reads
+    cache_size: int = -65536         # negative = KiB, so 64 MB page cache
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000         # milliseconds
+    wal_autocheckpoint: int = 1000   # pages
+    checkpoint_interval: int = 300   # seconds between background checkpoints
+    checkpoint_mode: str = "PASSIVE"
+    
+    def __post_init__(self):
+        """Normalise and validate PRAGMA values"""
+        self.journal_mode = self.journal_mode.upper()
+        self.synchronous = self.synchronous.upper()
+        self.temp_store = self.temp_store.upper()
+        self.checkpoint_mode = self.checkpoint_mode.upper()
+        
+        if self.journal_mode not in ("WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"):
+            raise ValueError(f"Invalid journal_mode: {self.journal_mode}")
+        if self.synchronous not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid synchronous level: {self.synchronous}")
+        if self.temp_store not in ("DEFAULT", "FILE", "MEMORY"):
+            raise ValueError(f"Invalid temp_store: {self.temp_store}")
+        if self.checkpoint_mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Invalid checkpoint_mode: {self.checkpoint_mode}")
+    
+    @classmethod
+    def from_env(cls) -> 'VidderStorageProfile':
+        """Build profile from DB_STORAGE_PROFILE plus individual overrides"""
+        name = os.getenv("DB_STORAGE_PROFILE", "balanced").lower()
+        if name not in VIDDER_STORAGE_PROFILES:
+            raise ValueError(f"Unknown DB_STORAGE_PROFILE: {name}")
+        
+        values = {**VIDDER_STORAGE_PROFILES[name], "name": name}
+        overrides = {
+            "journal_mode": ("DB_JOURNAL_MODE", str),
+            "synchronous": ("DB_SYNCHRONOUS", str),
+            "mmap_size": ("DB_MMAP_SIZE", int),
+            "cache_size": ("DB_CACHE_SIZE", int),
+            "temp_store": ("DB_TEMP_STORE", str),
+            "busy_timeout": ("DB_BUSY_TIMEOUT", int),
+            "wal_autocheckpoint": ("DB_WAL_AUTOCHECKPOINT", int),
+            "checkpoint_interval": ("DB_CHECKPOINT_INTERVAL", int),
+            "checkpoint_mode": ("DB_CHECKPOINT_MODE", str)
+        }
+        for field_name, (env_name, cast) in overrides.items():
+            raw = os.getenv(env_name)
+            if raw:
+                values[field_name] = cast(raw)
+        
+        return cls(**values)
+    
+    def to_pragmas(self) -> Dict[str, Any]:
+        """PRAGMAs for VidderConnectionPool, applied once per connection"""
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store,
+            "busy_timeout": self.busy_timeout,
+            "wal_autocheckpoint": self.wal_autocheckpoint
+        }
+
+# Named storage profiles - pick how much fsync cost to pay per commit
+VIDDER_STORAGE_PROFILES = {
+    # Every commit is fsynced; survives power loss without losing the last transaction
+    "durable": {"synchronous": "FULL"},
+    # WAL + NORMAL: fsync only at checkpoints; a power cut may lose the last few commits, never corrupts
+    "balanced": {"synchronous": "NORMAL"},
+    # No fsync at all; for bulk imports and throwaway test databases
+    "fast": {"synchronous": "OFF", "checkpoint_interval": 60},
+}
+
 class VidderConfig:
     """
     🚀 VidderTech Advanced Configuration Manager
@@ -77,7 +155,45 @@ class VidderConfig:
         # Database configuration
         self.DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///vidder_quiz_bot.db")
         self.DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+
+        # Database connection pool
+        self.DB_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+        self.DB_POOL_TIMEOUT = float(os.getenv("DATABASE_TIMEOUT", "30"))
+        self.DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DATABASE_HEALTH_CHECK_INTERVAL", "30"))
+        
+        # SQLite storage profile (journal mode, fsync level, mmap, checkpoints)
+        self.DB_STORAGE = VidderStorageProfile.from_env()
+        
+        # Write-behind batching for quiz answers
+        self.RESPONSE_BATCH_SIZE = int(os.getenv("RESPONSE_BATCH_SIZE", "200"))
+        self.RESPONSE_FLUSH_INTERVAL_MS = int(os.getenv("RESPONSE_FLUSH_INTERVAL_MS", "250"))
+        self.RESPONSE_MAX_PENDING = int(os.getenv("RESPONSE_MAX_PENDING", "10000"))
+        
+        # Buffered analytics pipeline
+        self.ANALYTICS_BUFFER_SIZE = int(os.getenv("ANALYTICS_BUFFER_SIZE", "50000"))
+        self.ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "500"))
+        self.ANALYTICS_FLUSH_INTERVAL = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "2"))
+        self.ANALYTICS_SAMPLE_RATE = float(os.getenv("ANALYTICS_SAMPLE_RATE", "0.1"))
+        self.ANALYTICS_OVERFLOW_POLICY = os.getenv("ANALYTICS_OVERFLOW_POLICY", "drop_newest")
+        self.STATS_ROLLUP_INTERVAL = float(os.getenv("STATS_ROLLUP_INTERVAL", "300"))
+        
+        # In-process user cache
+        self.USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+        self.USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+        
+        # Inline quiz search (result pages cached per query)
+        self.SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "2000"))
+        self.SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "60"))
+        self.INLINE_PAGE_SIZE = int(os.getenv("INLINE_PAGE_SIZE", "20"))
+        self.INLINE_CACHE_TIME = int(os.getenv("INLINE_CACHE_TIME", "30"))
         
+        # Coalesced last_active writes
+        self.PRESENCE_FLUSH_INTERVAL = float(os.getenv("PRESENCE_FLUSH_INTERVAL", "5"))
+        
+        # Online schema migration backfills
+        self.MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+        self.MIGRATION_BATCH_PAUSE_MS = int(os.getenv("MIGRATION_BATCH_PAUSE_MS", "50"))
+
         # External API keys
         self.TESTBOOK_API_KEY = os.getenv("TESTBOOK_API_KEY", "")
         self.OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -88,6 +204,21 @@ class VidderConfig:
         self.DEFAULT_QUESTION_TIME = int(os.getenv("DEFAULT_QUESTION_TIME", "30"))
         self.MAX_CONCURRENT_QUIZZES = int(os.getenv("MAX_CONCURRENT_QUIZZES", "50"))
         
+        # Live quiz timer wheel resolution
+        self.SCHEDULER_TICK_MS = int(os.getenv("SCHEDULER_TICK_MS", "100"))
+        
+        # Per-chat live session actors
+        self.SESSION_CHECKPOINT_INTERVAL = float(os.getenv("SESSION_CHECKPOINT_INTERVAL", "2"))
+        self.ACTOR_IDLE_TIMEOUT = float(os.getenv("ACTOR_IDLE_TIMEOUT", "300"))
+        
+        # Crash-safe live session journal
+        self.SESSION_JOURNAL_DIR = os.getenv("SESSION_JOURNAL_DIR", "./vidder_journal")
+        self.JOURNAL_FSYNC_INTERVAL_MS = int(os.getenv("JOURNAL_FSYNC_INTERVAL_MS", "10"))
+        self.JOURNAL_SNAPSHOT_INTERVAL = float(os.getenv("JOURNAL_SNAPSHOT_INTERVAL", "60"))
+        
+        # Live quiz standings
+        self.LEADERBOARD_TOP_K = int(os.getenv("LEADERBOARD_TOP_K", "10"))
+        
         # File settings
         self.MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
         self.UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
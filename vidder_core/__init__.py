@@ -12,9 +12,9 @@ Core system initialization and component loading for:
 
 from .vidder_app import VidderApplication
 from .vidder_manager import VidderBotManager
-from .vidder_engine import VidderCoreEngine
 from .vidder_monitor import VidderSystemMonitor
-from .vidder_scheduler import VidderScheduler
+from .vidder_scheduler import VidderScheduler, VidderTimer, vidder_scheduler
+from .vidder_actors import VidderActorSystem, VidderChatActor, vidder_actors
 
 # Version info
 __version__ = "2.0.0"
@@ -25,7 +25,11 @@ __email__ = "support@viddertech.com"
 __all__ = [
     'VidderApplication',
     'VidderBotManager', 
-    'VidderCoreEngine',
     'VidderSystemMonitor',
-    'VidderScheduler'
+    'VidderScheduler',
+    'VidderTimer',
+    'vidder_scheduler',
+    'VidderActorSystem',
+    'VidderChatActor',
+    'vidder_actors'
 ]
\ No newline at end of file
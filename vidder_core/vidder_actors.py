@@ -0,0 +1,195 @@
+"""
+🎭 VidderTech Chat Actors
+Built by VidderTech - The Future of Quiz Bots
+
+Per-chat ownership of live quiz state with:
+- One actor (asyncio task + mailbox) per chat with a live quiz
+- Control commands, answers and timer ticks applied one at a time, in arrival order
+- State changes staged in memory and checkpointed to the DB in one periodic batch
+- ask() returns only once the change is in the session journal on disk
+- Idle actors retired, so only busy chats hold a task
+
+Messages are plain callables run inside the actor: func(*args), awaited if it
+returns an awaitable. Nothing else touches a chat's live session while its
+actor runs a message, so check-then-update needs no locks and no re-reads.
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from vidder_config import config
+from vidder_database.vidder_database import db_manager
+from vidder_database.vidder_sessions import VidderSessionRegistry
+
+# Initialize logger
+logger = logging.getLogger('vidder.actors')
+
+# (func, args, future or None for fire-and-forget)
+Message = Tuple[Callable[..., Any], Tuple[Any, ...], Optional[asyncio.Future]]
+
+def _stop_actor():
+    """Mailbox sentinel: the actor exits after every message queued before it"""
+
+class VidderChatActor:
+    """🎭 Owner of one chat's live quiz state"""
+
+    def __init__(self, chat_id: Hashable, system: 'VidderActorSystem'):
+        """Initialize the mailbox and start processing"""
+        self.chat_id = chat_id
+        self.system = system
+        self.mailbox: "asyncio.Queue[Message]" = asyncio.Queue()
+        self.processed = 0
+        self.task = asyncio.create_task(self._run())
+
+    def post(self, func: Callable[..., Any], args: Tuple[Any, ...], future: Optional[asyncio.Future]):
+        """Queue a message (never blocks)"""
+        self.mailbox.put_nowait((func, args, future))
+
+    async def _run(self):
+        """Apply messages in order; retire once idle"""
+        while True:
+            try:
+                func, args, future = await asyncio.wait_for(
+                    self.mailbox.get(), timeout=self.system.idle_timeout
+                )
+            except asyncio.TimeoutError:
+                # No await between the check and the removal, so no message can slip in
+                if self.mailbox.empty():
+                    self.system._retire(self)
+                    return
+                continue
+
+            if func is _stop_actor:
+                self.system._retire(self)
+                return
+            if future is not None and future.cancelled():
+                continue
+            try:
+                result = func(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+                if future is not None and not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+                else:
+                    logger.error(f"❌ Chat {self.chat_id} message {getattr(func, '__name__', func)} failed: {e}")
+            self.processed += 1
+
+class VidderActorSystem:
+    """🎭 VidderTech Chat Actor Registry and Checkpointer"""
+
+    def __init__(self, sessions: VidderSessionRegistry, checkpoint_interval: float = 2.0,
+                 idle_timeout: float = 300.0):
+        """Initialize with the session registry actors stage their changes in"""
+        self.sessions = sessions
+        self.checkpoint_interval = checkpoint_interval
+        self.idle_timeout = idle_timeout
+
+        self._actors: Dict[Hashable, VidderChatActor] = {}
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        self._accepting = True
+
+        self.stats = {
+            'spawned': 0,
+            'retired': 0,
+            'messages': 0,
+            'checkpoints': 0,
+            'sessions_checkpointed': 0
+        }
+
+    def _actor(self, chat_id: Hashable) -> VidderChatActor:
+        """The chat's actor, spawned on first use"""
+        if not self._accepting:
+            raise RuntimeError("Actor system is stopping")
+
+        actor = self._actors.get(chat_id)
+        if actor is None:
+            actor = VidderChatActor(chat_id, self)
+            self._actors[chat_id] = actor
+            self.stats['spawned'] += 1
+        return actor
+
+    def _retire(self, actor: VidderChatActor):
+        """Forget an idle actor"""
+        if self._actors.get(actor.chat_id) is actor:
+            del self._actors[actor.chat_id]
+            self.stats['retired'] += 1
+
+    async def ask(self, chat_id: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) in the chat's actor and return its result once journaled"""
+        future = asyncio.get_running_loop().create_future()
+        self._actor(chat_id).post(func, args, future)
+        self.stats['messages'] += 1
+        result = await future
+        await self.sessions.sync()
+        return result
+
+    def tell(self, chat_id: Hashable, func: Callable[..., Any], *args: Any):
+        """Queue func(*args) for the chat's actor without waiting (errors are logged)"""
+        self._actor(chat_id).post(func, args, None)
+        self.stats['messages'] += 1
+
+    # Checkpointing
+    async def checkpoint(self) -> int:
+        """Persist every staged session change now"""
+        try:
+            written = await self.sessions.checkpoint()
+        except Exception as e:
+            logger.error(f"❌ Session checkpoint failed (changes stay staged): {e}")
+            return 0
+        if written:
+            self.stats['checkpoints'] += 1
+            self.stats['sessions_checkpointed'] += written
+        return written
+
+    async def _checkpoint_loop(self):
+        """Periodic batched checkpoint of staged session state"""
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            await self.checkpoint()
+
+    def start(self):
+        """Start periodic checkpoints"""
+        self._accepting = True
+        if self._checkpoint_task is None or self._checkpoint_task.done():
+            self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+            logger.info(f"🎭 VidderTech chat actors ready (checkpoint every {self.checkpoint_interval:.1f}s)")
+
+    async def stop(self):
+        """Drain every mailbox, stop the actors and write a final checkpoint"""
+        self._accepting = False
+        if self._checkpoint_task is not None:
+            self._checkpoint_task.cancel()
+            try:
+                await self._checkpoint_task
+            except asyncio.CancelledError:
+                pass
+            self._checkpoint_task = None
+
+        actors = list(self._actors.values())
+        for actor in actors:
+            actor.post(_stop_actor, (), None)
+        if actors:
+            await asyncio.gather(*(actor.task for actor in actors), return_exceptions=True)
+
+        written = await self.checkpoint()
+        logger.info(f"🎭 Chat actors stopped ({len(actors)} drained, {written} sessions checkpointed)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get actor and checkpoint counters"""
+        stats = dict(self.stats)
+        stats['actors'] = len(self._actors)
+        stats['queued'] = sum(actor.mailbox.qsize() for actor in self._actors.values())
+        stats['pending_checkpoint'] = self.sessions.pending_checkpoint()
+        return stats
+
+# Global actor system over the live session registry
+vidder_actors = VidderActorSystem(
+    db_manager.sessions,
+    checkpoint_interval=config.SESSION_CHECKPOINT_INTERVAL,
+    idle_timeout=config.ACTOR_IDLE_TIMEOUT
+)
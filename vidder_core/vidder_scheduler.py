@@ -0,0 +1,349 @@
+"""
+⏱️ VidderTech Quiz Scheduler
+Built by VidderTech - The Future of Quiz Bots
+
+One hierarchical timer wheel for every live quiz timer with:
+- O(1) schedule, cancel, pause, resume and re-rate (speed change) per timer
+- One asyncio task for all timers instead of one sleep task per quiz and question
+- Timers expiring on the same tick delivered to their callback as one batch
+- Monotonic clock; a stalled loop or a clock jump fires overdue timers once, in one pass
+- No wake-ups while no timer is running
+
+Timers are keyed (one per key, e.g. a session id). Delays are in quiz seconds
+and run at the timer's rate, so a 30 second question at speed 1.5 expires
+after 20 real seconds.
+"""
+
+import math
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from vidder_config import config
+
+# Initialize logger
+logger = logging.getLogger('vidder.scheduler')
+
+# Wheel geometry: 4 levels of 64 slots cover 64**4 ticks (19 days at 100 ms)
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+WHEEL_LEVELS = 4
+
+# Ticks the loop may fall behind before catching up in one pass instead of tick by tick
+MAX_CATCH_UP_TICKS = WHEEL_SIZE
+
+# Level of timers that are paused (not on the wheel)
+PAUSED = -1
+
+TimerCallback = Callable[[List['VidderTimer']], Awaitable[Any]]
+
+class VidderTimer:
+    """One keyed timer; deadline in ticks while running, remaining quiz seconds while paused"""
+
+    __slots__ = ('key', 'callback', 'payload', 'rate', 'deadline', 'remaining', 'level', 'slot')
+
+    def __init__(self, key: Hashable, callback: TimerCallback, payload: Any, rate: float):
+        self.key = key
+        self.callback = callback
+        self.payload = payload
+        self.rate = rate
+        self.deadline = 0
+        self.remaining = 0.0
+        self.level = PAUSED
+        self.slot = 0
+
+    @property
+    def paused(self) -> bool:
+        return self.level == PAUSED
+
+class VidderScheduler:
+    """⏱️ VidderTech Hierarchical Timer Wheel"""
+
+    def __init__(self, tick: float = 0.1):
+        """Initialize an empty wheel (start() begins ticking)"""
+        if tick <= 0:
+            raise ValueError("Scheduler tick must be positive")
+
+        self.tick = tick
+        self._origin = time.monotonic()
+        self._tick = 0
+        self._wheels: List[List[Dict[Hashable, VidderTimer]]] = [
+            [{} for _ in range(WHEEL_SIZE)] for _ in range(WHEEL_LEVELS)
+        ]
+        self._timers: Dict[Hashable, VidderTimer] = {}
+        self._running = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+        self.stats = {
+            'scheduled': 0,
+            'fired': 0,
+            'batches': 0,
+            'largest_batch': 0,
+            'catch_ups': 0
+        }
+
+    # Clock
+    def _elapsed(self) -> float:
+        """Seconds since the wheel's origin on the monotonic clock"""
+        return time.monotonic() - self._origin
+
+    def _now_tick(self) -> int:
+        """Ticks elapsed on the monotonic clock"""
+        return int(self._elapsed() / self.tick)
+
+    def _deadline_for(self, seconds: float, rate: float) -> int:
+        """First tick at or after a delay in quiz seconds at a rate (never early)"""
+        elapsed = self._elapsed()
+        return max(math.ceil((elapsed + seconds / rate) / self.tick), int(elapsed / self.tick) + 1)
+
+    def _left(self, timer: VidderTimer) -> float:
+        """Quiz seconds until a running timer's deadline"""
+        return max(timer.deadline * self.tick - self._elapsed(), 0.0) * timer.rate
+
+    # Wheel placement
+    def _place(self, timer: VidderTimer, fired: List[VidderTimer]):
+        """Put a running timer in the slot its deadline falls into, or fire it if due"""
+        ticks = timer.deadline - self._tick
+        if ticks <= 0:
+            timer.level = PAUSED
+            fired.append(timer)
+            return
+
+        for level in range(WHEEL_LEVELS):
+            if ticks < 1 << (WHEEL_BITS * (level + 1)):
+                slot = (timer.deadline >> (WHEEL_BITS * level)) & WHEEL_MASK
+                break
+        else:
+            # Beyond the top level: park in its furthest slot and re-place on cascade
+            level = WHEEL_LEVELS - 1
+            slot = ((self._tick >> (WHEEL_BITS * level)) - 1) & WHEEL_MASK
+
+        timer.level = level
+        timer.slot = slot
+        self._wheels[level][slot][timer.key] = timer
+
+    def _unplace(self, timer: VidderTimer):
+        """Take a timer off the wheel"""
+        if timer.level != PAUSED:
+            del self._wheels[timer.level][timer.slot][timer.key]
+            timer.level = PAUSED
+            self._running -= 1
+
+    def _start(self, timer: VidderTimer, seconds: float):
+        """Put a timer on the wheel to expire after seconds of quiz time"""
+        if not self._running:
+            # Nothing on the wheel, so the idle ticks can be skipped outright
+            self._tick = self._now_tick()
+        timer.deadline = self._deadline_for(seconds, timer.rate)
+        self._running += 1
+        fired: List[VidderTimer] = []
+        self._place(timer, fired)
+        if fired:
+            self._dispatch(fired)
+        elif self._wakeup is not None:
+            self._wakeup.set()
+
+    # Timer operations (all O(1))
+    def schedule(self, key: Hashable, delay: float, callback: TimerCallback,
+                 payload: Any = None, rate: float = 1.0) -> VidderTimer:
+        """Start (or restart) the timer for key: callback([timer, ...]) after delay quiz seconds"""
+        if rate <= 0:
+            raise ValueError("Timer rate must be positive")
+
+        self.cancel(key)
+        timer = VidderTimer(key, callback, payload, rate)
+        self._timers[key] = timer
+        self.stats['scheduled'] += 1
+        self._start(timer, delay)
+        return timer
+
+    def cancel(self, key: Hashable) -> bool:
+        """Drop the timer for key"""
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        self._unplace(timer)
+        return True
+
+    def pause(self, key: Hashable) -> Optional[float]:
+        """Freeze the timer for key; returns the quiz seconds it had left"""
+        timer = self._timers.get(key)
+        if timer is None:
+            return None
+        if not timer.paused:
+            timer.remaining = self._left(timer)
+            self._unplace(timer)
+        return timer.remaining
+
+    def resume(self, key: Hashable) -> bool:
+        """Restart a paused timer with the time it had left"""
+        timer = self._timers.get(key)
+        if timer is None:
+            return False
+        if timer.paused:
+            self._start(timer, timer.remaining)
+        return True
+
+    def rerate(self, key: Hashable, rate: float) -> bool:
+        """Change a timer's speed; the quiz time it has left is kept"""
+        if rate <= 0:
+            raise ValueError("Timer rate must be positive")
+
+        timer = self._timers.get(key)
+        if timer is None:
+            return False
+        if timer.paused:
+            timer.rate = rate
+            return True
+
+        remaining = self._left(timer)
+        self._unplace(timer)
+        timer.rate = rate
+        self._start(timer, remaining)
+        return True
+
+    def remaining(self, key: Hashable) -> Optional[float]:
+        """Quiz seconds left on the timer for key"""
+        timer = self._timers.get(key)
+        if timer is None:
+            return None
+        return timer.remaining if timer.paused else self._left(timer)
+
+    def get(self, key: Hashable) -> Optional[VidderTimer]:
+        return self._timers.get(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    # Ticking
+    def _advance(self, now_tick: int) -> List[VidderTimer]:
+        """Move the wheel up to now_tick and collect every expired timer"""
+        fired: List[VidderTimer] = []
+        if now_tick - self._tick > MAX_CATCH_UP_TICKS:
+            self._catch_up(now_tick, fired)
+            return fired
+
+        wheels = self._wheels
+        while self._tick < now_tick:
+            self._tick += 1
+            tick = self._tick
+
+            # Lower level wrapped: redistribute the next slot of each level above
+            if not tick & WHEEL_MASK:
+                for level in range(1, WHEEL_LEVELS):
+                    index = (tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+                    bucket = wheels[level][index]
+                    if bucket:
+                        wheels[level][index] = {}
+                        for timer in bucket.values():
+                            self._place(timer, fired)
+                    if index:
+                        break
+
+            bucket = wheels[0][tick & WHEEL_MASK]
+            if bucket:
+                wheels[0][tick & WHEEL_MASK] = {}
+                for timer in bucket.values():
+                    timer.level = PAUSED
+                    fired.append(timer)
+        return fired
+
+    def _catch_up(self, now_tick: int, fired: List[VidderTimer]):
+        """Re-place every running timer against now_tick (loop stall or clock jump)"""
+        timers = [timer for wheel in self._wheels for bucket in wheel for timer in bucket.values()]
+        for wheel in self._wheels:
+            for index in range(WHEEL_SIZE):
+                wheel[index] = {}
+
+        behind = (now_tick - self._tick) * self.tick
+        self._tick = now_tick
+        for timer in timers:
+            self._place(timer, fired)
+
+        self.stats['catch_ups'] += 1
+        logger.warning(
+            f"⏱️ Scheduler was {behind:.1f}s behind; fired {len(fired)} overdue timers in one pass"
+        )
+
+    def _dispatch(self, fired: List[VidderTimer]):
+        """Hand expired timers to their callbacks, one batch per callback"""
+        batches: Dict[TimerCallback, List[VidderTimer]] = {}
+        for timer in fired:
+            self._running -= 1
+            # Callbacks may schedule the same key again
+            if self._timers.get(timer.key) is timer:
+                del self._timers[timer.key]
+            batches.setdefault(timer.callback, []).append(timer)
+
+        self.stats['fired'] += len(fired)
+        for callback, batch in batches.items():
+            self.stats['batches'] += 1
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+            task = asyncio.get_running_loop().create_task(self._run_callback(callback, batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    @staticmethod
+    async def _run_callback(callback: TimerCallback, batch: List[VidderTimer]):
+        """Run one batch callback, logging instead of killing the scheduler"""
+        try:
+            await callback(batch)
+        except Exception as e:
+            logger.error(f"❌ Timer callback {getattr(callback, '__name__', callback)} failed "
+                         f"for {len(batch)} timers: {e}")
+
+    async def _run(self):
+        """Tick on boundaries while timers run; sleep until one is scheduled otherwise"""
+        while True:
+            if not self._running:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            next_boundary = self._origin + (self._tick + 1) * self.tick
+            await asyncio.sleep(max(next_boundary - time.monotonic(), 0))
+
+            fired = self._advance(self._now_tick())
+            if fired:
+                self._dispatch(fired)
+
+    def start(self):
+        """Start ticking"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"⏱️ VidderTech scheduler started ({self.tick * 1000:.0f} ms ticks, "
+                        f"{len(self._timers)} timers)")
+
+    async def stop(self):
+        """Stop ticking and wait for running callbacks (timers are kept)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+        logger.info("⏱️ VidderTech scheduler stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get timer counts and firing counters"""
+        stats = dict(self.stats)
+        stats['timers'] = len(self._timers)
+        stats['running'] = self._running
+        stats['paused'] = len(self._timers) - self._running
+        return stats
+
+# Global scheduler instance
+vidder_scheduler = VidderScheduler(tick=config.SCHEDULER_TICK_MS / 1000)
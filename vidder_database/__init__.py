@@ -12,13 +12,61 @@ Complete database system with:
 - Enterprise-grade security and encryption
 """
 
-from .vidder_database import VidderDatabaseManager, db_manager, VIDDER_COMPLETE_SCHEMA
+from .vidder_database import VidderDatabase, vidder_db
+from .vidder_models import VIDDER_DATABASE_SCHEMA
+from .vidder_pool import VidderConnectionPool, VidderPoolTimeout
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_batch import VidderResponseWriter
+from .vidder_analytics import VidderAnalyticsPipeline
+from .vidder_stats import VidderStatsCounters
+from .vidder_sessions import VidderSessionRegistry
+from .vidder_journal import VidderSessionJournal
+from .vidder_grading import VidderBatchGrader, VidderGradingReport
+from .vidder_scoreboard import VidderScoreboard, VidderScoreboards, VidderScoringRules, VidderStanding
+from .vidder_query_plans import VidderQueryPlanError, verify_query_plans
+from .vidder_migrations import VidderMigrator, VidderMigration, VidderBackfill, VIDDER_MIGRATIONS
+from .vidder_cache import VidderTTLCache
+from .vidder_presence import VidderPresenceTracker
+from .vidder_queries import VidderQuery, VidderRow, VidderUserAccess, VidderUserProfile
+from .vidder_dedup import find_duplicate, index_question
+from .vidder_search import VidderQuizSearch, VidderQuizHit, build_match_query
 
 # Database package exports
 __all__ = [
-    'VidderDatabaseManager',
-    'db_manager', 
-    'VIDDER_COMPLETE_SCHEMA'
+    'VidderDatabase',
+    'vidder_db',
+    'VIDDER_DATABASE_SCHEMA',
+    'VidderConnectionPool',
+    'VidderPoolTimeout',
+    'VidderDatabaseExecutor',
+    'VidderResponseWriter',
+    'VidderAnalyticsPipeline',
+    'VidderStatsCounters',
+    'VidderSessionRegistry',
+    'VidderSessionJournal',
+    'VidderScoreboard',
+    'VidderScoreboards',
+    'VidderScoringRules',
+    'VidderStanding',
+    'VidderBatchGrader',
+    'VidderGradingReport',
+    'VidderQueryPlanError',
+    'verify_query_plans',
+    'VidderMigrator',
+    'VidderMigration',
+    'VidderBackfill',
+    'VIDDER_MIGRATIONS',
+    'VidderQuery',
+    'VidderRow',
+    'VidderUserAccess',
+    'VidderUserProfile',
+    'VidderTTLCache',
+    'VidderPresenceTracker',
+    'find_duplicate',
+    'index_question',
+    'VidderQuizSearch',
+    'VidderQuizHit',
+    'build_match_query'
 ]
 
 # Package initialization
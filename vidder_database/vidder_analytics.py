@@ -0,0 +1,204 @@
+"""
+📊 VidderTech Analytics Pipeline
+Built by VidderTech - The Future of Quiz Bots
+
+Fire-and-forget event logging with:
+- O(1) in-memory ring buffer on the hot path
+- Background drainer doing bulk executemany into vidder_analytics
+- Sampling of low-priority events under load
+- Drop counters so overload is visible, never silent
+"""
+
+import asyncio
+import random
+import sqlite3
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_models import generate_id, serialize_json
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.analytics')
+
+# High-volume events that may be sampled when the buffer is under pressure
+VIDDER_SAMPLED_EVENTS = frozenset({
+    'command_executed',
+    'inline_query',
+    'unhandled_callback'
+})
+
+INSERT_ANALYTICS_SQL = """
+    INSERT INTO vidder_analytics
+    (analytics_id, event_type, user_id, quiz_id, session_id, question_id,
+     event_data, metadata, group_id, platform, timestamp, date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+class VidderAnalyticsPipeline:
+    """📊 VidderTech Buffered Analytics Pipeline"""
+
+    def __init__(self, executor: VidderDatabaseExecutor, capacity: int = 50000,
+                 batch_size: int = 500, flush_interval: float = 2.0,
+                 sample_threshold: float = 0.75, sample_rate: float = 0.1,
+                 sampled_events: FrozenSet[str] = VIDDER_SAMPLED_EVENTS,
+                 overflow_policy: str = 'drop_newest'):
+        """Initialize pipeline (the drainer starts on first use)"""
+        if overflow_policy not in ('drop_newest', 'drop_oldest'):
+            raise ValueError(f"Invalid overflow policy: {overflow_policy}")
+
+        self.executor = executor
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_threshold = sample_threshold
+        self.sample_rate = sample_rate
+        self.sampled_events = sampled_events
+        self.overflow_policy = overflow_policy
+
+        self._buffer: Deque[Tuple] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.stats = {
+            'emitted': 0,
+            'accepted': 0,
+            'dropped_overflow': 0,
+            'dropped_sampled': 0,
+            'written': 0,
+            'write_failures': 0,
+            'batches': 0
+        }
+
+    def emit(self, event_type: str, user_id: Optional[int] = None,
+             quiz_id: Optional[str] = None, session_id: Optional[str] = None,
+             question_id: Optional[str] = None, group_id: Optional[int] = None,
+             metadata: Optional[Dict[str, Any]] = None,
+             event_data: Optional[Dict[str, Any]] = None,
+             platform: str = 'telegram') -> bool:
+        """Record an event without touching the database; returns False if dropped"""
+        self.stats['emitted'] += 1
+        fill = len(self._buffer)
+
+        if fill >= self.capacity:
+            self.stats['dropped_overflow'] += 1
+            if self.overflow_policy == 'drop_newest':
+                return False
+            # Ring buffer behaviour: overwrite the oldest pending event
+            self._buffer.popleft()
+            fill -= 1
+
+        if (event_type in self.sampled_events
+                and fill >= self.capacity * self.sample_threshold
+                and random.random() >= self.sample_rate):
+            self.stats['dropped_sampled'] += 1
+            return False
+
+        # Serialisation is deferred to the DB thread
+        self._buffer.append((
+            event_type, user_id, quiz_id, session_id, question_id,
+            event_data, metadata, group_id, platform, datetime.now()
+        ))
+        self.stats['accepted'] += 1
+
+        self._ensure_started()
+        if self._wakeup is not None and fill + 1 >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _ensure_started(self):
+        """Start the drainer if a loop is running"""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    @staticmethod
+    def _insert_batch(conn: sqlite3.Connection, events: List[Tuple]) -> int:
+        """Serialise and bulk insert one batch on the DB writer thread"""
+        rows = []
+        for (event_type, user_id, quiz_id, session_id, question_id,
+             event_data, metadata, group_id, platform, ts) in events:
+            rows.append((
+                generate_id('evt_'), event_type, user_id, quiz_id, session_id, question_id,
+                serialize_json(event_data or {}), serialize_json(metadata or {}),
+                group_id, platform, ts.isoformat(), ts.date().isoformat()
+            ))
+
+        try:
+            conn.executemany(INSERT_ANALYTICS_SQL, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(rows)
+
+    def _take(self) -> List[Tuple]:
+        """Pop up to one batch from the ring buffer"""
+        count = min(self.batch_size, len(self._buffer))
+        return [self._buffer.popleft() for _ in range(count)]
+
+    async def _drain_once(self) -> int:
+        """Write one batch; failed batches are dropped and counted"""
+        events = self._take()
+        if not events:
+            return 0
+        try:
+            written = await self.executor.write(self._insert_batch, events)
+            self.stats['written'] += written
+            self.stats['batches'] += 1
+            return written
+        except Exception as e:
+            self.stats['write_failures'] += len(events)
+            logger.error(f"❌ Failed to write {len(events)} analytics events: {e}")
+            return 0
+
+    async def _run(self):
+        """Drain on a timer, or early when a full batch is waiting"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._buffer:
+                await self._drain_once()
+                if len(self._buffer) < self.batch_size and not self._stopping:
+                    break
+
+    async def flush(self):
+        """Write everything currently buffered"""
+        while self._buffer:
+            await self._drain_once()
+
+    async def stop(self):
+        """Stop the drainer and flush remaining events"""
+        self._stopping = True
+        if self._task is not None and not self._task.done():
+            # Let the drainer finish its in-flight batch, then empty the buffer
+            self._wakeup.set()
+            await self._task
+        self._task = None
+
+        await self.flush()
+        self._stopping = False
+        logger.info(
+            f"📊 Analytics pipeline stopped ({self.stats['written']} written, "
+            f"{self.stats['dropped_overflow'] + self.stats['dropped_sampled']} dropped)"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer fill and drop counters"""
+        stats = dict(self.stats)
+        stats['buffered'] = len(self._buffer)
+        stats['capacity'] = self.capacity
+        stats['dropped'] = stats['dropped_overflow'] + stats['dropped_sampled']
+        return stats
@@ -0,0 +1,278 @@
+"""
+📥 VidderTech Write-Behind Response Writer
+Built by VidderTech - The Future of Quiz Bots
+
+Batched ingestion of quiz answers with:
+- One transaction per batch for vidder_responses
+- Aggregated counter updates on vidder_quiz_sessions (the participant's own answers)
+- Flush every N rows or T milliseconds, whichever comes first
+- Bounded buffer with backpressure when the disk falls behind
+- Idempotent inserts: a response_id written twice is stored and counted once
+- Batches that hit a busy or locked database are retried, not dropped
+"""
+
+import asyncio
+import sqlite3
+import time
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_models import generate_id
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.batch')
+
+RESPONSE_COLUMNS = (
+    'response_id', 'session_id', 'question_id', 'user_id',
+    'selected_answer', 'user_answer_text', 'is_correct', 'partial_score',
+    'time_taken', 'time_remaining', 'marks_awarded', 'negative_marks_applied',
+    'confidence_level', 'flag_for_review', 'submitted_at'
+)
+
+INSERT_RESPONSE_SQL = f"""
+    INSERT INTO vidder_responses ({', '.join(RESPONSE_COLUMNS)})
+    VALUES ({', '.join('?' for _ in RESPONSE_COLUMNS)})
+    ON CONFLICT(response_id) DO NOTHING
+"""
+
+UPDATE_SESSION_COUNTERS_SQL = """
+    UPDATE vidder_quiz_sessions SET
+        questions_attempted = questions_attempted + ?,
+        questions_correct = questions_correct + ?,
+        questions_wrong = questions_wrong + ?,
+        questions_skipped = questions_skipped + ?,
+        total_score = total_score + ?,
+        updated_at = ?
+    WHERE session_id = ? AND COALESCE(?, participant_id) IS participant_id
+"""
+
+# Retry delays for a batch that found the database busy or locked
+RETRY_BASE_SECONDS = 0.05
+RETRY_MAX_SECONDS = 2.0
+
+# Retries before giving up on a batch once the writer is stopping
+STOP_RETRIES = 5
+
+def is_transient_error(error: Exception) -> bool:
+    """SQLITE_BUSY / SQLITE_LOCKED: the same batch can succeed on a later attempt"""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+class VidderResponseWriter:
+    """📥 VidderTech Write-Behind Batch Committer"""
+
+    def __init__(self, executor: VidderDatabaseExecutor, batch_size: int = 200,
+                 flush_interval_ms: int = 250, max_pending: int = 10000,
+                 on_written: Optional[Callable[[int], None]] = None):
+        """Initialize writer (the flush task starts on first use)"""
+        self.executor = executor
+        self.on_written = on_written
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.stats = {
+            'rows_submitted': 0,
+            'rows_written': 0,
+            'rows_failed': 0,
+            'rows_duplicate': 0,
+            'retries': 0,
+            'batches': 0,
+            'max_batch': 0,
+            'backpressure_waits': 0,
+            'total_flush_seconds': 0.0,
+            'max_flush_seconds': 0.0
+        }
+
+    def _ensure_started(self):
+        """Create the buffer and flush task inside the running loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def start(self):
+        """Start the background flush task"""
+        self._closing = False
+        self._ensure_started()
+        logger.info(
+            f"📥 Response writer started (batch={self.batch_size}, "
+            f"interval={int(self.flush_interval * 1000)}ms, max_pending={self.max_pending})"
+        )
+
+    async def submit(self, response_data: Dict[str, Any]):
+        """Buffer one answer; waits only when the buffer is full"""
+        if self._closing:
+            raise RuntimeError("Response writer is shutting down")
+
+        self._ensure_started()
+        row = self._to_row(response_data)
+
+        if self._queue.full():
+            self.stats['backpressure_waits'] += 1
+        await self._queue.put(row)
+        self.stats['rows_submitted'] += 1
+
+    @staticmethod
+    def _to_row(data: Dict[str, Any]) -> Tuple:
+        """Convert a response dict into an INSERT tuple"""
+        return (
+            data.get('response_id') or generate_id('resp_'),
+            data['session_id'],
+            data.get('question_id'),
+            data.get('user_id'),
+            data.get('selected_answer'),
+            data.get('user_answer_text'),
+            1 if data.get('is_correct') else 0,
+            data.get('partial_score', 0.0),
+            data.get('time_taken', 0.0),
+            data.get('time_remaining', 0.0),
+            data.get('marks_awarded', 0.0),
+            data.get('negative_marks_applied', 0.0),
+            data.get('confidence_level'),
+            1 if data.get('flag_for_review') else 0,
+            data.get('submitted_at') or datetime.now().isoformat()
+        )
+
+    @staticmethod
+    def _session_deltas(rows: List[Tuple]) -> List[Tuple]:
+        """Fold a batch into one counter update per session and player (only the participant's applies)"""
+        deltas: Dict[Tuple[str, Optional[int]], List[float]] = {}
+        for row in rows:
+            session_id, user_id, selected_answer, is_correct = row[1], row[3], row[4], row[6]
+            marks_awarded, negative_marks = row[10], row[11]
+
+            delta = deltas.setdefault((session_id, user_id), [0, 0, 0, 0, 0.0])
+            if selected_answer is None:
+                delta[3] += 1
+            else:
+                delta[0] += 1
+                if is_correct:
+                    delta[1] += 1
+                else:
+                    delta[2] += 1
+            delta[4] += (marks_awarded or 0.0) - (negative_marks or 0.0)
+
+        now = datetime.now().isoformat()
+        return [(*delta, now, session_id, user_id) for (session_id, user_id), delta in deltas.items()]
+
+    @staticmethod
+    def _commit_batch(conn: sqlite3.Connection, rows: List[Tuple]) -> int:
+        """Write responses and session counters in a single transaction; returns rows inserted"""
+        try:
+            # Only rows that were actually inserted move the session counters
+            inserted = [row for row in rows if conn.execute(INSERT_RESPONSE_SQL, row).rowcount]
+            conn.executemany(UPDATE_SESSION_COUNTERS_SQL, VidderResponseWriter._session_deltas(inserted))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(inserted)
+
+    async def _collect(self) -> List[Tuple]:
+        """Wait for the first row, then gather until size or time limit"""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            # Take whatever is already buffered without yielding
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if len(batch) >= self.batch_size:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _write(self, batch: List[Tuple]):
+        """Commit one batch on the DB writer thread and record stats"""
+        started = time.monotonic()
+        attempt = 0
+        try:
+            while True:
+                try:
+                    written = await self.executor.write(self._commit_batch, batch)
+                    break
+                except Exception as e:
+                    # Busy/locked is retried; while stopping, only a few times
+                    if not is_transient_error(e) or (self._closing and attempt >= STOP_RETRIES):
+                        raise
+                    attempt += 1
+                    self.stats['retries'] += 1
+                    delay = min(RETRY_BASE_SECONDS * 2 ** (attempt - 1), RETRY_MAX_SECONDS)
+                    logger.warning(f"⚠️ Response batch of {len(batch)} hit a busy database; retry {attempt} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+            self.stats['rows_written'] += written
+            self.stats['rows_duplicate'] += len(batch) - written
+            self.stats['batches'] += 1
+            self.stats['max_batch'] = max(self.stats['max_batch'], written)
+            if self.on_written and written:
+                self.on_written(written)
+        except Exception as e:
+            self.stats['rows_failed'] += len(batch)
+            logger.error(f"❌ Failed to write {len(batch)} responses: {e}")
+        finally:
+            elapsed = time.monotonic() - started
+            self.stats['total_flush_seconds'] += elapsed
+            self.stats['max_flush_seconds'] = max(self.stats['max_flush_seconds'], elapsed)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _run(self):
+        """Flush loop - the next batch builds up while the current one commits"""
+        while True:
+            batch = await self._collect()
+            await self._write(batch)
+
+    async def flush(self):
+        """Wait until every buffered response has been committed"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self):
+        """Flush remaining responses and stop the background task"""
+        self._closing = True
+        if self._queue is None:
+            return
+
+        if self._task and not self._task.done():
+            await self.flush()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        elif not self._queue.empty():
+            # Flush task died - drain synchronously so nothing is lost
+            batch = []
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+
+        self._task = None
+        logger.info(f"📥 Response writer stopped ({self.stats['rows_written']} rows written)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching and backpressure statistics"""
+        stats = dict(self.stats)
+        batches = stats['batches']
+        stats['pending'] = self._queue.qsize() if self._queue else 0
+        stats['avg_batch'] = (stats['rows_written'] / batches) if batches else 0.0
+        stats['avg_flush_ms'] = (stats['total_flush_seconds'] / batches * 1000) if batches else 0.0
+        return stats
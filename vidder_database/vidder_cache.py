@@ -0,0 +1,97 @@
+"""
+🧠 VidderTech In-Process Cache
+Built by VidderTech - The Future of Quiz Bots
+
+Bounded read-through cache with:
+- LRU eviction (OrderedDict move-to-end on hit)
+- Per-entry TTL so stale profiles age out even without invalidation
+- Negative caching for unknown keys
+- Hit / miss / eviction / expiry counters
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Tuple
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.cache')
+
+# Distinguishes "not cached" from a cached None
+MISSING = object()
+
+class VidderTTLCache:
+    """🧠 VidderTech TTL + LRU Cache"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300.0):
+        """Initialize empty cache"""
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Cached value, or default when absent or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.stats['hits'] += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def invalidate(self, *keys: Hashable):
+        """Drop specific keys"""
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                self.stats['invalidations'] += 1
+
+    def invalidate_many(self, keys: Iterable[Hashable]):
+        """Drop a batch of keys"""
+        self.invalidate(*keys)
+
+    def clear(self):
+        """Drop everything"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] >= time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit ratio and eviction counters"""
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['size'] = len(self._data)
+        stats['maxsize'] = self.maxsize
+        stats['hit_ratio'] = (stats['hits'] / lookups) if lookups else 0.0
+        return stats
@@ -10,30 +10,141 @@ Enterprise-grade database operations with:
 - Comprehensive CRUD operations
 """
 
+import os
 import sqlite3
 import asyncio
 import json
 import uuid
+import time
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, FrozenSet, Iterable, Optional, Any, Tuple
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from vidder_config import config
-from .vidder_models import VIDDER_DATABASE_SCHEMA, generate_id, serialize_json, deserialize_json
+from .vidder_models import VIDDER_DATABASE_SCHEMA, generate_id, normalize_answer, serialize_json, deserialize_json
+from .vidder_pool import VidderConnectionPool
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_batch import VidderResponseWriter
+from .vidder_analytics import VidderAnalyticsPipeline
+from .vidder_stats import VidderStatsCounters
+from .vidder_sessions import VidderSessionRegistry
+from .vidder_journal import VidderSessionJournal
+from .vidder_scoreboard import VidderScoreboards
+from .vidder_grading import VidderBatchGrader, VidderGradingReport
+from .vidder_query_plans import verify_query_plans
+from .vidder_migrations import VidderMigrator
+from .vidder_cache import VidderTTLCache, MISSING
+from .vidder_presence import VidderPresenceTracker
+from .vidder_dedup import find_duplicate, index_question
+from .vidder_search import VidderQuizSearch, VidderQuizHit
+from vidder_utils.fingerprint_vidder import fingerprint_question
+from vidder_utils.text_processor_vidder import vidder_text_processor
+from .vidder_queries import (
+    VIDDER_STATEMENT_CACHE_SIZE, USER_ACCESS, USER_PROFILE, USER_ROLE,
+    VidderUserAccess, VidderUserProfile
+)
 
 # Initialize logger
 logger = logging.getLogger('vidder.database')
 
+# Projections cached per user; all are dropped together on any user write
+USER_CACHE_KINDS = ('user', 'role', 'access', 'profile', 'filters')
+
+# vidder_filters row that /addfilter appends to (one per user)
+DEFAULT_FILTER_NAME = 'default'
+
+# Columns create_user() overwrites on an existing row when the caller passes them
+USER_UPSERT_COLUMNS = ('username', 'first_name', 'last_name', 'language', 'role', 'status')
+
+# Columns update_user() may change
+USER_UPDATABLE_COLUMNS = frozenset({
+    'username', 'first_name', 'last_name', 'email', 'phone', 'language', 'timezone',
+    'role', 'status', 'is_premium', 'premium_expires',
+    'notification_preferences', 'ui_preferences',
+    'bio', 'avatar_url', 'country', 'city', 'organization'
+})
+
 class VidderDatabase:
     """💾 VidderTech Advanced Database Manager"""
     
     def __init__(self, db_path: str = None):
         """Initialize VidderTech database"""
         self.db_path = db_path or "vidder_quiz_bot.db"
+        self.storage = config.DB_STORAGE
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        self.migrator = VidderMigrator(
+            batch_size=config.MIGRATION_BATCH_SIZE,
+            batch_pause=config.MIGRATION_BATCH_PAUSE_MS / 1000
+        )
         self.init_database()
         
+        # Warm, reusable connections instead of one sqlite3.connect() per query
+        self.pool = VidderConnectionPool(
+            self.db_path,
+            size=config.DB_POOL_SIZE,
+            timeout=config.DB_POOL_TIMEOUT,
+            health_check_interval=config.DB_POOL_HEALTH_CHECK_INTERVAL,
+            pragmas=self.storage.to_pragmas(),
+            cached_statements=VIDDER_STATEMENT_CACHE_SIZE
+        )
+        
+        # All sqlite3 work runs on DB threads so queries never block the event loop
+        self.executor = VidderDatabaseExecutor(self.pool)
+        
+        # Recently read user rows and projections, invalidated on every user write
+        self.user_cache = VidderTTLCache(maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+        self._user_cache_epoch = 0
+        
+        # Full-text quiz search with popular queries served from memory
+        self.search = VidderQuizSearch(
+            self.executor,
+            cache_size=config.SEARCH_CACHE_SIZE,
+            cache_ttl=config.SEARCH_CACHE_TTL
+        )
+        
+        # Bot statistics maintained in memory as events are written
+        self.stats = VidderStatsCounters(self.executor, rollup_interval=config.STATS_ROLLUP_INTERVAL)
+        
+        # last_active kept in memory and flushed in coalesced batches
+        self.presence = VidderPresenceTracker(self.executor, flush_interval=config.PRESENCE_FLUSH_INTERVAL)
+        
+        # Every live session change and answer is journaled before it is acknowledged
+        self.journal = VidderSessionJournal(
+            config.SESSION_JOURNAL_DIR,
+            fsync_interval_ms=config.JOURNAL_FSYNC_INTERVAL_MS,
+            snapshot_interval=config.JOURNAL_SNAPSHOT_INTERVAL
+        )
+        
+        # Live quiz sessions held in memory, written through to vidder_quiz_sessions
+        self.sessions = VidderSessionRegistry(self.executor, stats=self.stats, journal=self.journal)
+        
+        # Ranked standings per live session, updated as answers arrive
+        self.scoreboards = VidderScoreboards(self.executor)
+        
+        # Whole-quiz re-scoring in NumPy for key fixes, marking changes and closing assignments
+        self.grader = VidderBatchGrader(self.executor)
+        
+        # Quiz answers are buffered and committed in batches
+        self.response_writer = VidderResponseWriter(
+            self.executor,
+            batch_size=config.RESPONSE_BATCH_SIZE,
+            flush_interval_ms=config.RESPONSE_FLUSH_INTERVAL_MS,
+            max_pending=config.RESPONSE_MAX_PENDING,
+            on_written=lambda count: self.stats.increment('total_responses', count)
+        )
+        
+        # Analytics events are buffered in memory and bulk-inserted in the background
+        self.analytics = VidderAnalyticsPipeline(
+            self.executor,
+            capacity=config.ANALYTICS_BUFFER_SIZE,
+            batch_size=config.ANALYTICS_BATCH_SIZE,
+            flush_interval=config.ANALYTICS_FLUSH_INTERVAL,
+            sample_rate=config.ANALYTICS_SAMPLE_RATE,
+            overflow_policy=config.ANALYTICS_OVERFLOW_POLICY
+        )
+        
         logger.info(f"💾 VidderTech Database initialized: {self.db_path}")
     
     def init_database(self):
@@ -45,10 +156,22 @@ class VidderDatabase:
             
             # Create database and tables
             with sqlite3.connect(self.db_path) as conn:
+                # journal_mode is persistent, so switch it before any other connection opens
+                journal_mode = conn.execute(f"PRAGMA journal_mode = {self.storage.journal_mode}").fetchone()[0]
                 conn.executescript(VIDDER_DATABASE_SCHEMA)
                 conn.commit()
                 
-            logger.info("✅ VidderTech database schema created successfully")
+                # Versioned schema steps on top of the baseline (backfills run later, online)
+                self.migrator.migrate(conn)
+                
+                # Hot queries must keep using their indexes; fail fast outside production
+                verify_query_plans(conn, strict=config.ENVIRONMENT in ('development', 'testing'))
+                
+            logger.info(f"✅ VidderTech database schema ready (v{self.migrator.latest_version})")
+            logger.info(
+                f"💽 Storage profile '{self.storage.name}': journal={journal_mode}, "
+                f"synchronous={self.storage.synchronous}, mmap={self.storage.mmap_size}"
+            )
             
         except Exception as e:
             logger.error(f"❌ Database initialization error: {e}")
@@ -56,94 +179,675 @@ class VidderDatabase:
     
     @asynccontextmanager
     async def get_connection(self):
-        """Get database connection with async context manager"""
-        conn = None
+        """Get pooled database connection with async context manager"""
+        conn = self.pool.acquire_idle()
+        if conn is None:
+            # Opening, health-checking or waiting for a connection happens off the event loop
+            loop = asyncio.get_running_loop()
+            conn = await loop.run_in_executor(None, self.pool.acquire)
+        
+        broken = False
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
             yield conn
         except Exception as e:
-            if conn:
+            broken = isinstance(e, (sqlite3.InterfaceError, sqlite3.ProgrammingError))
+            try:
                 conn.rollback()
+            except sqlite3.Error:
+                broken = True
             logger.error(f"❌ Database connection error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            self.pool.release(conn, discard=broken)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool utilisation and checkout wait times"""
+        return self.pool.get_stats()
+    
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """Get DB thread queue depth and execution times"""
+        return self.executor.get_stats()
+    
+    def close(self):
+        """Drain DB threads and close all pooled database connections"""
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+    
+    # Storage Maintenance
+    async def checkpoint(self, mode: str = None) -> Dict[str, int]:
+        """Run a WAL checkpoint and report how many frames were copied back"""
+        mode = (mode or self.storage.checkpoint_mode).upper()
+        
+        def _write(conn: sqlite3.Connection) -> Dict[str, int]:
+            busy, wal_frames, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+            return {'busy': busy, 'wal_frames': wal_frames, 'checkpointed': checkpointed}
+        
+        return await self.executor.write(_write)
+    
+    async def _checkpoint_loop(self):
+        """Periodically fold the WAL back into the main database file"""
+        while True:
+            await asyncio.sleep(self.storage.checkpoint_interval)
+            try:
+                result = await self.checkpoint()
+                logger.debug(f"💽 WAL checkpoint: {result}")
+            except Exception as e:
+                logger.error(f"❌ WAL checkpoint error: {e}")
+    
+    async def start_maintenance(self):
+        """Start online migration backfills and background WAL checkpointing"""
+        self.migrator.start(self.executor)
+        
+        if self.storage.journal_mode != "WAL" or self._checkpoint_task:
+            return
+        
+        self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+        logger.info(f"💽 WAL checkpointing every {self.storage.checkpoint_interval}s")
+    
+    async def stop_maintenance(self):
+        """Pause backfills, stop background checkpointing and truncate the WAL"""
+        await self.migrator.stop()
+        
+        if not self._checkpoint_task:
+            return
+        
+        self._checkpoint_task.cancel()
+        try:
+            await self._checkpoint_task
+        except asyncio.CancelledError:
+            pass
+        self._checkpoint_task = None
+        
+        try:
+            await self.checkpoint("TRUNCATE")
+        except Exception as e:
+            logger.error(f"❌ Final WAL checkpoint error: {e}")
     
     # User Operations
     async def create_user(self, user_data: Dict[str, Any]) -> bool:
-        """Create or update user"""
+        """Create a user, or update only the columns passed for an existing one"""
+        now = datetime.now().isoformat()
+        row = {
+            'user_id': user_data['user_id'],
+            'username': user_data.get('username'),
+            'first_name': user_data.get('first_name'),
+            'last_name': user_data.get('last_name'),
+            'language': user_data.get('language', 'en'),
+            'created_at': user_data.get('created_at', now),
+            'last_active': user_data.get('last_active', now),
+            'role': user_data.get('role', 'free'),
+            'status': user_data.get('status', 'active')
+        }
+        # Defaults apply to new rows only; existing role, status, premium and stats are kept
+        changed = [column for column in USER_UPSERT_COLUMNS if column in user_data] + ['last_active']
+        assignments = ', '.join(f"{column} = excluded.{column}" for column in dict.fromkeys(changed))
+        
+        def _write(conn: sqlite3.Connection) -> bool:
+            is_new = conn.execute(
+                "SELECT 1 FROM vidder_users WHERE user_id = ?", (row['user_id'],)
+            ).fetchone() is None
+            conn.execute(f"""
+                INSERT INTO vidder_users ({', '.join(row)}, updated_at)
+                VALUES ({', '.join('?' for _ in row)}, ?)
+                ON CONFLICT(user_id) DO UPDATE SET {assignments}, updated_at = excluded.updated_at
+            """, (*row.values(), now))
+            conn.commit()
+            return is_new
+        
         try:
-            async with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO vidder_users 
-                    (user_id, username, first_name, last_name, language, 
-                     created_at, last_active, role, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_data['user_id'],
-                    user_data.get('username'),
-                    user_data.get('first_name'),
-                    user_data.get('last_name'),
-                    user_data.get('language', 'en'),
-                    user_data.get('created_at', datetime.now().isoformat()),
-                    user_data.get('last_active', datetime.now().isoformat()),
-                    user_data.get('role', 'free'),
-                    user_data.get('status', 'active')
-                ))
-                
-                conn.commit()
-                return True
-                
+            is_new = await self.executor.write(_write)
+            self.invalidate_user(user_data['user_id'])
+            if is_new:
+                self.stats.increment('total_users')
+            self.stats.record_activity(user_data['user_id'])
+            return True
         except Exception as e:
             logger.error(f"❌ Error creating user: {e}")
             return False
     
+    async def update_user(self, user_id: int, updates: Dict[str, Any]) -> bool:
+        """Update selected user columns (role, status, premium, profile)"""
+        updates = {column: value for column, value in updates.items() if column in USER_UPDATABLE_COLUMNS}
+        if not updates:
+            return False
+        
+        def _write(conn: sqlite3.Connection) -> Optional[Tuple[Any, Any]]:
+            before = conn.execute(
+                "SELECT is_premium FROM vidder_users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if before is None:
+                return None
+            assignments = ', '.join(f"{column} = ?" for column in updates)
+            conn.execute(
+                f"UPDATE vidder_users SET {assignments}, updated_at = ? WHERE user_id = ?",
+                (*updates.values(), datetime.now().isoformat(), user_id)
+            )
+            conn.commit()
+            return bool(before[0]), bool(updates.get('is_premium', before[0]))
+        
+        try:
+            premium = await self.executor.write(_write)
+            self.invalidate_user(user_id)
+            if premium is None:
+                return False
+            was_premium, is_premium = premium
+            if was_premium != is_premium:
+                self.stats.increment('premium_users', 1 if is_premium else -1)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error updating user {user_id}: {e}")
+            return False
+    
+    async def set_user_status(self, user_id: int, status: str) -> bool:
+        """Ban ('banned'), suspend or restore ('active') a user"""
+        return await self.update_user(user_id, {'status': status})
+    
+    async def set_user_premium(self, user_id: int, is_premium: bool, expires: Optional[str] = None) -> bool:
+        """Grant or revoke premium"""
+        return await self.update_user(user_id, {
+            'is_premium': 1 if is_premium else 0,
+            'premium_expires': expires if is_premium else None
+        })
+    
+    def invalidate_user(self, user_id: int):
+        """Drop every cached projection of a user"""
+        self._user_cache_epoch += 1
+        self.user_cache.invalidate(*((kind, user_id) for kind in USER_CACHE_KINDS))
+    
+    async def _cached_user_read(self, kind: str, user_id: int, func) -> Any:
+        """Serve a user lookup from cache, reading through on a miss"""
+        key = (kind, user_id)
+        value = self.user_cache.get(key)
+        if value is not MISSING:
+            return value
+        
+        epoch = self._user_cache_epoch
+        value = await self.executor.read(func, user_id)
+        # A write that landed while we were reading makes this result stale
+        if epoch == self._user_cache_epoch:
+            self.user_cache.set(key, value)
+        return value
+    
+    @staticmethod
+    def _read_user_row(conn: sqlite3.Connection, user_id: int) -> Optional[Dict[str, Any]]:
+        """Full vidder_users row as a dict (DB thread)"""
+        row = conn.execute("SELECT * FROM vidder_users WHERE user_id = ?", (user_id,)).fetchone()
+        return dict(row) if row else None
+    
     async def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
         try:
-            async with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM vidder_users WHERE user_id = ?", (user_id,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return dict(row)
+            user = await self._cached_user_read('user', user_id, self._read_user_row)
+            # Callers may modify the dict; keep the cached copy pristine
+            return dict(user) if user else None
+        except Exception as e:
+            logger.error(f"❌ Error getting user {user_id}: {e}")
+            return None
+    
+    async def get_user_role(self, user_id: int) -> Optional[str]:
+        """Get only the user's role (None if unknown)"""
+        try:
+            return await self._cached_user_read('role', user_id, USER_ROLE.scalar)
+        except Exception as e:
+            logger.error(f"❌ Error getting role for user {user_id}: {e}")
+            return None
+    
+    async def get_user_access(self, user_id: int) -> Optional[VidderUserAccess]:
+        """Get role, status and premium columns for permission checks"""
+        try:
+            return await self._cached_user_read('access', user_id, USER_ACCESS.one)
+        except Exception as e:
+            logger.error(f"❌ Error getting access for user {user_id}: {e}")
+            return None
+    
+    async def get_user_profile(self, user_id: int) -> Optional[VidderUserProfile]:
+        """Get display and language columns for a user"""
+        try:
+            return await self._cached_user_read('profile', user_id, USER_PROFILE.one)
+        except Exception as e:
+            logger.error(f"❌ Error getting profile for user {user_id}: {e}")
+            return None
+    
+    def get_user_cache_stats(self) -> Dict[str, Any]:
+        """Get user cache hit / miss / eviction counters"""
+        return self.user_cache.get_stats()
+    
+    # Session Recovery
+    async def recover_sessions(self) -> Dict[str, int]:
+        """Replay the session journal over the loaded sessions, then start journaling"""
+        started = time.monotonic()
+        records = await self.journal.replay()
+        recovered = {'records': len(records), 'sessions': 0, 'answers': 0}
+        
+        try:
+            recovered['sessions'] = await self.sessions.replay(records)
+            recovered['answers'] = await self._replay_answers(
+                [record[1] for record in records if record[0] == 'answer']
+            )
+            await self._snapshot_sessions()
+            replayed = True
+        except Exception as e:
+            logger.error(f"❌ Session journal replay failed; segments kept for the next start: {e}")
+            replayed = False
+        
+        await self.journal.start(self._snapshot_sessions)
+        if replayed:
+            await self.journal.discard_replayed()
+        
+        if records:
+            logger.info(
+                f"📓 Recovered {recovered['sessions']} sessions and {recovered['answers']} answers "
+                f"from {len(records)} journal records in {(time.monotonic() - started) * 1000:.0f} ms"
+            )
+        return recovered
+    
+    async def _replay_answers(self, responses: List[Dict[str, Any]]) -> int:
+        """Re-queue journaled answers that never reached vidder_responses"""
+        if not responses:
+            return 0
+        
+        # Last copy wins; ids are assigned before journaling, so they match committed rows
+        by_id = {response['response_id']: response for response in responses}
+        
+        def _read(conn: sqlite3.Connection, response_ids: List[str]) -> set:
+            existing = set()
+            for start in range(0, len(response_ids), 500):
+                chunk = response_ids[start:start + 500]
+                existing.update(row[0] for row in conn.execute(
+                    f"SELECT response_id FROM vidder_responses "
+                    f"WHERE response_id IN ({', '.join('?' for _ in chunk)})", chunk
+                ))
+            return existing
+        
+        existing = await self.executor.read(_read, list(by_id))
+        missing = [response for response_id, response in by_id.items() if response_id not in existing]
+        for response in missing:
+            await self.response_writer.submit(response)
+        return len(missing)
+    
+    async def _snapshot_sessions(self):
+        """Commit buffered answers and staged session changes, then make them durable (journal snapshot)"""
+        failed = self.response_writer.stats['rows_failed']
+        await self.response_writer.flush()
+        if self.response_writer.stats['rows_failed'] > failed:
+            raise RuntimeError("buffered answers failed to commit")
+        await self.sessions.checkpoint()
+        await self._sync_database()
+    
+    async def _sync_database(self):
+        """Force committed transactions to disk before the journal drops its copy of them"""
+        # Below synchronous=FULL a WAL commit is not fsynced; a completed checkpoint
+        # copies it into the database file, which is then fsynced
+        if self.storage.journal_mode == "WAL":
+            result = await self.checkpoint('FULL')
+            if result['busy']:
+                raise RuntimeError("WAL checkpoint blocked by readers")
+        
+        def _fsync(path: str):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        
+        await asyncio.get_running_loop().run_in_executor(None, _fsync, self.db_path)
+    
+    # Response Operations
+    async def apply_response(self, response_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Score a quiz answer and queue it for batched insert; returns the stored answer
+        
+        Runs inside the chat's actor (vidder_actors.ask), so it is ordered against
+        control commands and timer ticks; the actor's ask() returns once it is journaled.
+        Returns None for an answer to a paused quiz. Errors propagate to the caller.
+        """
+        # Same form as question keys, so grading can compare them directly
+        response_data = {**response_data, 'selected_answer': normalize_answer(response_data.get('selected_answer'))}
+        
+        session = self.sessions.get_by_id(response_data['session_id'])
+        if session is not None:
+            if session['status'] != 'active':
                 return None
+            # Marks follow the quiz's rules and the participant moves on the live board
+            response_data = await self.scoreboards.score(session, response_data)
+        
+        # Fixed before journaling so a replayed answer is recognised if it did commit
+        response_data = {
+            **response_data,
+            'response_id': response_data.get('response_id') or generate_id('resp_'),
+            'submitted_at': response_data.get('submitted_at') or datetime.now().isoformat()
+        }
+        await self.response_writer.submit(response_data)
+        self.journal.append('answer', response_data)
+        return response_data
+    
+    async def regrade_quiz(self, quiz_id: str) -> Optional[VidderGradingReport]:
+        """Re-score every finished attempt of a quiz with its current key and marking"""
+        try:
+            # Answers still buffered belong to the attempts being graded
+            await self.response_writer.flush()
+            return await self.grader.regrade(quiz_id)
+        except Exception as e:
+            logger.error(f"❌ Error re-grading quiz {quiz_id}: {e}")
+            return None
+    
+    async def get_session_answers(self, session_id: str) -> Dict[str, Optional[str]]:
+        """Get {question_id: selected_answer} for a session"""
+        def _read(conn: sqlite3.Connection) -> Dict[str, Optional[str]]:
+            rows = conn.execute(
+                "SELECT question_id, selected_answer FROM vidder_responses WHERE session_id = ?",
+                (session_id,)
+            ).fetchall()
+            return {row[0]: row[1] for row in rows}
+
+        try:
+            return await self.executor.read(_read)
+        except Exception as e:
+            logger.error(f"❌ Error getting answers for session {session_id}: {e}")
+            return {}
+
+    # Quiz Access Operations
+    async def grant_quiz_access(self, quiz_id: str, principal_id: int, principal_type: str = 'user') -> bool:
+        """Allow a user or group to take a private quiz"""
+        def _write(conn: sqlite3.Connection):
+            conn.execute("""
+                INSERT OR IGNORE INTO vidder_quiz_access (quiz_id, principal_type, principal_id, granted_at)
+                VALUES (?, ?, ?, ?)
+            """, (quiz_id, principal_type, principal_id, datetime.now().isoformat()))
+            conn.commit()
+
+        try:
+            await self.executor.write(_write)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error granting access to quiz {quiz_id}: {e}")
+            return False
+
+    async def revoke_quiz_access(self, quiz_id: str, principal_id: int, principal_type: str = 'user') -> bool:
+        """Remove a user or group from a private quiz"""
+        def _write(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute("""
+                DELETE FROM vidder_quiz_access
+                WHERE quiz_id = ? AND principal_type = ? AND principal_id = ?
+            """, (quiz_id, principal_type, principal_id))
+            conn.commit()
+            return cursor.rowcount > 0
+
+        try:
+            return await self.executor.write(_write)
+        except Exception as e:
+            logger.error(f"❌ Error revoking access to quiz {quiz_id}: {e}")
+            return False
+
+    async def has_quiz_access(self, quiz_id: str, user_id: int, group_id: Optional[int] = None) -> bool:
+        """Check a user (or the group they are in) against the quiz access list"""
+        def _read(conn: sqlite3.Connection) -> bool:
+            return conn.execute("""
+                SELECT 1 FROM vidder_quiz_access
+                WHERE quiz_id = ? AND ((principal_type = 'user' AND principal_id = ?)
+                                    OR (principal_type = 'group' AND principal_id = ?))
+                LIMIT 1
+            """, (quiz_id, user_id, group_id)).fetchone() is not None
+
+        try:
+            return await self.executor.read(_read)
+        except Exception as e:
+            logger.error(f"❌ Error checking access to quiz {quiz_id}: {e}")
+            return False
+
+    # Assignment Operations
+    async def record_assignment_submission(self, assignment_id: str, user_id: int,
+                                           submission: Dict[str, Any]) -> bool:
+        """Store one assignment attempt as a single row"""
+        def _write(conn: sqlite3.Connection):
+            conn.execute("""
+                INSERT OR REPLACE INTO vidder_assignment_submissions
+                (assignment_id, user_id, attempt, session_id, score, percentage, data, submitted_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                assignment_id,
+                user_id,
+                submission.get('attempt', 1),
+                submission.get('session_id'),
+                submission.get('score', 0.0),
+                submission.get('percentage', 0.0),
+                serialize_json(submission),
+                submission.get('submitted_at', datetime.now().isoformat())
+            ))
+            conn.commit()
+
+        try:
+            await self.executor.write(_write)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error recording submission for assignment {assignment_id}: {e}")
+            return False
+
+    async def get_assignment_submissions(self, assignment_id: str) -> List[Dict[str, Any]]:
+        """Get all submissions for an assignment"""
+        def _read(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+            rows = conn.execute("""
+                SELECT * FROM vidder_assignment_submissions
+                WHERE assignment_id = ? ORDER BY submitted_at
+            """, (assignment_id,)).fetchall()
+            return [{**dict(row), 'data': deserialize_json(row['data'])} for row in rows]
+
+        try:
+            return await self.executor.read(_read)
+        except Exception as e:
+            logger.error(f"❌ Error getting submissions for assignment {assignment_id}: {e}")
+            return []
+
+    # Question Operations
+    async def add_questions(self, quiz_id: str, questions: List[Dict[str, Any]],
+                            skip_duplicates: bool = True) -> Dict[str, Any]:
+        """
+        Store parsed questions, skipping ones the quiz already has
+        
+        Accepts parse_bulk_questions() results: entries with an error or marked
+        duplicate_of (repeats inside the same import) are skipped, and the
+        fingerprint computed by the parser is reused when present. Questions
+        stored in other quizzes do not count as duplicates.
+        """
+        def _write(conn: sqlite3.Connection) -> Dict[str, Any]:
+            now = datetime.now().isoformat()
+            added: List[str] = []
+            duplicates: List[Dict[str, Any]] = []
+            try:
+                for position, question in enumerate(questions):
+                    if 'error' in question:
+                        continue
+                    if question.get('duplicate_of') is not None:
+                        duplicates.append({'position': position, 'duplicate_of': question['duplicate_of'],
+                                           'similarity': question.get('similarity', 1.0)})
+                        continue
+                    
+                    fingerprint = question.get('fingerprint') or fingerprint_question(
+                        question['question_text'], question.get('options', [])
+                    )
+                    if skip_duplicates:
+                        match = find_duplicate(conn, fingerprint, quiz_id=quiz_id)
+                        if match is not None:
+                            duplicates.append({'position': position, 'question_id': match[0],
+                                               'similarity': match[1]})
+                            continue
+                    
+                    question_id = generate_id('q_')
+                    conn.execute("""
+                        INSERT INTO vidder_questions
+                        (question_id, quiz_id, question_text, question_type, options, correct_answer,
+                         explanation, order_index, marks, source, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        question_id, quiz_id, question['question_text'],
+                        question.get('question_type', 'mcq'),
+                        serialize_json(question.get('options', [])),
+                        normalize_answer(question.get('correct_answer')),
+                        question.get('explanation'),
+                        question.get('order_index', position),
+                        question.get('marks', 1.0),
+                        question.get('source'),
+                        now, now
+                    ))
+                    index_question(conn, question_id, fingerprint)
+                    added.append(question_id)
                 
+                if added:
+                    conn.execute(
+                        "UPDATE vidder_quizzes SET total_questions = total_questions + ?, updated_at = ? WHERE quiz_id = ?",
+                        (len(added), now, quiz_id)
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return {'added': added, 'duplicates': duplicates}
+        
+        try:
+            result = await self.executor.write(_write)
+            if result['added']:
+                self.stats.increment('total_questions', len(result['added']))
+            logger.info(
+                f"📝 Stored {len(result['added'])} questions in quiz {quiz_id}, "
+                f"skipped {len(result['duplicates'])} duplicates"
+            )
+            return result
         except Exception as e:
-            logger.error(f"❌ Error getting user {user_id}: {e}")
+            logger.error(f"❌ Error adding questions to quiz {quiz_id}: {e}")
+            return {'added': [], 'duplicates': [], 'error': str(e)}
+    
+    async def find_duplicate_question(self, question_text: str,
+                                      options: Iterable[str] = ()) -> Optional[Tuple[str, float]]:
+        """(question_id, similarity) of a stored exact or near duplicate, if any"""
+        fingerprint = fingerprint_question(question_text, options)
+        try:
+            return await self.executor.read(find_duplicate, fingerprint)
+        except Exception as e:
+            logger.error(f"❌ Error checking for duplicate question: {e}")
+            return None
+    
+    # Search Operations
+    async def search_quizzes(self, query: str, offset: int = 0,
+                             limit: int = 20) -> Tuple[Tuple[VidderQuizHit, ...], Optional[int]]:
+        """Public quizzes matching the query by title, description, tags or question text, best first"""
+        try:
+            return await self.search.search(query, offset, limit)
+        except Exception as e:
+            logger.error(f"❌ Error searching quizzes for {query!r}: {e}")
+            return (), None
+    
+    # Filter Operations
+    @staticmethod
+    def _read_user_filters(conn: sqlite3.Connection, user_id: int) -> FrozenSet[str]:
+        """Union of the user's enabled filter words (DB thread)"""
+        words = set()
+        for (raw,) in conn.execute(
+            "SELECT filter_words FROM vidder_filters WHERE user_id = ? AND auto_filter = 1", (user_id,)
+        ):
+            entries = deserialize_json(raw)
+            if isinstance(entries, list):
+                words.update(entry for entry in entries if isinstance(entry, str) and entry)
+        return frozenset(words)
+    
+    async def get_user_filters(self, user_id: int) -> FrozenSet[str]:
+        """Get the user's filter set (cached; a stable key for compiled filters)"""
+        try:
+            return await self._cached_user_read('filters', user_id, self._read_user_filters)
+        except Exception as e:
+            logger.error(f"❌ Error getting filters for user {user_id}: {e}")
+            return frozenset()
+    
+    async def apply_user_filters(self, user_id: int, text: str) -> str:
+        """Strip the user's filter words and patterns from text they sent (unchanged without filters)"""
+        if not text:
+            return text
+        filters = await self.get_user_filters(user_id)
+        if not filters:
+            return text
+        # The set is the compiled-filter cache key, so later messages reuse the automaton
+        return vidder_text_processor.remove_unwanted_words(text, filters)
+    
+    async def update_user_filters(self, user_id: int, add: Iterable[str] = (),
+                                  remove: Iterable[str] = (), clear: bool = False) -> Optional[FrozenSet[str]]:
+        """Add/remove filter words (or clear them all) and return the new filter set"""
+        add = [word for word in dict.fromkeys(add) if word]
+        remove = set(remove)
+        
+        def _write(conn: sqlite3.Connection) -> FrozenSet[str]:
+            now = datetime.now().isoformat()
+            rows = conn.execute(
+                "SELECT filter_id, filter_name, filter_words FROM vidder_filters WHERE user_id = ?", (user_id,)
+            ).fetchall()
+            has_default = False
+            try:
+                for filter_id, filter_name, raw in rows:
+                    words = deserialize_json(raw)
+                    words = words if isinstance(words, list) else []
+                    updated = [] if clear else [word for word in words if word not in remove]
+                    if filter_name == DEFAULT_FILTER_NAME and not has_default:
+                        has_default = True
+                        updated.extend(word for word in add if word not in updated)
+                    if updated != words:
+                        conn.execute(
+                            "UPDATE vidder_filters SET filter_words = ?, updated_at = ? WHERE filter_id = ?",
+                            (serialize_json(updated), now, filter_id)
+                        )
+                if add and not has_default:
+                    conn.execute("""
+                        INSERT INTO vidder_filters (filter_id, user_id, filter_name, filter_words, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (generate_id('filter_'), user_id, DEFAULT_FILTER_NAME, serialize_json(add), now, now))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return self._read_user_filters(conn, user_id)
+        
+        try:
+            filters = await self.executor.write(_write)
+            # Compiled filters are keyed by the set itself, so dropping the cached set is enough
+            self.invalidate_user(user_id)
+            return filters
+        except Exception as e:
+            logger.error(f"❌ Error updating filters for user {user_id}: {e}")
             return None
     
     async def get_bot_stats(self) -> Dict[str, Any]:
-        """Get bot statistics"""
-        try:
-            return {
-                'total_users': 50000,
-                'active_today': 1200,
-                'active_week': 8500,
-                'total_quizzes': 25000,
-                'active_quizzes': 120,
-                'total_questions': 500000,
-                'total_responses': 2000000,
-                'last_updated': datetime.now().isoformat()
-            }
+        """Get bot statistics (served from in-memory counters)"""
+        try:
+            return self.stats.snapshot()
         except Exception as e:
             logger.error(f"❌ Error getting stats: {e}")
             return {}
     
-    async def log_analytics(self, analytics_data: Dict[str, Any]) -> bool:
-        """Log analytics event"""
+    def _log_analytics(self, event_type: str, user_id: Optional[int] = None,
+                       quiz_id: Optional[str] = None, session_id: Optional[str] = None,
+                       metadata: Optional[Dict[str, Any]] = None, **context) -> bool:
+        """Fire-and-forget analytics event (never waits on the database)"""
         try:
-            # Mock implementation for now
-            logger.info(f"📊 Analytics: {analytics_data.get('event_type')} by user {analytics_data.get('user_id')}")
-            return True
+            if user_id is not None:
+                self.stats.record_activity(user_id)
+                self.presence.touch(user_id)
+            return self.analytics.emit(
+                event_type, user_id,
+                quiz_id=quiz_id,
+                session_id=session_id,
+                metadata=metadata,
+                **context
+            )
         except Exception as e:
             logger.error(f"❌ Error logging analytics: {e}")
             return False
+    
+    async def log_analytics(self, analytics_data: Dict[str, Any]) -> bool:
+        """Log analytics event"""
+        data = dict(analytics_data)
+        event_type = data.pop('event_type')
+        user_id = data.pop('user_id', None)
+        return self._log_analytics(event_type, user_id, **data)
 
 # Global database instance
-vidder_db = VidderDatabase()
\ No newline at end of file
+vidder_db = VidderDatabase()
+
+# Backward compatibility alias
+db_manager = vidder_db
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+🧬 VidderTech Question Duplicate Index
+Built by VidderTech - The Future of Quiz Bots
+
+Persisted companion of vidder_questions with:
+- vidder_question_fingerprints: exact hash (indexed) and MinHash signature per question
+- vidder_question_lsh: (band, bucket) -> question_id, WITHOUT ROWID so lookups are primary-key seeks
+- A delete trigger that keeps both tables in step with vidder_questions
+- A rowid-chunked backfill for questions stored before the index existed
+
+A lookup is one exact-hash seek, LSH_BANDS bucket scans of at most
+LSH_BUCKET_LIMIT rows and a signature check of at most MAX_CANDIDATES rows,
+so it stays in the millisecond range no matter how many questions are stored.
+Lookups for an import are scoped to the target quiz: the same question may
+appear in several quizzes, but only once in each.
+"""
+
+import sqlite3
+import logging
+from typing import Optional, Tuple
+
+from vidder_utils.fingerprint_vidder import (
+    LSH_BANDS, MAX_CANDIDATES, NEAR_DUPLICATE_THRESHOLD,
+    VidderQuestionFingerprint, fingerprint_question
+)
+from .vidder_models import deserialize_json
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.dedup')
+
+QUESTION_INDEX_DDL = """
+CREATE TABLE IF NOT EXISTS vidder_question_fingerprints (
+    question_id TEXT PRIMARY KEY,
+    exact_hash INTEGER NOT NULL,
+    signature BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_fingerprints_exact ON vidder_question_fingerprints(exact_hash);
+
+CREATE TABLE IF NOT EXISTS vidder_question_lsh (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    question_id TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, question_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_question_lsh_question ON vidder_question_lsh(question_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_fingerprint_delete
+AFTER DELETE ON vidder_questions
+BEGIN
+    DELETE FROM vidder_question_fingerprints WHERE question_id = old.question_id;
+    DELETE FROM vidder_question_lsh WHERE question_id = old.question_id;
+END;
+"""
+
+FIND_EXACT_SQL = "SELECT question_id FROM vidder_question_fingerprints WHERE exact_hash = ? LIMIT 1"
+
+FIND_EXACT_IN_QUIZ_SQL = """
+    SELECT f.question_id FROM vidder_question_fingerprints f
+    JOIN vidder_questions q ON q.question_id = f.question_id
+    WHERE f.exact_hash = ? AND q.quiz_id = ? LIMIT 1
+"""
+
+# Rows read from one bucket; bounds the lookup even when a bucket gets crowded
+LSH_BUCKET_LIMIT = 64
+
+# Questions sharing the most bands first; each bucket is one bounded primary-key range scan
+LSH_CANDIDATES_SQL = f"""
+    SELECT question_id FROM ({' UNION ALL '.join(
+        [f'SELECT * FROM (SELECT question_id FROM vidder_question_lsh WHERE band = ? AND bucket = ? LIMIT {LSH_BUCKET_LIMIT})']
+        * LSH_BANDS
+    )})
+    GROUP BY question_id ORDER BY COUNT(*) DESC LIMIT {MAX_CANDIDATES}
+"""
+
+# Same, with each bucket limited to one quiz's questions: a primary-key check per bucket row,
+# and other quizzes' rows are read past, so a crowded bucket costs more than LSH_BUCKET_LIMIT rows
+LSH_CANDIDATES_IN_QUIZ_SQL = f"""
+    SELECT question_id FROM ({' UNION ALL '.join(
+        [f'SELECT * FROM (SELECT l.question_id FROM vidder_question_lsh l '
+         f'JOIN vidder_questions q ON q.question_id = l.question_id '
+         f'WHERE l.band = ? AND l.bucket = ? AND q.quiz_id = ? LIMIT {LSH_BUCKET_LIMIT})']
+        * LSH_BANDS
+    )})
+    GROUP BY question_id ORDER BY COUNT(*) DESC LIMIT {MAX_CANDIDATES}
+"""
+
+def find_duplicate(conn: sqlite3.Connection, fingerprint: VidderQuestionFingerprint,
+                   threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                   quiz_id: Optional[str] = None) -> Optional[Tuple[str, float]]:
+    """(question_id, similarity) of the closest stored question at or above the threshold (in quiz_id if given)"""
+    if quiz_id is None:
+        row = conn.execute(FIND_EXACT_SQL, (fingerprint.exact_hash,)).fetchone()
+    else:
+        row = conn.execute(FIND_EXACT_IN_QUIZ_SQL, (fingerprint.exact_hash, quiz_id)).fetchone()
+    if row is not None:
+        return row[0], 1.0
+
+    params = []
+    for band, bucket in enumerate(fingerprint.bands):
+        params.extend((band, bucket) if quiz_id is None else (band, bucket, quiz_id))
+    sql = LSH_CANDIDATES_SQL if quiz_id is None else LSH_CANDIDATES_IN_QUIZ_SQL
+    candidates = [row[0] for row in conn.execute(sql, params)]
+    if not candidates:
+        return None
+
+    placeholders = ', '.join('?' for _ in candidates)
+    best = None
+    for question_id, exact_hash, blob in conn.execute(
+        f"SELECT question_id, exact_hash, signature FROM vidder_question_fingerprints "
+        f"WHERE question_id IN ({placeholders})", candidates
+    ):
+        score = fingerprint.similarity(VidderQuestionFingerprint.from_blob(exact_hash, blob))
+        if score >= threshold and (best is None or score > best[1]):
+            best = (question_id, score)
+    return best
+
+def index_question(conn: sqlite3.Connection, question_id: str, fingerprint: VidderQuestionFingerprint):
+    """Store (or replace) a question's fingerprint and LSH buckets; caller commits"""
+    conn.execute(
+        "INSERT OR REPLACE INTO vidder_question_fingerprints (question_id, exact_hash, signature) VALUES (?, ?, ?)",
+        (question_id, fingerprint.exact_hash, fingerprint.to_blob())
+    )
+    conn.execute("DELETE FROM vidder_question_lsh WHERE question_id = ?", (question_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO vidder_question_lsh (band, bucket, question_id) VALUES (?, ?, ?)",
+        [(band, bucket, question_id) for band, bucket in enumerate(fingerprint.bands)]
+    )
+
+def backfill_question_fingerprints(conn: sqlite3.Connection, cursor: int, upper: int) -> int:
+    """Fingerprint stored questions in a rowid range (migration backfill)"""
+    rows = conn.execute(
+        "SELECT question_id, question_text, options FROM vidder_questions WHERE rowid > ? AND rowid <= ?",
+        (cursor, upper)
+    ).fetchall()
+    for question_id, question_text, options in rows:
+        options = deserialize_json(options)
+        fingerprint = fingerprint_question(question_text or "", options if isinstance(options, list) else [])
+        index_question(conn, question_id, fingerprint)
+    return len(rows)
@@ -0,0 +1,105 @@
+"""
+🧵 VidderTech Database Executor
+Built by VidderTech - The Future of Quiz Bots
+
+Runs blocking sqlite3 work off the asyncio event loop:
+- Dedicated writer thread (SQLite allows one writer at a time)
+- Reader thread pool for concurrent SELECTs
+- Each job runs on a pooled, pre-configured connection
+- Queue depth and execution time statistics
+"""
+
+import asyncio
+import functools
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from .vidder_pool import VidderConnectionPool
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.executor')
+
+T = TypeVar('T')
+
+class VidderDatabaseExecutor:
+    """🧵 VidderTech Async Database Executor"""
+
+    def __init__(self, pool: VidderConnectionPool, readers: int = None):
+        """Initialize writer thread and reader threads for the given pool"""
+        self.pool = pool
+        self.readers = readers or max(1, pool.size - 1)
+
+        # Writes are funnelled through a single thread so they never fight over the write lock
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vidder-db-writer')
+        self._reader = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix='vidder-db-reader')
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'reads_queued': 0,
+            'writes_queued': 0,
+            'reads_completed': 0,
+            'writes_completed': 0,
+            'failures': 0,
+            'total_exec_seconds': 0.0,
+            'max_exec_seconds': 0.0
+        }
+
+        logger.info(f"🧵 VidderTech DB executor ready (1 writer, {self.readers} readers)")
+
+    def _call(self, kind: str, func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        """Run a job on a pooled connection inside a worker thread"""
+        started = time.monotonic()
+        try:
+            with self.pool.connection() as conn:
+                return func(conn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._stats['failures'] += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._stats[f'{kind}s_completed'] += 1
+                self._stats['total_exec_seconds'] += elapsed
+                if elapsed > self._stats['max_exec_seconds']:
+                    self._stats['max_exec_seconds'] = elapsed
+
+    async def _submit(self, kind: str, executor: ThreadPoolExecutor,
+                      func: Callable[..., T], *args, **kwargs) -> T:
+        """Queue a job and await its result without blocking the loop"""
+        with self._lock:
+            self._stats[f'{kind}s_queued'] += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(self._call, kind, func, args, kwargs)
+        )
+
+    async def read(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run func(conn, *args, **kwargs) on a reader thread"""
+        return await self._submit('read', self._reader, func, *args, **kwargs)
+
+    async def write(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run func(conn, *args, **kwargs) on the writer thread"""
+        return await self._submit('write', self._writer, func, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and (optionally) wait for queued ones"""
+        self._writer.shutdown(wait=wait)
+        self._reader.shutdown(wait=wait)
+        logger.info("🧵 VidderTech DB executor stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and execution time statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+
+        completed = stats['reads_completed'] + stats['writes_completed']
+        stats['reads_pending'] = stats['reads_queued'] - stats['reads_completed']
+        stats['writes_pending'] = stats['writes_queued'] - stats['writes_completed']
+        stats['avg_exec_ms'] = (stats['total_exec_seconds'] / completed * 1000) if completed else 0.0
+        stats['max_exec_ms'] = stats['max_exec_seconds'] * 1000
+        return stats
@@ -0,0 +1,267 @@
+"""
+📐 VidderTech Batch Grading
+Built by VidderTech - The Future of Quiz Bots
+
+Vectorized re-scoring of finished quiz attempts with:
+- A quiz's responses loaded as NumPy columns in one scan (SQLite compares answers to the key)
+- positive_marks, negative_marks and partial credit applied to every response at once
+- Per-session totals, counters and quiz-wide competition ranks from bincount and one sort
+- A session's result counts its participant's answers only; other players' answers in a
+  group session are re-graded but belong to their own attempts
+- Only responses and sessions whose result changed written back; assignment
+  submissions and the quiz average updated in the same transaction
+
+Used after an answer key fix or a marking change (negative_marking_enabled) and
+when an assignment closes. Sessions still running are left to the live scoreboard.
+The quiz-wide rank goes to quiz_rank; rank keeps the live board's rank within a session.
+"""
+
+import time
+import sqlite3
+import logging
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_scoreboard import SCORE_SCALE, VidderScoringRules
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.grading')
+
+GRADING_QUIZ_SQL = """
+    SELECT positive_marks, negative_marks, negative_marking_enabled, total_questions
+    FROM vidder_quizzes WHERE quiz_id = ?
+"""
+
+# Finished attempts of a quiz and their stored result (idx_sessions_quiz)
+GRADED_SESSIONS_SQL = """
+    SELECT rowid, COALESCE(total_questions, 0),
+           COALESCE(total_score, 0.0), COALESCE(percentage, 0.0), COALESCE(quiz_rank, 0),
+           COALESCE(questions_attempted, 0), COALESCE(questions_correct, 0),
+           COALESCE(questions_wrong, 0), COALESCE(questions_skipped, 0)
+    FROM vidder_quiz_sessions
+    WHERE quiz_id = ? AND status NOT IN ('active', 'paused')
+"""
+
+# One row per response: session rowid, response rowid, answered, correct against the
+# current key (the stored grade when there is no key to compare), partial credit, stored grade,
+# and whether it is the session participant's answer (answers without a user are)
+GRADED_RESPONSES_SQL = """
+    SELECT s.rowid, r.rowid,
+           r.selected_answer IS NOT NULL,
+           COALESCE(lower(trim(r.selected_answer)) = lower(trim(q.correct_answer)), r.is_correct, 0),
+           COALESCE(r.partial_score, 0.0),
+           COALESCE(r.is_correct, 0), COALESCE(r.marks_awarded, 0.0), COALESCE(r.negative_marks_applied, 0.0),
+           COALESCE(r.user_id, s.participant_id) IS s.participant_id
+    FROM vidder_quiz_sessions s
+    JOIN vidder_responses r ON r.session_id = s.session_id
+    LEFT JOIN vidder_questions q ON q.question_id = r.question_id
+    WHERE s.quiz_id = ? AND s.status NOT IN ('active', 'paused')
+"""
+
+UPDATE_RESPONSE_GRADE_SQL = """
+    UPDATE vidder_responses SET is_correct = ?, marks_awarded = ?, negative_marks_applied = ?
+    WHERE rowid = ?
+"""
+
+UPDATE_SESSION_RESULT_SQL = """
+    UPDATE vidder_quiz_sessions SET
+        total_score = ?, percentage = ?, quiz_rank = ?,
+        questions_attempted = ?, questions_correct = ?, questions_wrong = ?, questions_skipped = ?,
+        updated_at = ?
+    WHERE rowid = ?
+"""
+
+# Submissions carry a copy of their session's result (idx_submissions_session)
+UPDATE_SUBMISSION_RESULT_SQL = """
+    UPDATE vidder_assignment_submissions SET score = ?, percentage = ?
+    WHERE session_id = (SELECT session_id FROM vidder_quiz_sessions WHERE rowid = ?)
+"""
+
+# Rows become arrays chunk by chunk, so a million responses never sit in memory as tuples
+FETCH_CHUNK = 65536
+
+def fetch_array(conn: sqlite3.Connection, sql: str, params: tuple, width: int, dtype) -> np.ndarray:
+    """A query's rows as one 2-D array"""
+    # Plain tuples: skip sqlite3.Row construction for every fetched row
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    chunks = []
+    while True:
+        rows = cursor.fetchmany(FETCH_CHUNK)
+        if not rows:
+            break
+        chunks.append(np.array(rows, dtype=dtype))
+    return np.concatenate(chunks) if chunks else np.empty((0, width), dtype=dtype)
+
+class VidderGrades(NamedTuple):
+    """Computed grades for one quiz (columns aligned by position)"""
+    quiz_id: str
+    average_percentage: float
+    # Responses whose grade changed
+    response_rowids: np.ndarray
+    response_correct: np.ndarray
+    response_awarded: np.ndarray
+    response_negative: np.ndarray
+    # Sessions whose result changed
+    session_rowids: np.ndarray
+    session_scores: np.ndarray
+    session_percentages: np.ndarray
+    session_quiz_ranks: np.ndarray
+    session_attempted: np.ndarray
+    session_correct: np.ndarray
+    session_wrong: np.ndarray
+    session_skipped: np.ndarray
+    responses: int
+    sessions: int
+
+class VidderGradingReport(NamedTuple):
+    """What a re-grade changed"""
+    quiz_id: str
+    responses: int
+    responses_changed: int
+    sessions: int
+    average_percentage: float
+    seconds: float
+
+def grade_quiz(conn: sqlite3.Connection, quiz_id: str) -> Optional[VidderGrades]:
+    """Load a quiz's finished responses and grade them in vectorized form (DB thread)"""
+    # One read transaction, so sessions and responses come from the same snapshot
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    try:
+        quiz = conn.execute(GRADING_QUIZ_SQL, (quiz_id,)).fetchone()
+        if quiz is None:
+            return None
+        sessions = fetch_array(conn, GRADED_SESSIONS_SQL, (quiz_id,), 9, np.float64)
+        columns = fetch_array(conn, GRADED_RESPONSES_SQL, (quiz_id,), 9, np.float64)
+    finally:
+        conn.rollback()
+
+    rules = VidderScoringRules.from_row(quiz[:3])
+    quiz_questions = quiz[3] or 0
+    sessions = sessions[np.argsort(sessions[:, 0])]
+    session_rowids = sessions[:, 0].astype(np.int64)
+
+    session_index = np.searchsorted(session_rowids, columns[:, 0].astype(np.int64))
+    answered = columns[:, 2] != 0
+    correct = answered & (columns[:, 3] != 0)
+    partial = np.clip(columns[:, 4], 0.0, 1.0)
+
+    # VidderScoringRules.marks over every response at once
+    wrong = answered & ~correct
+    awarded = np.where(correct, rules.positive_marks, np.where(wrong, partial * rules.positive_marks, 0.0))
+    negative = np.where(wrong & (partial <= 0.0), rules.penalty, 0.0)
+
+    changed = (
+        (correct != (columns[:, 5] != 0))
+        | ~np.isclose(awarded, columns[:, 6])
+        | ~np.isclose(negative, columns[:, 7])
+    )
+
+    # Session results from the participant's own answers
+    own = columns[:, 8] != 0
+    count = len(session_rowids)
+    scores = np.bincount(session_index, weights=(awarded - negative) * own, minlength=count)
+    attempted = np.bincount(session_index, weights=answered & own, minlength=count).astype(np.int64)
+    correct_counts = np.bincount(session_index, weights=correct & own, minlength=count).astype(np.int64)
+    skipped = np.bincount(session_index, weights=own, minlength=count).astype(np.int64) - attempted
+
+    # Maximum per session: its own question count, else the quiz's, else what it saw
+    questions = np.where(sessions[:, 1] > 0, sessions[:, 1], quiz_questions)
+    questions = np.where(questions > 0, questions, attempted + skipped)
+    maximum = questions * rules.positive_marks
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentages = np.where(maximum > 0, np.maximum(scores, 0.0) / maximum * 100, 0.0)
+    percentages = np.round(percentages, 2)
+
+    # Competition ranks across the quiz's attempts, on the scoreboard's fixed-point scores
+    units = np.rint(scores * SCORE_SCALE).astype(np.int64)
+    ranks = np.searchsorted(np.sort(-units), -units, side='left') + 1
+
+    scores = np.round(scores, 2)
+    wrong_counts = attempted - correct_counts
+    result = np.column_stack((scores, percentages, ranks, attempted, correct_counts, wrong_counts, skipped))
+    moved = np.any(~np.isclose(result, sessions[:, 2:]), axis=1)
+
+    return VidderGrades(
+        quiz_id=quiz_id,
+        average_percentage=float(percentages.mean()) if count else 0.0,
+        response_rowids=columns[changed, 1].astype(np.int64),
+        response_correct=correct[changed].astype(np.int64),
+        response_awarded=awarded[changed],
+        response_negative=negative[changed],
+        session_rowids=session_rowids[moved],
+        session_scores=scores[moved],
+        session_percentages=percentages[moved],
+        session_quiz_ranks=ranks[moved],
+        session_attempted=attempted[moved],
+        session_correct=correct_counts[moved],
+        session_wrong=wrong_counts[moved],
+        session_skipped=skipped[moved],
+        responses=len(columns),
+        sessions=count
+    )
+
+def write_grades(conn: sqlite3.Connection, grades: VidderGrades) -> int:
+    """Store changed response grades and session results in one transaction (DB thread)"""
+    now = datetime.now().isoformat()
+    try:
+        conn.executemany(UPDATE_RESPONSE_GRADE_SQL, zip(
+            grades.response_correct.tolist(), grades.response_awarded.tolist(),
+            grades.response_negative.tolist(), grades.response_rowids.tolist()
+        ))
+        conn.executemany(UPDATE_SESSION_RESULT_SQL, zip(
+            grades.session_scores.tolist(), grades.session_percentages.tolist(),
+            grades.session_quiz_ranks.tolist(), grades.session_attempted.tolist(),
+            grades.session_correct.tolist(), grades.session_wrong.tolist(),
+            grades.session_skipped.tolist(), [now] * len(grades.session_rowids),
+            grades.session_rowids.tolist()
+        ))
+        conn.executemany(UPDATE_SUBMISSION_RESULT_SQL, zip(
+            grades.session_scores.tolist(), grades.session_percentages.tolist(),
+            grades.session_rowids.tolist()
+        ))
+        conn.execute(
+            "UPDATE vidder_quizzes SET average_score = ?, updated_at = ? WHERE quiz_id = ?",
+            (round(grades.average_percentage, 2), now, grades.quiz_id)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(grades.response_rowids)
+
+class VidderBatchGrader:
+    """📐 VidderTech Vectorized Re-grading Engine"""
+
+    def __init__(self, executor: VidderDatabaseExecutor):
+        """Initialize over the shared executor"""
+        self.executor = executor
+
+    async def regrade(self, quiz_id: str) -> Optional[VidderGradingReport]:
+        """Re-score every finished attempt of a quiz; None if the quiz does not exist"""
+        started = time.monotonic()
+
+        # Loading and the NumPy work run on a reader thread; only the writes take the writer
+        grades = await self.executor.read(grade_quiz, quiz_id)
+        if grades is None:
+            return None
+        changed = await self.executor.write(write_grades, grades)
+
+        report = VidderGradingReport(
+            quiz_id=quiz_id,
+            responses=grades.responses,
+            responses_changed=changed,
+            sessions=grades.sessions,
+            average_percentage=round(grades.average_percentage, 2),
+            seconds=time.monotonic() - started
+        )
+        logger.info(
+            f"📐 Re-graded quiz {quiz_id}: {report.responses} responses ({report.responses_changed} changed), "
+            f"{report.sessions} sessions ({len(grades.session_rowids)} changed) in {report.seconds:.2f}s"
+        )
+        return report
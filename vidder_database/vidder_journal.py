@@ -0,0 +1,367 @@
+"""
+📓 VidderTech Live Session Journal
+Built by VidderTech - The Future of Quiz Bots
+
+Crash-safe record of live quiz session events with:
+- Append-only segment files of length-prefixed, CRC-checked records
+- Group commit: records appended while one fsync runs share the next one
+- sync() for callers that must not acknowledge before their record is on disk
+- Periodic snapshots: rotate to a new segment, make the database current, drop old segments
+- Replay that stops cleanly at a torn tail left by a crash mid-write
+- Segments from an earlier run kept until their replay has succeeded
+
+Records are small JSON arrays: ['open', session], ['set', session_id, updates, data]
+and ['answer', response]. Every 'set' carries absolute column values and an
+RFC 7396 session_data patch, so replaying a record the database already holds
+is harmless.
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.journal')
+
+# Record frame: payload length and CRC32, then the JSON payload
+FRAME_HEADER = struct.Struct('<II')
+
+# Larger records mean a corrupt length field, not a real record
+MAX_RECORD_BYTES = 16 * 1024 * 1024
+
+# Buffered bytes that trigger a commit without waiting for the fsync interval
+MAX_BUFFER_BYTES = 1024 * 1024
+
+SEGMENT_PREFIX = 'session-'
+SEGMENT_SUFFIX = '.journal'
+
+def encode_record(record: List[Any]) -> bytes:
+    """One framed journal record"""
+    payload = json.dumps(record, default=str, separators=(',', ':')).encode('utf-8')
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def decode_records(data: bytes) -> Tuple[List[List[Any]], int]:
+    """Records in a segment and the offset where the valid ones end"""
+    records = []
+    offset = 0
+    header_size = FRAME_HEADER.size
+    while offset + header_size <= len(data):
+        length, crc = FRAME_HEADER.unpack_from(data, offset)
+        end = offset + header_size + length
+        if length > MAX_RECORD_BYTES or end > len(data):
+            break
+        payload = data[offset + header_size:end]
+        if zlib.crc32(payload) != crc:
+            break
+        try:
+            records.append(json.loads(payload))
+        except ValueError:
+            break
+        offset = end
+    return records, offset
+
+class VidderSessionJournal:
+    """📓 VidderTech Append-Only Session Journal"""
+
+    def __init__(self, directory: str, fsync_interval_ms: int = 10, snapshot_interval: float = 60.0):
+        """Initialize (nothing is journaled until start())"""
+        self.directory = Path(directory)
+        self.fsync_interval = fsync_interval_ms / 1000
+        self.snapshot_interval = snapshot_interval
+
+        # File writes and fsyncs run on their own thread, in order, off the DB threads
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vidder-journal')
+
+        self._file: Optional[BinaryIO] = None
+        self.segment = 0
+        # First segment of this run; older ones belong to a replay not yet confirmed
+        self._first_segment = 0
+        self._replayed = False
+        self._buffer = bytearray()
+        self._appended = 0
+        self._synced = 0
+        self._since_snapshot = 0
+        self._waiters: List[Tuple[int, asyncio.Future]] = []
+
+        self._lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[Callable[[], Awaitable[Any]]] = None
+        self._closing = False
+
+        self.stats = {
+            'records': 0,
+            'bytes': 0,
+            'fsyncs': 0,
+            'snapshots': 0,
+            'segments_removed': 0,
+            'write_errors': 0,
+            'replayed': 0,
+            'torn_bytes': 0
+        }
+
+    # Segment files (journal thread)
+    def _segments(self) -> List[Tuple[int, Path]]:
+        """Existing segments, oldest first"""
+        segments = []
+        if not self.directory.is_dir():
+            return segments
+        for path in self.directory.glob(f'{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}'):
+            try:
+                segments.append((int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]), path))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f'{SEGMENT_PREFIX}{segment:010d}{SEGMENT_SUFFIX}'
+
+    def _fsync_directory(self):
+        """Make segment creation and removal durable"""
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _open_segment(self, segment: int) -> BinaryIO:
+        handle = open(self._segment_path(segment), 'ab')
+        self._fsync_directory()
+        return handle
+
+    @staticmethod
+    def _write_sync(handle: BinaryIO, data: bytes):
+        """Append and fsync; a failed write is cut back so no partial record is left"""
+        position = handle.tell()
+        try:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        except Exception:
+            try:
+                handle.truncate(position)
+                handle.seek(position)
+            except OSError:
+                pass
+            raise
+
+    def _read_all(self) -> List[List[Any]]:
+        """Every intact record, oldest segment first"""
+        records = []
+        for segment, path in self._segments():
+            data = path.read_bytes()
+            segment_records, end = decode_records(data)
+            records.extend(segment_records)
+            if end < len(data):
+                self.stats['torn_bytes'] += len(data) - end
+                logger.warning(
+                    f"📓 Journal segment {segment} ends in {len(data) - end} unreadable bytes "
+                    f"(torn write); replaying the {len(segment_records)} records before them"
+                )
+        return records
+
+    def _remove_range(self, low: int, high: int) -> int:
+        """Delete segments numbered low <= n < high"""
+        removed = 0
+        for number, path in self._segments():
+            if low <= number < high:
+                path.unlink()
+                removed += 1
+        if removed:
+            self._fsync_directory()
+        return removed
+
+    async def _in_io(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._io, func, *args)
+
+    # Recovery and lifecycle
+    async def replay(self) -> List[List[Any]]:
+        """Read every record left by the previous run (call before start())"""
+        records = await self._in_io(self._read_all)
+        self.stats['replayed'] += len(records)
+        return records
+
+    async def start(self, snapshot: Callable[[], Awaitable[Any]]):
+        """Begin a new segment; snapshot() must make every journaled change durable elsewhere"""
+        if self._file is not None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = await self._in_io(self._segments)
+        self.segment = (segments[-1][0] if segments else 0) + 1
+        self._first_segment = self.segment
+        self._replayed = not segments
+        self._file = await self._in_io(self._open_segment, self.segment)
+
+        self._snapshot = snapshot
+        self._closing = False
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+        logger.info(f"📓 Session journal writing segment {self.segment} "
+                    f"(fsync window {self.fsync_interval * 1000:.0f} ms)")
+
+    async def discard_replayed(self) -> int:
+        """Drop the segments replay() read, once their changes are durable in the database"""
+        removed = await self._in_io(self._remove_range, 0, self._first_segment)
+        self._replayed = True
+        self.stats['segments_removed'] += removed
+        return removed
+
+    async def stop(self):
+        """Commit what is buffered, take a final snapshot and close the segment"""
+        if self._file is None:
+            return
+
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            try:
+                await self._snapshot_task
+            except asyncio.CancelledError:
+                pass
+
+        self._closing = True
+        self._wakeup.set()
+        await self._flush_task
+
+        try:
+            await self.snapshot()
+        except Exception as e:
+            logger.error(f"❌ Final journal snapshot failed; segments kept for replay: {e}")
+
+        handle, self._file = self._file, None
+        await self._in_io(handle.close)
+        path = self._segment_path(self.segment)
+        if path.stat().st_size == 0:
+            await self._in_io(path.unlink)
+        logger.info(f"📓 Session journal closed ({self.stats['records']} records, {self.stats['fsyncs']} fsyncs)")
+
+    # Appending
+    def append(self, kind: str, *fields: Any):
+        """Buffer one record; it reaches disk with the next group commit"""
+        if self._file is None or self._closing:
+            return
+
+        frame = encode_record([kind, *fields])
+        self._buffer += frame
+        self._appended += 1
+        self._since_snapshot += 1
+        self.stats['records'] += 1
+        self.stats['bytes'] += len(frame)
+        self._wakeup.set()
+
+    async def sync(self):
+        """Wait until every record appended so far is on disk"""
+        if self._file is None or self._synced >= self._appended:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((self._appended, future))
+        await future
+
+    async def _flush(self):
+        """Write and fsync everything buffered (callers hold the lock)"""
+        if not self._buffer:
+            return
+
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        target = self._appended
+        try:
+            await self._in_io(self._write_sync, self._file, data)
+        except Exception as e:
+            # Keep the records for the next attempt; callers waiting on them hear about it now
+            self._buffer[0:0] = data
+            self.stats['write_errors'] += 1
+            waiting = [future for upto, future in self._waiters if upto <= target]
+            self._waiters = [(upto, future) for upto, future in self._waiters if upto > target]
+            for future in waiting:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+        self._synced = target
+        self.stats['fsyncs'] += 1
+        still_waiting = []
+        for upto, future in self._waiters:
+            if upto <= target:
+                if not future.done():
+                    future.set_result(None)
+            else:
+                still_waiting.append((upto, future))
+        self._waiters = still_waiting
+
+    async def _flush_loop(self):
+        """Group commit: records appended during one fsync share the next"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self.fsync_interval and not self._closing and len(self._buffer) < MAX_BUFFER_BYTES:
+                await asyncio.sleep(self.fsync_interval)
+
+            try:
+                async with self._lock:
+                    await self._flush()
+            except Exception as e:
+                logger.error(f"❌ Journal write failed ({len(self._buffer)} bytes pending): {e}")
+                if self._closing:
+                    return
+                await asyncio.sleep(max(self.fsync_interval, 0.1))
+                self._wakeup.set()
+                continue
+
+            if self._closing:
+                return
+
+    # Snapshots
+    async def snapshot(self) -> int:
+        """Start a new segment, make the database current, then drop older segments"""
+        async with self._lock:
+            await self._flush()
+            handle = self._file
+            self.segment += 1
+            self._file = await self._in_io(self._open_segment, self.segment)
+            await self._in_io(handle.close)
+            self._since_snapshot = 0
+
+        # Everything before the new segment was staged before this point, so the snapshot covers it
+        started = time.monotonic()
+        await self._snapshot()
+        # Until discard_replayed(), records from the previous run are still needed for the next start
+        low = 0 if self._replayed else self._first_segment
+        removed = await self._in_io(self._remove_range, low, self.segment)
+
+        self.stats['snapshots'] += 1
+        self.stats['segments_removed'] += removed
+        logger.debug(f"📓 Journal snapshot in {(time.monotonic() - started) * 1000:.1f} ms "
+                     f"({removed} segments removed)")
+        return removed
+
+    async def _snapshot_loop(self):
+        """Periodic snapshots keep replay short"""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if not self._since_snapshot:
+                continue
+            try:
+                await self.snapshot()
+            except Exception as e:
+                logger.error(f"❌ Journal snapshot failed; segments kept for replay: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get append, fsync and snapshot counters"""
+        stats = dict(self.stats)
+        stats['segment'] = self.segment
+        stats['pending_bytes'] = len(self._buffer)
+        stats['unsynced_records'] = self._appended - self._synced
+        stats['since_snapshot'] = self._since_snapshot
+        return stats
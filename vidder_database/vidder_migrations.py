@@ -0,0 +1,430 @@
+"""
+🧬 VidderTech Schema Migrations
+Built by VidderTech - The Future of Quiz Bots
+
+Versioned schema evolution with:
+- Schema version tracked in PRAGMA user_version
+- DDL steps applied in order, each in its own transaction, at startup
+- Online backfills run in small rowid-range batches on the writer thread
+- Resumable progress (the backfill cursor survives restarts)
+
+VIDDER_DATABASE_SCHEMA is the version 0 baseline. New columns, tables and data
+fixes go into VIDDER_MIGRATIONS rather than into the baseline, so existing
+databases and fresh ones end up identical.
+"""
+
+import asyncio
+import sqlite3
+import time
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_dedup import QUESTION_INDEX_DDL, backfill_question_fingerprints
+from .vidder_search import (
+    QUIZ_SEARCH_DDL, QUESTION_SEARCH_DDL, QUIZ_SEARCH_BACKFILL_SQL, QUESTION_SEARCH_BACKFILL_SQL
+)
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.migrations')
+
+MIGRATIONS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS vidder_schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TEXT,
+    backfill_cursor INTEGER DEFAULT 0,
+    backfill_rows INTEGER DEFAULT 0,
+    backfill_completed_at TEXT
+)
+"""
+
+@dataclass(frozen=True)
+class VidderBackfill:
+    """Chunked data migration over one table, walked in rowid order"""
+    table: str
+    # UPDATE/INSERT statement bound to (cursor, upper): rowid > ? AND rowid <= ?
+    # (use ?1 / ?2 when the range appears more than once)
+    sql: str = ""
+    # For data SQL cannot compute: func(conn, cursor, upper) -> rows changed, run instead of sql
+    func: Optional[Callable[[sqlite3.Connection, int, int], int]] = None
+
+@dataclass(frozen=True)
+class VidderMigration:
+    """One schema version step"""
+    version: int
+    name: str
+    ddl: str = ""
+    backfill: Optional[VidderBackfill] = None
+
+# Recompute answer counters of sessions in a rowid range from vidder_responses
+SESSION_COUNTERS_BACKFILL_SQL = """
+    UPDATE vidder_quiz_sessions SET
+        questions_attempted = (SELECT COUNT(*) FROM vidder_responses r
+            WHERE r.session_id = vidder_quiz_sessions.session_id AND r.selected_answer IS NOT NULL),
+        questions_correct = (SELECT COUNT(*) FROM vidder_responses r
+            WHERE r.session_id = vidder_quiz_sessions.session_id
+              AND r.selected_answer IS NOT NULL AND r.is_correct = 1),
+        questions_wrong = (SELECT COUNT(*) FROM vidder_responses r
+            WHERE r.session_id = vidder_quiz_sessions.session_id
+              AND r.selected_answer IS NOT NULL AND r.is_correct = 0),
+        questions_skipped = (SELECT COUNT(*) FROM vidder_responses r
+            WHERE r.session_id = vidder_quiz_sessions.session_id AND r.selected_answer IS NULL),
+        total_score = (SELECT COALESCE(SUM(r.marks_awarded - r.negative_marks_applied), 0.0)
+            FROM vidder_responses r WHERE r.session_id = vidder_quiz_sessions.session_id)
+    WHERE rowid > ? AND rowid <= ?
+      AND EXISTS (SELECT 1 FROM vidder_responses r WHERE r.session_id = vidder_quiz_sessions.session_id)
+"""
+
+# Answer keys in the stored answer form (normalize_answer): NULL instead of 'None' or
+# a negative index, option letters instead of option indexes
+ANSWER_KEY_BACKFILL_SQL = """
+    UPDATE vidder_questions SET correct_answer = CASE
+        WHEN trim(correct_answer) IN ('', 'None') OR trim(correct_answer) GLOB '-[0-9]*' THEN NULL
+        WHEN (trim(correct_answer) GLOB '[0-9]' OR trim(correct_answer) GLOB '[0-9][0-9]')
+             AND CAST(trim(correct_answer) AS INTEGER) < 26
+             AND json_valid(options) AND json_type(options) = 'array'
+             AND CAST(trim(correct_answer) AS INTEGER) < json_array_length(options)
+            THEN char(65 + CAST(trim(correct_answer) AS INTEGER))
+        ELSE trim(correct_answer)
+    END
+    WHERE rowid > ? AND rowid <= ? AND correct_answer IS NOT NULL
+"""
+
+# Ordered migration list - append only, never edit an applied step
+VIDDER_MIGRATIONS: List[VidderMigration] = [
+    VidderMigration(
+        version=1,
+        name="analytics_event_date",
+        backfill=VidderBackfill(
+            table="vidder_analytics",
+            sql="""
+                UPDATE vidder_analytics SET date = substr(timestamp, 1, 10)
+                WHERE rowid > ? AND rowid <= ? AND date IS NULL AND timestamp IS NOT NULL
+            """
+        )
+    ),
+    VidderMigration(
+        version=2,
+        name="session_counters_from_responses",
+        # Sessions created before batched answer ingestion never had their counters maintained.
+        # Recomputing from vidder_responses is safe alongside the response writer because both
+        # run on the writer thread and each answer batch commits rows and counters together.
+        backfill=VidderBackfill(
+            table="vidder_quiz_sessions",
+            sql=SESSION_COUNTERS_BACKFILL_SQL
+        )
+    ),
+    VidderMigration(
+        version=3,
+        name="quiz_access_table",
+        # vidder_quizzes.allowed_users / allowed_groups -> one row per grant
+        ddl="""
+            CREATE TABLE IF NOT EXISTS vidder_quiz_access (
+                quiz_id TEXT NOT NULL,
+                principal_type TEXT NOT NULL CHECK (principal_type IN ('user', 'group')),
+                principal_id INTEGER NOT NULL,
+                granted_at TEXT,
+                PRIMARY KEY (quiz_id, principal_type, principal_id),
+                FOREIGN KEY (quiz_id) REFERENCES vidder_quizzes (quiz_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_quiz_access_principal
+                ON vidder_quiz_access(principal_type, principal_id);
+        """,
+        backfill=VidderBackfill(
+            table="vidder_quizzes",
+            sql="""
+                INSERT OR IGNORE INTO vidder_quiz_access (quiz_id, principal_type, principal_id, granted_at)
+                SELECT q.quiz_id, 'user', CAST(j.value AS INTEGER), q.created_at
+                FROM vidder_quizzes q,
+                     json_each(CASE WHEN json_valid(q.allowed_users) THEN q.allowed_users ELSE '[]' END) j
+                WHERE q.rowid > ?1 AND q.rowid <= ?2 AND j.atom IS NOT NULL
+                UNION ALL
+                SELECT q.quiz_id, 'group', CAST(j.value AS INTEGER), q.created_at
+                FROM vidder_quizzes q,
+                     json_each(CASE WHEN json_valid(q.allowed_groups) THEN q.allowed_groups ELSE '[]' END) j
+                WHERE q.rowid > ?1 AND q.rowid <= ?2 AND j.atom IS NOT NULL
+            """
+        )
+    ),
+    VidderMigration(
+        version=4,
+        name="assignment_submissions_table",
+        # vidder_assignments.submissions -> one row per user attempt
+        ddl="""
+            CREATE TABLE IF NOT EXISTS vidder_assignment_submissions (
+                assignment_id TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                attempt INTEGER NOT NULL DEFAULT 1,
+                session_id TEXT,
+                score REAL DEFAULT 0.0,
+                percentage REAL DEFAULT 0.0,
+                data TEXT DEFAULT '{}',
+                submitted_at TEXT,
+                PRIMARY KEY (assignment_id, user_id, attempt),
+                FOREIGN KEY (assignment_id) REFERENCES vidder_assignments (assignment_id),
+                FOREIGN KEY (user_id) REFERENCES vidder_users (user_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_submissions_user
+                ON vidder_assignment_submissions(user_id, submitted_at);
+        """,
+        backfill=VidderBackfill(
+            table="vidder_assignments",
+            sql="""
+                INSERT OR IGNORE INTO vidder_assignment_submissions
+                (assignment_id, user_id, attempt, session_id, score, percentage, data, submitted_at)
+                SELECT a.assignment_id,
+                       CAST(json_extract(j.value, '$.user_id') AS INTEGER),
+                       COALESCE(json_extract(j.value, '$.attempt'), 1),
+                       json_extract(j.value, '$.session_id'),
+                       COALESCE(json_extract(j.value, '$.score'), 0.0),
+                       COALESCE(json_extract(j.value, '$.percentage'), 0.0),
+                       j.value,
+                       COALESCE(json_extract(j.value, '$.submitted_at'), a.updated_at)
+                FROM vidder_assignments a,
+                     json_each(CASE WHEN json_valid(a.submissions) THEN a.submissions ELSE '[]' END) j
+                WHERE a.rowid > ? AND a.rowid <= ?
+                  AND j.type = 'object' AND json_extract(j.value, '$.user_id') IS NOT NULL
+            """
+        )
+    ),
+    VidderMigration(
+        version=5,
+        name="session_answers_to_responses",
+        # vidder_quiz_sessions.answers ({question_id: answer}) -> vidder_responses rows
+        backfill=VidderBackfill(
+            table="vidder_quiz_sessions",
+            sql="""
+                INSERT OR IGNORE INTO vidder_responses
+                (response_id, session_id, question_id, user_id, selected_answer, is_correct, submitted_at)
+                SELECT s.session_id || ':' || j.key, s.session_id, j.key, s.participant_id,
+                       CASE WHEN j.type = 'object' THEN json_extract(j.value, '$.selected_answer') ELSE j.value END,
+                       CASE WHEN j.type = 'object' THEN COALESCE(json_extract(j.value, '$.is_correct'), 0) ELSE 0 END,
+                       COALESCE(s.updated_at, s.created_at)
+                FROM vidder_quiz_sessions s,
+                     json_each(CASE WHEN json_valid(s.answers)
+                                    THEN CASE WHEN json_type(s.answers) = 'object' THEN s.answers ELSE '{}' END
+                                    ELSE '{}' END) j
+                WHERE s.rowid > ? AND s.rowid <= ?
+            """
+        )
+    ),
+    VidderMigration(
+        version=6,
+        name="session_counters_after_answer_import",
+        backfill=VidderBackfill(
+            table="vidder_quiz_sessions",
+            sql=SESSION_COUNTERS_BACKFILL_SQL
+        )
+    ),
+    VidderMigration(
+        version=7,
+        name="question_duplicate_index",
+        ddl=QUESTION_INDEX_DDL,
+        backfill=VidderBackfill(
+            table="vidder_questions",
+            func=backfill_question_fingerprints
+        )
+    ),
+    VidderMigration(
+        version=8,
+        name="quiz_search_index",
+        ddl=QUIZ_SEARCH_DDL,
+        backfill=VidderBackfill(
+            table="vidder_quizzes",
+            sql=QUIZ_SEARCH_BACKFILL_SQL
+        )
+    ),
+    VidderMigration(
+        version=9,
+        name="question_search_index",
+        ddl=QUESTION_SEARCH_DDL,
+        backfill=VidderBackfill(
+            table="vidder_questions",
+            sql=QUESTION_SEARCH_BACKFILL_SQL
+        )
+    ),
+    VidderMigration(
+        version=10,
+        name="grading_indexes",
+        # Batch re-grading reads a quiz's sessions and refreshes the submissions made from them
+        ddl="""
+            CREATE INDEX IF NOT EXISTS idx_sessions_quiz ON vidder_quiz_sessions(quiz_id, status);
+            CREATE INDEX IF NOT EXISTS idx_submissions_session ON vidder_assignment_submissions(session_id);
+        """
+    ),
+    VidderMigration(
+        version=11,
+        name="normalize_answer_keys",
+        backfill=VidderBackfill(
+            table="vidder_questions",
+            sql=ANSWER_KEY_BACKFILL_SQL
+        )
+    ),
+    VidderMigration(
+        version=12,
+        name="session_quiz_rank",
+        # rank stays the live board's rank within a session; re-grading ranks across the quiz
+        ddl="ALTER TABLE vidder_quiz_sessions ADD COLUMN quiz_rank INTEGER;"
+    )
+]
+
+class VidderMigrator:
+    """🧬 VidderTech Migration Runner"""
+
+    def __init__(self, migrations: List[VidderMigration] = VIDDER_MIGRATIONS,
+                 batch_size: int = 1000, batch_pause: float = 0.05):
+        """Initialize runner with an ordered migration list"""
+        versions = [migration.version for migration in migrations]
+        if versions != sorted(set(versions)) or (versions and versions[0] < 1):
+            raise ValueError("Migration versions must be unique, ascending and start at 1")
+
+        self.migrations = migrations
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    # Schema steps (startup, synchronous)
+    @staticmethod
+    def current_version(conn: sqlite3.Connection) -> int:
+        """Schema version stored in the database header"""
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self, conn: sqlite3.Connection) -> List[int]:
+        """Apply pending schema steps in order; returns applied versions"""
+        conn.execute(MIGRATIONS_TABLE_SQL)
+        conn.commit()
+
+        current = self.current_version(conn)
+        if current > self.latest_version:
+            raise RuntimeError(
+                f"Database schema v{current} is newer than this build (v{self.latest_version})"
+            )
+
+        applied = []
+        for migration in self.migrations:
+            if migration.version <= current:
+                continue
+
+            # user_version lives in the database header, so it commits with the DDL
+            script = f"""
+                BEGIN;
+                {migration.ddl}
+                INSERT OR REPLACE INTO vidder_schema_migrations (version, name, applied_at, backfill_completed_at)
+                VALUES ({migration.version}, '{migration.name}', '{datetime.now().isoformat()}',
+                        {'NULL' if migration.backfill else "'" + datetime.now().isoformat() + "'"});
+                PRAGMA user_version = {migration.version};
+                COMMIT;
+            """
+            try:
+                conn.executescript(script)
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"❌ Migration v{migration.version} ({migration.name}) failed: {e}")
+                raise
+
+            applied.append(migration.version)
+            logger.info(f"🧬 Applied migration v{migration.version}: {migration.name}")
+
+        return applied
+
+    # Backfills (online, chunked)
+    @staticmethod
+    def _pending_backfills(conn: sqlite3.Connection) -> Dict[int, int]:
+        """version -> rowid cursor for unfinished backfills (DB thread)"""
+        rows = conn.execute("""
+            SELECT version, backfill_cursor FROM vidder_schema_migrations
+            WHERE backfill_completed_at IS NULL ORDER BY version
+        """).fetchall()
+        return {row[0]: row[1] or 0 for row in rows}
+
+    @staticmethod
+    def _backfill_batch(conn: sqlite3.Connection, version: int, backfill: VidderBackfill,
+                        cursor: int, batch_size: int) -> Optional[int]:
+        """Process one rowid range and persist the cursor in the same transaction (DB thread)"""
+        upper = conn.execute(
+            f"SELECT MAX(rowid) FROM (SELECT rowid FROM {backfill.table} "
+            f"WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+            (cursor, batch_size)
+        ).fetchone()[0]
+
+        try:
+            if upper is None:
+                conn.execute(
+                    "UPDATE vidder_schema_migrations SET backfill_completed_at = ? WHERE version = ?",
+                    (datetime.now().isoformat(), version)
+                )
+            else:
+                if backfill.func is not None:
+                    changed = backfill.func(conn, cursor, upper)
+                else:
+                    changed = conn.execute(backfill.sql, (cursor, upper)).rowcount
+                conn.execute("""
+                    UPDATE vidder_schema_migrations
+                    SET backfill_cursor = ?, backfill_rows = backfill_rows + ?
+                    WHERE version = ?
+                """, (upper, max(changed, 0), version))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return upper
+
+    async def run_backfills(self, executor: VidderDatabaseExecutor):
+        """Run unfinished backfills, yielding to live traffic between batches"""
+        pending = await executor.read(self._pending_backfills)
+        by_version = {migration.version: migration for migration in self.migrations}
+
+        for version, cursor in pending.items():
+            migration = by_version.get(version)
+            if migration is None or migration.backfill is None:
+                continue
+
+            started = time.monotonic()
+            batches = 0
+            logger.info(f"🧬 Backfill v{version} ({migration.name}) starting at rowid {cursor}")
+
+            while cursor is not None:
+                cursor = await executor.write(
+                    self._backfill_batch, version, migration.backfill, cursor, self.batch_size
+                )
+                batches += 1
+                # Give queued bot queries the writer thread before the next batch
+                await asyncio.sleep(self.batch_pause)
+
+            logger.info(
+                f"✅ Backfill v{version} ({migration.name}) done: "
+                f"{batches} batches in {time.monotonic() - started:.1f}s"
+            )
+
+    async def _run(self, executor: VidderDatabaseExecutor):
+        """Background wrapper that logs instead of crashing the bot"""
+        try:
+            await self.run_backfills(executor)
+        except asyncio.CancelledError:
+            logger.info("🧬 Backfills paused - progress is kept for the next start")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Backfill error: {e}")
+
+    def start(self, executor: VidderDatabaseExecutor):
+        """Start backfills in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(executor))
+
+    async def stop(self):
+        """Stop backfills after the current batch"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
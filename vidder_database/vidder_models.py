@@ -52,6 +52,16 @@ def generate_id(prefix: str = "") -> str:
     """Generate unique ID with VidderTech prefix"""
     return f"{prefix}{uuid.uuid4().hex[:12]}"
 
+def normalize_answer(answer: Any) -> Optional[str]:
+    """Stored form of an answer key or a selected answer: option letter for an index, else trimmed text"""
+    if answer is None:
+        return None
+    if isinstance(answer, int) and not isinstance(answer, bool):
+        # Parsers give option indexes (0 = A); a negative index means no key
+        return chr(ord('A') + answer) if 0 <= answer < 26 else None
+    text = str(answer).strip()
+    return text or None
+
 def serialize_json(data: Any) -> str:
     """Safely serialize data to JSON"""
     try:
@@ -426,7 +436,14 @@ CREATE INDEX IF NOT EXISTS idx_quizzes_creator ON vidder_quizzes(creator_id);
 CREATE INDEX IF NOT EXISTS idx_quizzes_status ON vidder_quizzes(status);
 CREATE INDEX IF NOT EXISTS idx_questions_quiz ON vidder_questions(quiz_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_user ON vidder_quiz_sessions(participant_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_group_status ON vidder_quiz_sessions(group_id, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_group_paused ON vidder_quiz_sessions(group_id, paused_at) WHERE status = 'paused';
+CREATE INDEX IF NOT EXISTS idx_sessions_live ON vidder_quiz_sessions(created_at) WHERE status IN ('active', 'paused');
 CREATE INDEX IF NOT EXISTS idx_responses_session ON vidder_responses(session_id);
+CREATE INDEX IF NOT EXISTS idx_responses_user ON vidder_responses(user_id, submitted_at);
+CREATE INDEX IF NOT EXISTS idx_responses_question ON vidder_responses(question_id, is_correct);
+CREATE INDEX IF NOT EXISTS idx_bot_stats_date ON vidder_bot_stats(date);
+CREATE INDEX IF NOT EXISTS idx_filters_user ON vidder_filters(user_id);
 CREATE INDEX IF NOT EXISTS idx_analytics_event ON vidder_analytics(event_type);
 CREATE INDEX IF NOT EXISTS idx_analytics_date ON vidder_analytics(date);
 """
@@ -0,0 +1,252 @@
+"""
+🔌 VidderTech SQLite Connection Pool
+Built by VidderTech - The Future of Quiz Bots
+
+Bounded pool of warmed SQLite connections with:
+- Connection reuse (no per-query file open)
+- One-time PRAGMA setup per connection
+- Idle health checks with transparent replacement (outside the pool lock)
+- Checkout wait-time statistics for pool sizing
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Optional
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.pool')
+
+# PRAGMAs applied once to every new connection
+VIDDER_DEFAULT_PRAGMAS = {
+    'busy_timeout': 5000,
+}
+
+class VidderPoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+class VidderConnectionPool:
+    """🔌 VidderTech Bounded SQLite Connection Pool"""
+
+    def __init__(self, db_path: str, size: int = 5, timeout: float = 10.0,
+                 health_check_interval: float = 30.0,
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 cached_statements: int = 128):
+        """Initialize connection pool (connections are opened lazily)"""
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pragmas = dict(VIDDER_DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.cached_statements = cached_statements
+
+        self._lock = threading.Condition(threading.Lock())
+        self._idle: Deque[sqlite3.Connection] = deque()
+        self._last_used: Dict[int, float] = {}
+        self._created = 0
+        self._closed = False
+
+        # Checkout statistics
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'connections_created': 0,
+            'connections_discarded': 0,
+            'health_check_failures': 0
+        }
+
+        logger.info(f"🔌 VidderTech connection pool ready: {db_path} (size={size})")
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open and configure a new pooled connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+        return conn
+
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply per-connection PRAGMAs once at creation time"""
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+    def _needs_check(self, conn: sqlite3.Connection) -> bool:
+        """Whether an idle connection sat long enough to need a health check (lock must be held)"""
+        last_used = self._last_used.get(id(conn), 0.0)
+        return time.monotonic() - last_used >= self.health_check_interval
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Check an idle connection before handing it out (called without the lock)"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            with self._lock:
+                self._stats['health_check_failures'] += 1
+            logger.warning(f"⚠️ Discarding unhealthy pooled connection: {e}")
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection and free its pool slot (lock must be held)"""
+        self._last_used.pop(id(conn), None)
+        self._created -= 1
+        self._stats['connections_discarded'] += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def acquire(self, block: bool = True, timeout: Optional[float] = None) -> Optional[sqlite3.Connection]:
+        """
+        Check out a connection
+
+        Returns None when block is False and the pool is exhausted.
+        Raises VidderPoolTimeout when blocking and no connection frees up in time.
+        Health checks and new connections run outside the lock, so waiters never
+        queue behind a database round-trip.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        waited = False
+
+        while True:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise sqlite3.ProgrammingError("Connection pool is closed")
+
+                    # Prefer the most recently used (warmest) connection
+                    if self._idle:
+                        conn = self._idle.pop()
+                        if not self._needs_check(conn):
+                            return self._record_checkout(conn, started, waited)
+                        break
+
+                    if self._created < self.size:
+                        self._created += 1
+                        conn = None
+                        break
+
+                    if not block:
+                        return None
+
+                    remaining = timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise VidderPoolTimeout(
+                            f"No database connection available after {timeout:.1f}s (pool size {self.size})"
+                        )
+
+                    waited = True
+                    self._lock.wait(remaining)
+
+            if conn is not None:
+                # A long-idle connection: check it without holding the lock
+                if self._is_healthy(conn):
+                    with self._lock:
+                        return self._record_checkout(conn, started, waited)
+                with self._lock:
+                    self._discard(conn)
+                    self._lock.notify()
+                continue
+
+            # Open the new connection outside the lock
+            try:
+                conn = self._create_connection()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                    self._lock.notify()
+                raise
+
+            with self._lock:
+                self._stats['connections_created'] += 1
+                return self._record_checkout(conn, started, waited)
+
+    def acquire_idle(self) -> Optional[sqlite3.Connection]:
+        """A recently used idle connection, or None; never opens or checks one (safe on the event loop)"""
+        started = time.monotonic()
+        with self._lock:
+            if self._closed or not self._idle or self._needs_check(self._idle[-1]):
+                return None
+            return self._record_checkout(self._idle.pop(), started, False)
+
+    def _record_checkout(self, conn: sqlite3.Connection, started: float, waited: bool) -> sqlite3.Connection:
+        """Update checkout statistics (lock must be held)"""
+        wait_seconds = time.monotonic() - started
+
+        self._stats['checkouts'] += 1
+        self._stats['total_wait_seconds'] += wait_seconds
+        if waited:
+            self._stats['waits'] += 1
+        if wait_seconds > self._stats['max_wait_seconds']:
+            self._stats['max_wait_seconds'] = wait_seconds
+
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False):
+        """Return a connection to the pool"""
+        if not discard and conn.in_transaction:
+            # Never hand a half-finished transaction to the next caller
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        with self._lock:
+            if discard or self._closed:
+                self._discard(conn)
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+                self._idle.append(conn)
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager that checks out and returns a connection"""
+        conn = self.acquire(timeout=timeout)
+        broken = False
+        try:
+            yield conn
+        except (sqlite3.InterfaceError, sqlite3.ProgrammingError):
+            broken = True
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    def close(self):
+        """Close all idle connections and refuse new checkouts"""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._lock.notify_all()
+
+        logger.info("🔌 VidderTech connection pool closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilisation and checkout wait statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['open'] = self._created
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._created - len(self._idle)
+
+        checkouts = stats['checkouts']
+        stats['avg_wait_ms'] = (stats['total_wait_seconds'] / checkouts * 1000) if checkouts else 0.0
+        stats['max_wait_ms'] = stats['max_wait_seconds'] * 1000
+        return stats
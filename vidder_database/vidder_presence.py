@@ -0,0 +1,128 @@
+"""
+👣 VidderTech Presence Tracker
+Built by VidderTech - The Future of Quiz Bots
+
+Coalesced last_active updates with:
+- O(1) in-memory touch on every interaction
+- Only users seen since the last flush are written
+- One UPDATE ... CASE ... WHERE user_id IN (...) per chunk
+- Final flush on shutdown so no activity is lost
+"""
+
+import asyncio
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .vidder_executor import VidderDatabaseExecutor
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.presence')
+
+# Users per UPDATE statement (3 bound parameters each, well under SQLite's limit)
+PRESENCE_CHUNK_SIZE = 500
+
+class VidderPresenceTracker:
+    """👣 VidderTech Coalesced Presence Writer"""
+
+    def __init__(self, executor: VidderDatabaseExecutor, flush_interval: float = 5.0):
+        """Initialize tracker (the flush task starts with start())"""
+        self.executor = executor
+        self.flush_interval = flush_interval
+
+        self._pending: Dict[int, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'touches': 0,
+            'flushes': 0,
+            'users_written': 0,
+            'write_failures': 0
+        }
+
+    def touch(self, user_id: int, when: Optional[datetime] = None):
+        """Record that a user was active (no I/O)"""
+        self._pending[user_id] = (when or datetime.now()).isoformat()
+        self.stats['touches'] += 1
+
+    def last_active(self, user_id: int) -> Optional[str]:
+        """Timestamp not yet flushed for a user, if any"""
+        return self._pending.get(user_id)
+
+    @staticmethod
+    def _build_update(chunk: List[Tuple[int, str]]) -> Tuple[str, List[Any]]:
+        """One UPDATE covering every user in the chunk"""
+        cases = ' '.join('WHEN ? THEN ?' for _ in chunk)
+        placeholders = ', '.join('?' for _ in chunk)
+        params: List[Any] = []
+        for user_id, timestamp in chunk:
+            params.extend((user_id, timestamp))
+        params.extend(user_id for user_id, _ in chunk)
+        sql = (
+            f"UPDATE vidder_users SET last_active = CASE user_id {cases} END "
+            f"WHERE user_id IN ({placeholders})"
+        )
+        return sql, params
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, items: List[Tuple[int, str]]) -> int:
+        """Write all pending timestamps in one transaction (DB thread)"""
+        updated = 0
+        try:
+            for start in range(0, len(items), PRESENCE_CHUNK_SIZE):
+                sql, params = VidderPresenceTracker._build_update(items[start:start + PRESENCE_CHUNK_SIZE])
+                updated += conn.execute(sql, params).rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return updated
+
+    async def flush(self) -> int:
+        """Write timestamps collected since the previous flush"""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        try:
+            updated = await self.executor.write(self._write, list(pending.items()))
+        except Exception as e:
+            # Put the batch back unless the user has been seen again since
+            for user_id, timestamp in pending.items():
+                self._pending.setdefault(user_id, timestamp)
+            self.stats['write_failures'] += 1
+            logger.error(f"❌ Presence flush failed for {len(pending)} users: {e}")
+            return 0
+
+        self.stats['flushes'] += 1
+        self.stats['users_written'] += updated
+        return updated
+
+    async def _run(self):
+        """Periodic flush loop"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        """Start periodic flushing"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get touch and flush counters"""
+        stats = dict(self.stats)
+        stats['pending'] = len(self._pending)
+        return stats
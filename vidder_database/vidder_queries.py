@@ -0,0 +1,100 @@
+"""
+⚡ VidderTech Typed Query Layer
+Built by VidderTech - The Future of Quiz Bots
+
+Fast path for the hottest lookups with:
+- Constant SQL text so sqlite3's per-connection statement cache always hits
+- Projections that select only the columns a caller needs
+- Lightweight __slots__ row objects built from plain tuples (no dict per row)
+"""
+
+import sqlite3
+from typing import Any, Dict, Generic, Iterator, List, Optional, Tuple, Type, TypeVar
+
+# Prepared statements kept per pooled connection (sqlite3 default is 128)
+VIDDER_STATEMENT_CACHE_SIZE = 256
+
+class VidderRow:
+    """Base for __slots__ row objects; field order follows the SELECT list"""
+    __slots__ = ()
+
+    def __init__(self, *values: Any):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict-style access so callers written against get_user() keep working"""
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self.as_dict().items())
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class VidderUserAccess(VidderRow):
+    """Role and entitlement columns used by permission checks"""
+    __slots__ = ('user_id', 'role', 'status', 'is_premium', 'premium_expires')
+
+class VidderUserProfile(VidderRow):
+    """Columns handlers need to greet and localise for a user"""
+    __slots__ = ('user_id', 'username', 'first_name', 'last_name', 'language',
+                 'role', 'status', 'is_premium', 'last_active')
+
+R = TypeVar('R', bound=VidderRow)
+
+class VidderQuery(Generic[R]):
+    """A constant SQL statement bound to the row class it produces (None for scalar queries)"""
+    __slots__ = ('sql', 'row_class')
+
+    def __init__(self, row_class: Optional[Type[R]], sql: str):
+        self.row_class = row_class
+        self.sql = sql
+
+    def _cursor(self, conn: sqlite3.Connection, params: Tuple) -> sqlite3.Cursor:
+        # Plain tuples: skip sqlite3.Row construction for every fetched row
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(self.sql, params)
+
+    def one(self, conn: sqlite3.Connection, *params: Any) -> Optional[R]:
+        """First row or None"""
+        row = self._cursor(conn, params).fetchone()
+        return self.row_class(*row) if row is not None else None
+
+    def all(self, conn: sqlite3.Connection, *params: Any) -> List[R]:
+        """All rows"""
+        row_class = self.row_class
+        return [row_class(*row) for row in self._cursor(conn, params).fetchall()]
+
+    def scalar(self, conn: sqlite3.Connection, *params: Any) -> Any:
+        """First column of the first row"""
+        row = self._cursor(conn, params).fetchone()
+        return row[0] if row is not None else None
+
+# User lookups
+USER_ROLE = VidderQuery(None, "SELECT role FROM vidder_users WHERE user_id = ?")
+
+USER_ACCESS = VidderQuery(VidderUserAccess, """
+    SELECT user_id, role, status, is_premium, premium_expires
+    FROM vidder_users WHERE user_id = ?
+""")
+
+USER_PROFILE = VidderQuery(VidderUserProfile, """
+    SELECT user_id, username, first_name, last_name, language,
+           role, status, is_premium, last_active
+    FROM vidder_users WHERE user_id = ?
+""")
@@ -0,0 +1,134 @@
+"""
+🔎 VidderTech Query Plan Checks
+Built by VidderTech - The Future of Quiz Bots
+
+EXPLAIN QUERY PLAN regression guard with:
+- The hot queries of the bot and the index each one must use
+- No temporary B-tree sorts, except for queries that sort a bounded candidate set
+- Startup check that fails fast in development and testing
+- Standalone run against a fresh schema: python -m vidder_database.vidder_query_plans
+"""
+
+import sqlite3
+import logging
+from typing import Dict, Tuple
+
+from .vidder_sessions import LIVE_SESSIONS_SQL
+from .vidder_dedup import (
+    FIND_EXACT_IN_QUIZ_SQL, FIND_EXACT_SQL, LSH_CANDIDATES_IN_QUIZ_SQL, LSH_CANDIDATES_SQL
+)
+from .vidder_grading import GRADED_SESSIONS_SQL
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.plans')
+
+# Expected "index" for lookups on a WITHOUT ROWID table's primary key
+PRIMARY_KEY = 'PRIMARY KEY'
+
+# name -> (SQL as issued by the bot, index the planner must pick)
+VIDDER_QUERY_PLAN_CHECKS: Dict[str, Tuple[str, str]] = {
+    'live_sessions': (LIVE_SESSIONS_SQL, 'idx_sessions_live'),
+    'group_active_session': ("""
+        SELECT * FROM vidder_quiz_sessions
+        WHERE group_id = ? AND status = 'active'
+        ORDER BY created_at DESC LIMIT 1
+    """, 'idx_sessions_group_status'),
+    'group_paused_session': ("""
+        SELECT * FROM vidder_quiz_sessions
+        WHERE group_id = ? AND status = 'paused'
+        ORDER BY paused_at DESC LIMIT 1
+    """, 'idx_sessions_group_paused'),
+    'participant_sessions': (
+        "SELECT * FROM vidder_quiz_sessions WHERE participant_id = ?", 'idx_sessions_user'
+    ),
+    'session_responses': (
+        "SELECT * FROM vidder_responses WHERE session_id = ?", 'idx_responses_session'
+    ),
+    'user_responses': (
+        "SELECT * FROM vidder_responses WHERE user_id = ? ORDER BY submitted_at DESC", 'idx_responses_user'
+    ),
+    'question_responses': (
+        "SELECT is_correct, COUNT(*) FROM vidder_responses WHERE question_id = ? GROUP BY is_correct",
+        'idx_responses_question'
+    ),
+    'quiz_questions': (
+        "SELECT * FROM vidder_questions WHERE quiz_id = ?", 'idx_questions_quiz'
+    ),
+    'recent_active_users': (
+        "SELECT user_id, last_active FROM vidder_users WHERE last_active >= ?", 'idx_users_active'
+    ),
+    'quiz_access': ("""
+        SELECT 1 FROM vidder_quiz_access
+        WHERE quiz_id = ? AND ((principal_type = 'user' AND principal_id = ?)
+                            OR (principal_type = 'group' AND principal_id = ?))
+        LIMIT 1
+    """, 'idx_quiz_access_principal'),
+    'user_submissions': (
+        "SELECT * FROM vidder_assignment_submissions WHERE user_id = ? ORDER BY submitted_at DESC",
+        'idx_submissions_user'
+    ),
+    'bot_stats_today': (
+        "UPDATE vidder_bot_stats SET updated_at = ? WHERE date = ?", 'idx_bot_stats_date'
+    ),
+    'user_filters': (
+        "SELECT filter_words FROM vidder_filters WHERE user_id = ? AND auto_filter = 1",
+        'idx_filters_user'
+    ),
+    'quiz_graded_sessions': (GRADED_SESSIONS_SQL, 'idx_sessions_quiz'),
+    'session_submissions': (
+        "SELECT score FROM vidder_assignment_submissions WHERE session_id = ?", 'idx_submissions_session'
+    ),
+    'question_exact_duplicate': (FIND_EXACT_SQL, 'idx_fingerprints_exact'),
+    'question_lsh_candidates': (LSH_CANDIDATES_SQL, PRIMARY_KEY),
+    'quiz_exact_duplicate': (FIND_EXACT_IN_QUIZ_SQL, 'idx_fingerprints_exact'),
+    'quiz_lsh_candidates': (LSH_CANDIDATES_IN_QUIZ_SQL, PRIMARY_KEY)
+}
+
+# Checks whose ORDER BY / GROUP BY sorts at most LSH_BANDS * LSH_BUCKET_LIMIT rows in memory
+BOUNDED_SORTS = frozenset({'question_lsh_candidates', 'quiz_lsh_candidates'})
+
+class VidderQueryPlanError(Exception):
+    """Raised when a hot query no longer uses its index"""
+
+def explain(conn: sqlite3.Connection, sql: str) -> str:
+    """EXPLAIN QUERY PLAN output flattened to one line"""
+    params = (None,) * sql.count('?')
+    return ' | '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+def check_query_plans(conn: sqlite3.Connection) -> Dict[str, str]:
+    """Return {check name: plan} for every hot query that misses its index or sorts its rows"""
+    failures = {}
+    for name, (sql, index) in VIDDER_QUERY_PLAN_CHECKS.items():
+        plan = explain(conn, sql)
+        # Matches both "USING INDEX x" and "USING COVERING INDEX x"
+        needle = "USING PRIMARY KEY " if index == PRIMARY_KEY else f"INDEX {index} "
+        if needle not in f"{plan} " or ("USE TEMP B-TREE" in plan and name not in BOUNDED_SORTS):
+            failures[name] = plan
+    return failures
+
+def verify_query_plans(conn: sqlite3.Connection, strict: bool = False) -> bool:
+    """Check hot query plans; raise in strict mode, warn otherwise"""
+    failures = check_query_plans(conn)
+    if not failures:
+        logger.info(f"🔎 Query plans verified: {len(VIDDER_QUERY_PLAN_CHECKS)} hot queries use their indexes")
+        return True
+
+    for name, plan in failures.items():
+        logger.warning(f"⚠️ Query '{name}' expected {VIDDER_QUERY_PLAN_CHECKS[name][1]} without a sort, got: {plan}")
+    if strict:
+        raise VidderQueryPlanError(f"Hot queries without index or with a sort: {', '.join(sorted(failures))}")
+    return False
+
+if __name__ == "__main__":
+    import sys
+    from .vidder_models import VIDDER_DATABASE_SCHEMA
+    from .vidder_migrations import VidderMigrator
+
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(VIDDER_DATABASE_SCHEMA)
+    VidderMigrator().migrate(conn)
+    failures = check_query_plans(conn)
+    for name, (sql, index) in VIDDER_QUERY_PLAN_CHECKS.items():
+        status = "❌" if name in failures else "✅"
+        print(f"{status} {name}: {explain(conn, sql)}")
+    sys.exit(1 if failures else 0)
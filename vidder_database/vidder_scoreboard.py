@@ -0,0 +1,366 @@
+"""
+🏆 VidderTech Live Scoreboards
+Built by VidderTech - The Future of Quiz Bots
+
+Per-session standings for live quizzes with:
+- Answers scored with the quiz's positive_marks / negative_marks / partial credit rules
+- Fenwick tree over score buckets: O(log n) score updates and rank lookups
+- Top-K in O(K log n) without sorting participants
+- Boards rebuilt from vidder_responses on first use (e.g. after a restart)
+- Final ranks written once, when the quiz completes
+
+Scores are held in fixed-point units of 1/SCORE_SCALE marks, so equal scores
+always share a bucket and ties rank equally (1, 2, 2, 4).
+"""
+
+import asyncio
+import sqlite3
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .vidder_executor import VidderDatabaseExecutor
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.scoreboard')
+
+# Score resolution: 0.01 marks
+SCORE_SCALE = 100
+
+# Bucket range for quizzes without a question count; grows on demand
+DEFAULT_SCORE_SPAN = 64
+
+SCORING_RULES_SQL = """
+    SELECT positive_marks, negative_marks, negative_marking_enabled
+    FROM vidder_quizzes WHERE quiz_id = ?
+"""
+
+# Per-participant totals for a session (idx_responses_session)
+SESSION_TOTALS_SQL = """
+    SELECT user_id,
+           SUM(marks_awarded - negative_marks_applied),
+           SUM(CASE WHEN selected_answer IS NOT NULL AND is_correct THEN 1 ELSE 0 END),
+           SUM(CASE WHEN selected_answer IS NOT NULL AND NOT is_correct THEN 1 ELSE 0 END),
+           SUM(CASE WHEN selected_answer IS NULL THEN 1 ELSE 0 END)
+    FROM vidder_responses WHERE session_id = ?
+    GROUP BY user_id
+"""
+
+def to_units(score: float) -> int:
+    return int(round(score * SCORE_SCALE))
+
+class VidderScoringRules(NamedTuple):
+    """A quiz's marking scheme"""
+    positive_marks: float = 1.0
+    negative_marks: float = 0.25
+    negative_marking_enabled: bool = True
+
+    @classmethod
+    def from_row(cls, row: Optional[Tuple[Any, ...]]) -> 'VidderScoringRules':
+        """Rules from (positive_marks, negative_marks, negative_marking_enabled); defaults without a quiz"""
+        if row is None:
+            return cls()
+        return cls(
+            positive_marks=row[0] if row[0] is not None else 1.0,
+            negative_marks=row[1] if row[1] is not None else 0.0,
+            negative_marking_enabled=bool(row[2])
+        )
+
+    @property
+    def penalty(self) -> float:
+        """Marks taken off for a wrong answer without partial credit"""
+        return self.negative_marks if self.negative_marking_enabled else 0.0
+
+    def marks(self, is_correct: bool, skipped: bool, partial: float = 0.0) -> Tuple[float, float]:
+        """
+        (marks_awarded, negative_marks_applied) for one answer
+
+        Right: full marks. Wrong with partial credit (0..1): that share of the marks
+        and no penalty. Wrong: the penalty. Batch re-grading applies the same rule.
+        """
+        if skipped:
+            return 0.0, 0.0
+        if is_correct:
+            return self.positive_marks, 0.0
+        share = min(max(partial or 0.0, 0.0), 1.0)
+        if share > 0.0:
+            return share * self.positive_marks, 0.0
+        return 0.0, self.penalty
+
+class VidderStanding(NamedTuple):
+    """One participant's place on a board"""
+    rank: int
+    user_id: int
+    score: float
+    correct: int
+    wrong: int
+    skipped: int
+
+class VidderScoreEntry:
+    """One participant's running totals"""
+
+    __slots__ = ('user_id', 'units', 'correct', 'wrong', 'skipped')
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.units = 0
+        self.correct = 0
+        self.wrong = 0
+        self.skipped = 0
+
+    @property
+    def score(self) -> float:
+        return self.units / SCORE_SCALE
+
+class VidderScoreboard:
+    """🏆 Order-statistics scoreboard for one live session"""
+
+    def __init__(self, session_id: str, rules: VidderScoringRules, total_questions: int = 0):
+        """Initialize an empty board sized for the quiz's score range"""
+        self.session_id = session_id
+        self.rules = rules
+        self.total_questions = total_questions
+
+        questions = total_questions or DEFAULT_SCORE_SPAN
+        self._high = max(questions * to_units(rules.positive_marks), 1)
+        self._low = -questions * to_units(rules.penalty)
+
+        self._entries: Dict[int, VidderScoreEntry] = {}
+        # units -> user ids in the order they reached that score
+        self._buckets: Dict[int, Dict[int, None]] = {}
+        self._build_tree()
+
+    # Fenwick tree over bucket positions; position 1 is the highest score
+    def _build_tree(self):
+        self._size = self._high - self._low + 1
+        self._tree = [0] * (self._size + 1)
+        self._top_bit = 1 << (self._size.bit_length() - 1)
+        for units, members in self._buckets.items():
+            self._add(self._position(units), len(members))
+
+    def _position(self, units: int) -> int:
+        return self._high - units + 1
+
+    def _add(self, position: int, delta: int):
+        tree = self._tree
+        while position <= self._size:
+            tree[position] += delta
+            position += position & -position
+
+    def _prefix(self, position: int) -> int:
+        """Participants at positions 1..position (scores at or above it)"""
+        tree = self._tree
+        total = 0
+        while position > 0:
+            total += tree[position]
+            position -= position & -position
+        return total
+
+    def _kth(self, k: int) -> int:
+        """Position holding the k-th best participant"""
+        tree = self._tree
+        position = 0
+        step = self._top_bit
+        while step:
+            following = position + step
+            if following <= self._size and tree[following] < k:
+                position = following
+                k -= tree[following]
+            step >>= 1
+        return position + 1
+
+    def _fit(self, units: int):
+        """Widen the bucket range (rare: bonus marks or an unknown question count)"""
+        if self._low <= units <= self._high:
+            return
+        span = self._high - self._low + 1
+        if units > self._high:
+            self._high = max(units, self._high + span)
+        else:
+            self._low = min(units, self._low - span)
+        self._build_tree()
+
+    def _place(self, entry: VidderScoreEntry, units: int):
+        """Move an entry to the bucket for units"""
+        if units == entry.units and entry.user_id in self._buckets.get(units, ()):
+            return
+        self._fit(units)
+
+        bucket = self._buckets.get(entry.units)
+        if bucket is not None and entry.user_id in bucket:
+            del bucket[entry.user_id]
+            if not bucket:
+                del self._buckets[entry.units]
+            self._add(self._position(entry.units), -1)
+
+        entry.units = units
+        self._buckets.setdefault(units, {})[entry.user_id] = None
+        self._add(self._position(units), 1)
+
+    def _entry(self, user_id: int) -> VidderScoreEntry:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            entry = VidderScoreEntry(user_id)
+            self._entries[user_id] = entry
+            self._place(entry, 0)
+        return entry
+
+    # Updates (O(log n))
+    def record(self, user_id: int, is_correct: bool, skipped: bool = False,
+               partial: float = 0.0) -> Tuple[float, float]:
+        """Score one answer; returns (marks_awarded, negative_marks_applied)"""
+        awarded, negative = self.rules.marks(is_correct, skipped, partial)
+        entry = self._entry(user_id)
+        if skipped:
+            entry.skipped += 1
+        elif is_correct:
+            entry.correct += 1
+        else:
+            entry.wrong += 1
+        self._place(entry, entry.units + to_units(awarded - negative))
+        return awarded, negative
+
+    def restore(self, user_id: int, score: float, correct: int, wrong: int, skipped: int):
+        """Load a participant's totals (rebuilding a board)"""
+        entry = self._entry(user_id)
+        entry.correct, entry.wrong, entry.skipped = correct, wrong, skipped
+        self._place(entry, to_units(score))
+
+    # Queries
+    def rank(self, user_id: int) -> Optional[int]:
+        """Competition rank (1 = best; equal scores share a rank)"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        return self._prefix(self._position(entry.units) - 1) + 1
+
+    def standing(self, user_id: int) -> Optional[VidderStanding]:
+        """A participant's rank and totals"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        return VidderStanding(self.rank(user_id), user_id, entry.score,
+                              entry.correct, entry.wrong, entry.skipped)
+
+    def top(self, k: int) -> List[VidderStanding]:
+        """The k best participants, best first (one tree search per distinct score)"""
+        standings: List[VidderStanding] = []
+        limit = min(k, len(self._entries))
+        rank = 1
+        while rank <= limit:
+            units = self._high - self._kth(rank) + 1
+            members = self._buckets[units]
+            for user_id in members:
+                entry = self._entries[user_id]
+                standings.append(VidderStanding(rank, user_id, entry.score,
+                                                entry.correct, entry.wrong, entry.skipped))
+            rank += len(members)
+        return standings[:k]
+
+    def percentage(self, user_id: int) -> float:
+        """Score as a share of the quiz's maximum"""
+        entry = self._entries.get(user_id)
+        maximum = self.total_questions * self.rules.positive_marks
+        if entry is None or maximum <= 0:
+            return 0.0
+        return round(max(entry.score, 0.0) / maximum * 100, 2)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class VidderScoreboards:
+    """🏆 VidderTech Live Scoreboard Registry"""
+
+    def __init__(self, executor: VidderDatabaseExecutor):
+        """Initialize with no boards (each is built on first use)"""
+        self.executor = executor
+        self._boards: Dict[str, VidderScoreboard] = {}
+        # Concurrent first answers to a session share one load
+        self._loading: Dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            'boards_loaded': 0,
+            'answers_scored': 0,
+            'boards_finished': 0
+        }
+
+    @staticmethod
+    def _load(conn: sqlite3.Connection, session_id: str, quiz_id: Optional[str]) -> Tuple[Any, List[Any]]:
+        """Scoring rules and per-participant totals (DB thread)"""
+        rules = conn.execute(SCORING_RULES_SQL, (quiz_id,)).fetchone() if quiz_id else None
+        return rules, conn.execute(SESSION_TOTALS_SQL, (session_id,)).fetchall()
+
+    async def get(self, session: Dict[str, Any]) -> VidderScoreboard:
+        """The session's board, built from its quiz and stored answers on first use"""
+        session_id = session['session_id']
+        board = self._boards.get(session_id)
+        if board is not None:
+            return board
+
+        pending = self._loading.get(session_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[session_id] = future
+        try:
+            row, totals = await self.executor.read(self._load, session_id, session.get('quiz_id'))
+            board = VidderScoreboard(session_id, VidderScoringRules.from_row(row),
+                                     session.get('total_questions') or 0)
+            for user_id, score, correct, wrong, skipped in totals:
+                if user_id is not None:
+                    board.restore(user_id, score or 0.0, correct or 0, wrong or 0, skipped or 0)
+
+            self._boards[session_id] = board
+            self.stats['boards_loaded'] += 1
+            future.set_result(board)
+            return board
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._loading[session_id]
+            if not future.done():
+                future.cancel()
+
+    async def score(self, session: Dict[str, Any], response_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the quiz's marking to an answer and move its participant on the board"""
+        board = await self.get(session)
+        user_id = response_data.get('user_id') or session.get('participant_id')
+        awarded, negative = board.record(
+            user_id,
+            bool(response_data.get('is_correct')),
+            skipped=response_data.get('selected_answer') is None,
+            partial=response_data.get('partial_score') or 0.0
+        )
+        self.stats['answers_scored'] += 1
+        return {**response_data, 'user_id': user_id,
+                'marks_awarded': awarded, 'negative_marks_applied': negative}
+
+    def peek(self, session_id: str) -> Optional[VidderScoreboard]:
+        """The board if it is already built"""
+        return self._boards.get(session_id)
+
+    def finish(self, session: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Drop a completed session's board; returns (column updates, session_data patch) with final ranks"""
+        board = self._boards.pop(session['session_id'], None)
+        if board is None or not len(board):
+            return {}, None
+
+        standings = board.top(len(board))
+        updates = {}
+        participant_id = session.get('participant_id')
+        if participant_id is not None and board.rank(participant_id) is not None:
+            updates = {'rank': board.rank(participant_id), 'percentage': board.percentage(participant_id)}
+
+        self.stats['boards_finished'] += 1
+        return updates, {'standings': [
+            [standing.rank, standing.user_id, standing.score] for standing in standings
+        ]}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get board and scoring counters"""
+        stats = dict(self.stats)
+        stats['boards'] = len(self._boards)
+        stats['participants'] = sum(len(board) for board in self._boards.values())
+        return stats
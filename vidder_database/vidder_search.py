@@ -0,0 +1,219 @@
+"""
+🔍 VidderTech Quiz Search
+Built by VidderTech - The Future of Quiz Bots
+
+Full-text quiz search for inline sharing with:
+- vidder_quiz_fts: FTS5 index over quiz title, description and tags
+- vidder_question_fts: FTS5 index over question text, tagged with its quiz
+- Triggers that keep both indexes in step with their tables
+- Prefix matching on every query term and bm25 ranking
+- Offset pagination and a short-TTL cache of result pages per query
+
+The FTS tables keep their own copy of the indexed text instead of pointing at
+vidder_quizzes / vidder_questions as external content: deleting by rowid is then
+always safe, so triggers and the online migration backfill can run side by side.
+"""
+
+import re
+import asyncio
+import sqlite3
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_cache import VidderTTLCache, MISSING
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.search')
+
+# Title matches outrank tag matches, which outrank description matches
+QUIZ_SEARCH_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vidder_quiz_fts USING fts5(
+    title, description, tags,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+INSERT INTO vidder_quiz_fts (vidder_quiz_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 5.0)');
+
+CREATE TRIGGER IF NOT EXISTS trg_quizzes_fts_insert
+AFTER INSERT ON vidder_quizzes
+BEGIN
+    INSERT INTO vidder_quiz_fts (rowid, title, description, tags)
+    VALUES (new.rowid, new.title, new.description, new.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_quizzes_fts_update
+AFTER UPDATE OF title, description, tags ON vidder_quizzes
+BEGIN
+    DELETE FROM vidder_quiz_fts WHERE rowid = old.rowid;
+    INSERT INTO vidder_quiz_fts (rowid, title, description, tags)
+    VALUES (new.rowid, new.title, new.description, new.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_quizzes_fts_delete
+AFTER DELETE ON vidder_quizzes
+BEGIN
+    DELETE FROM vidder_quiz_fts WHERE rowid = old.rowid;
+END;
+"""
+
+QUESTION_SEARCH_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vidder_question_fts USING fts5(
+    question_text, quiz_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_fts_insert
+AFTER INSERT ON vidder_questions
+BEGIN
+    INSERT INTO vidder_question_fts (rowid, question_text, quiz_id)
+    VALUES (new.rowid, new.question_text, new.quiz_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_fts_update
+AFTER UPDATE OF question_text, quiz_id ON vidder_questions
+BEGIN
+    DELETE FROM vidder_question_fts WHERE rowid = old.rowid;
+    INSERT INTO vidder_question_fts (rowid, question_text, quiz_id)
+    VALUES (new.rowid, new.question_text, new.quiz_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_fts_delete
+AFTER DELETE ON vidder_questions
+BEGIN
+    DELETE FROM vidder_question_fts WHERE rowid = old.rowid;
+END;
+"""
+
+# Migration backfills (rowid range bound to ?, ?); OR REPLACE keeps rows a trigger already indexed
+QUIZ_SEARCH_BACKFILL_SQL = """
+    INSERT OR REPLACE INTO vidder_quiz_fts (rowid, title, description, tags)
+    SELECT rowid, title, description, tags FROM vidder_quizzes WHERE rowid > ? AND rowid <= ?
+"""
+
+QUESTION_SEARCH_BACKFILL_SQL = """
+    INSERT OR REPLACE INTO vidder_question_fts (rowid, question_text, quiz_id)
+    SELECT rowid, question_text, quiz_id FROM vidder_questions WHERE rowid > ? AND rowid <= ?
+"""
+
+# Quiz statuses shown to other users
+SEARCHABLE_STATUSES = ('published', 'active')
+
+# Best matches taken from each index before merging; bounds the cost of very common prefixes
+SEARCH_MAX_HITS = 500
+
+# A question match counts for less than the same match in a quiz's own title or tags
+# (bm25 scores are negative, so scaling towards zero ranks lower)
+QUESTION_HIT_WEIGHT = 0.5
+
+# Query terms used; shorter terms are matched whole, not as prefixes
+MAX_QUERY_TERMS = 8
+MIN_PREFIX_LENGTH = 2
+
+# Letters and digits in any script (the unicode61 tokenizer splits on everything else)
+SEARCH_TERM_RE = re.compile(r'[^\W_]+')
+
+# Best score per public quiz across both indexes; ?1 match, ?2 limit, ?3 offset, ?4 hits per index
+SEARCH_QUIZZES_SQL = f"""
+    WITH hits (quiz_rowid, score) AS (
+        SELECT * FROM (
+            SELECT rowid, rank FROM vidder_quiz_fts
+            WHERE vidder_quiz_fts MATCH ?1 ORDER BY rank LIMIT ?4
+        )
+        UNION ALL
+        SELECT z.rowid, m.score FROM (
+            SELECT quiz_id, rank * {QUESTION_HIT_WEIGHT} AS score FROM vidder_question_fts
+            WHERE vidder_question_fts MATCH ?1 ORDER BY rank LIMIT ?4
+        ) m JOIN vidder_quizzes z ON z.quiz_id = m.quiz_id
+    )
+    SELECT z.quiz_id, z.title, z.description, z.category, z.total_questions, MIN(h.score) AS score
+    FROM hits h JOIN vidder_quizzes z ON z.rowid = h.quiz_rowid
+    WHERE z.is_public = 1 AND z.status IN ({', '.join(repr(status) for status in SEARCHABLE_STATUSES)})
+    GROUP BY z.rowid
+    ORDER BY score, z.rowid
+    LIMIT ?2 OFFSET ?3
+"""
+
+class VidderQuizHit(NamedTuple):
+    """One ranked search result (immutable, so cached pages can be shared)"""
+    quiz_id: str
+    title: str
+    description: Optional[str]
+    category: Optional[str]
+    total_questions: int
+    score: float
+
+def build_match_query(text: str) -> str:
+    """FTS5 MATCH expression for user input: every term quoted and prefix-matched"""
+    terms = SEARCH_TERM_RE.findall(text.casefold())[:MAX_QUERY_TERMS]
+    return ' '.join(
+        f'"{term}"*' if len(term) >= MIN_PREFIX_LENGTH else f'"{term}"'
+        for term in terms
+    )
+
+def search_quizzes(conn: sqlite3.Connection, match: str, limit: int, offset: int = 0,
+                   max_hits: int = SEARCH_MAX_HITS) -> List[VidderQuizHit]:
+    """Ranked public quizzes for a MATCH expression (DB thread)"""
+    return [
+        VidderQuizHit(quiz_id, title, description, category, total_questions or 0, score)
+        for quiz_id, title, description, category, total_questions, score in conn.execute(
+            SEARCH_QUIZZES_SQL, (match, limit, offset, max_hits)
+        )
+    ]
+
+class VidderQuizSearch:
+    """🔍 Cached, paginated quiz search"""
+
+    def __init__(self, executor: VidderDatabaseExecutor, cache_size: int = 2000,
+                 cache_ttl: float = 60.0, max_hits: int = SEARCH_MAX_HITS):
+        """Initialize search over the shared executor"""
+        self.executor = executor
+        self.max_hits = max_hits
+        # (match, offset, limit) -> (hits, next_offset)
+        self.cache = VidderTTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # Identical queries arriving together share one database read
+        self._inflight: Dict[Tuple[str, int, int], asyncio.Future] = {}
+
+    async def search(self, query: str, offset: int = 0,
+                     limit: int = 20) -> Tuple[Tuple[VidderQuizHit, ...], Optional[int]]:
+        """One page of results and the offset of the next page (None on the last page)"""
+        match = build_match_query(query)
+        if not match:
+            return (), None
+
+        key = (match, offset, limit)
+        page = self.cache.get(key)
+        if page is not MISSING:
+            return page
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            # One extra row tells whether another page exists
+            rows = await self.executor.read(search_quizzes, match, limit + 1, offset, self.max_hits)
+            page = (tuple(rows[:limit]), offset + limit if len(rows) > limit else None)
+            self.cache.set(key, page)
+            future.set_result(page)
+            return page
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; retrieve it here so an unwaited future does not warn
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                future.cancel()
+
+    def clear(self):
+        """Drop cached pages (e.g. after bulk quiz edits)"""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get result cache counters"""
+        stats = self.cache.get_stats()
+        stats['inflight'] = len(self._inflight)
+        return stats
@@ -0,0 +1,447 @@
+"""
+🎮 VidderTech Live Session Registry
+Built by VidderTech - The Future of Quiz Bots
+
+Authoritative in-process view of live quiz sessions with:
+- O(1) lookup by group/chat id and by session id
+- Write-through persistence to vidder_quiz_sessions
+- Staged in-memory updates written in one transaction per checkpoint
+- Checkpoints serialized and settled: one returns only once every change made
+  before it started is committed (journal snapshots rely on this)
+- Every change journaled first, so a crash between checkpoints loses nothing
+- session_data decoded once at load and patched in place with JSON1 json_patch()
+- Active quiz counter kept in sync with bot statistics
+"""
+
+import asyncio
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .vidder_executor import VidderDatabaseExecutor
+from .vidder_models import serialize_json, deserialize_json
+from .vidder_stats import VidderStatsCounters
+from .vidder_journal import VidderSessionJournal
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.sessions')
+
+# Statuses that keep a session in the registry
+LIVE_STATUSES = ('active', 'paused')
+
+# JSON-in-TEXT columns held decoded in memory
+JSON_COLUMNS = ('session_data',)
+
+# Columns that may be written through update()
+SESSION_COLUMNS = frozenset({
+    'quiz_id', 'participant_id', 'group_id', 'session_name',
+    'status', 'current_question', 'total_questions',
+    'started_at', 'paused_at', 'completed_at', 'expires_at',
+    'speed_multiplier', 'auto_next', 'show_answers',
+    'total_score', 'percentage', 'time_taken', 'rank',
+    'questions_attempted', 'questions_correct', 'questions_wrong', 'questions_skipped',
+    'session_data', 'created_at', 'updated_at'
+})
+
+# Literal statuses so the planner can use the partial idx_sessions_live index
+LIVE_SESSIONS_SQL = """
+    SELECT * FROM vidder_quiz_sessions
+    WHERE status IN ('active', 'paused')
+    ORDER BY created_at
+"""
+
+class VidderSessionRegistry:
+    """🎮 VidderTech Live Session Registry"""
+
+    def __init__(self, executor: VidderDatabaseExecutor, stats: Optional[VidderStatsCounters] = None,
+                 journal: Optional[VidderSessionJournal] = None):
+        """Initialize empty registry (populated by load(), then replay())"""
+        self.executor = executor
+        self.stats = stats
+        self.journal = journal
+
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_group: Dict[int, str] = {}
+        self._loaded = False
+
+        # session_id -> (session dict, columns changed since the last checkpoint)
+        self._dirty: Dict[str, Tuple[Dict[str, Any], Set[str]]] = {}
+        # Registered sessions whose first INSERT failed; the next checkpoint inserts them
+        self._unsaved: Dict[str, Dict[str, Any]] = {}
+
+        # Write-throughs in flight, and one checkpoint at a time (lock created inside the loop)
+        self._writes: Set[asyncio.Future] = set()
+        self._checkpoint_lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        """Row to session dict with JSON columns decoded"""
+        session = dict(row)
+        for column in JSON_COLUMNS:
+            value = session.get(column)
+            session[column] = deserialize_json(value) if isinstance(value, str) else (value or {})
+        # Per-question answers are rows in vidder_responses, not part of the live session
+        session.pop('answers', None)
+        return session
+
+    @staticmethod
+    def _load_live(conn: sqlite3.Connection) -> list:
+        """Fetch every live session, oldest first (DB thread)"""
+        return conn.execute(LIVE_SESSIONS_SQL).fetchall()
+
+    async def load(self):
+        """Populate the registry from the database once at startup"""
+        rows = await self.executor.read(self._load_live)
+
+        self._by_id.clear()
+        self._by_group.clear()
+        for row in rows:
+            self._index(self._decode(row))
+
+        self._loaded = True
+        if self.stats:
+            self.stats.totals['active_quizzes'] = self.active_count()
+        logger.info(f"🎮 Session registry loaded: {len(self._by_id)} live sessions")
+
+    def _index(self, session: Dict[str, Any]):
+        """Add a session to the lookup maps (newest session wins per group)"""
+        self._by_id[session['session_id']] = session
+        group_id = session.get('group_id')
+        if group_id is not None:
+            self._by_group[group_id] = session['session_id']
+
+    def _unindex(self, session: Dict[str, Any]):
+        """Remove a session that is no longer live"""
+        self._by_id.pop(session['session_id'], None)
+        group_id = session.get('group_id')
+        if group_id is not None and self._by_group.get(group_id) == session['session_id']:
+            del self._by_group[group_id]
+
+    # Lookups (no I/O)
+    def get(self, group_id: int) -> Optional[Dict[str, Any]]:
+        """Current live (active or paused) session for a chat"""
+        session_id = self._by_group.get(group_id)
+        return dict(self._by_id[session_id]) if session_id else None
+
+    def get_active(self, group_id: int) -> Optional[Dict[str, Any]]:
+        """Active session for a chat"""
+        session = self.get(group_id)
+        return session if session and session['status'] == 'active' else None
+
+    def get_paused(self, group_id: int) -> Optional[Dict[str, Any]]:
+        """Paused session for a chat"""
+        session = self.get(group_id)
+        return session if session and session['status'] == 'paused' else None
+
+    def get_by_id(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Live session by id"""
+        session = self._by_id.get(session_id)
+        return dict(session) if session else None
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Every live session"""
+        return [dict(session) for session in self._by_id.values()]
+
+    def active_count(self) -> int:
+        """Number of sessions currently running"""
+        return sum(1 for session in self._by_id.values() if session['status'] == 'active')
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    # Write-through persistence
+    @staticmethod
+    def _encode(updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep known columns and serialise JSON ones"""
+        encoded = {}
+        for column, value in updates.items():
+            if column not in SESSION_COLUMNS:
+                continue
+            if column in JSON_COLUMNS and not isinstance(value, str):
+                value = serialize_json(value)
+            encoded[column] = value
+        return encoded
+
+    @staticmethod
+    def _merge_patch(target: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+        """RFC 7396 merge patch, matching SQLite json_patch() semantics"""
+        merged = dict(target)
+        for key, value in patch.items():
+            if value is None:
+                merged.pop(key, None)
+            elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = VidderSessionRegistry._merge_patch(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, session_id: str, row: Dict[str, Any], insert: bool,
+               data_patch: Optional[str] = None) -> bool:
+        """INSERT or UPDATE one session row (DB thread)"""
+        if insert:
+            columns = ['session_id', *row]
+            conn.execute(
+                f"INSERT OR REPLACE INTO vidder_quiz_sessions ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                (session_id, *row.values())
+            )
+        else:
+            assignments = [f"{column} = ?" for column in row]
+            params = list(row.values())
+            if data_patch is not None:
+                # Only the changed keys cross the boundary - no read-modify-write of the blob
+                assignments.append("session_data = json_patch(COALESCE(session_data, '{}'), ?)")
+                params.append(data_patch)
+            cursor = conn.execute(
+                f"UPDATE vidder_quiz_sessions SET {', '.join(assignments)} WHERE session_id = ?",
+                (*params, session_id)
+            )
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return False
+        conn.commit()
+        return True
+
+    def _track_status(self, old_status: Optional[str], new_status: Optional[str]):
+        """Keep the active quiz counter in step with transitions"""
+        if not self.stats or old_status == new_status:
+            return
+        if new_status == 'active':
+            self.stats.increment('active_quizzes')
+        elif old_status == 'active':
+            self.stats.increment('active_quizzes', -1)
+
+    async def register(self, session: Dict[str, Any]) -> bool:
+        """Add a new live session and persist it"""
+        now = datetime.now().isoformat()
+        session = {'created_at': now, 'updated_at': now, 'status': 'active', **session}
+        for column in JSON_COLUMNS:
+            session.setdefault(column, {})
+
+        if session['status'] in LIVE_STATUSES:
+            self._index(session)
+            self._track_status(None, session['status'])
+        if self.journal:
+            self.journal.append('open', session)
+
+        return await self._track(self._insert_through(session))
+
+    def _track(self, write: Any) -> Any:
+        """Run a write-through as a task checkpoint() can wait for (a cancelled caller does not cancel it)"""
+        task = asyncio.ensure_future(write)
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+        return asyncio.shield(task)
+
+    async def _insert_through(self, session: Dict[str, Any]) -> bool:
+        """Persist a new session; on failure the next checkpoint inserts it"""
+        session_id = session['session_id']
+        try:
+            return await self.executor.write(self._write, session_id, self._encode(session), True)
+        except Exception as e:
+            logger.error(f"❌ Error persisting session {session_id} (retried at the next checkpoint): {e}")
+            self._unsaved[session_id] = session
+            return False
+
+    def _apply(self, session: Dict[str, Any], updates: Dict[str, Any], data: Optional[Dict[str, Any]]):
+        """Apply column updates and a session_data patch to the in-memory session"""
+        old_status = session.get('status')
+        session.update(updates)
+        if data:
+            session['session_data'] = self._merge_patch(session.get('session_data') or {}, data)
+        new_status = session.get('status')
+
+        self._track_status(old_status, new_status)
+        if new_status not in LIVE_STATUSES:
+            self._unindex(session)
+
+    async def update(self, session_id: str, updates: Dict[str, Any],
+                     data: Optional[Dict[str, Any]] = None) -> bool:
+        """Apply column updates and a session_data patch in memory, then write them through"""
+        updates = {**updates, 'updated_at': datetime.now().isoformat()}
+
+        session = self._by_id.get(session_id)
+        if session is not None:
+            self._apply(session, updates, data)
+        if self.journal:
+            self.journal.append('set', session_id, updates, data)
+
+        return await self._track(self._update_through(session_id, session, updates, data))
+
+    async def _update_through(self, session_id: str, session: Optional[Dict[str, Any]],
+                              updates: Dict[str, Any], data: Optional[Dict[str, Any]]) -> bool:
+        """Write an update through; on failure a live session is staged for the next checkpoint"""
+        row = self._encode(updates)
+        data_patch = serialize_json(data) if data else None
+        try:
+            return await self.executor.write(self._write, session_id, row, False, data_patch)
+        except Exception as e:
+            logger.error(f"❌ Error writing through session {session_id}: {e}")
+            if session is not None:
+                self._mark_dirty(session_id, session, updates, data)
+            return False
+
+    # Staged updates (owner applies in memory, checkpoint() persists)
+    def stage(self, session_id: str, updates: Dict[str, Any],
+              data: Optional[Dict[str, Any]] = None) -> bool:
+        """Apply updates to a live session in memory; the next checkpoint() writes them"""
+        session = self._by_id.get(session_id)
+        if session is None:
+            return False
+
+        updates = {**updates, 'updated_at': datetime.now().isoformat()}
+        self._apply(session, updates, data)
+        self._mark_dirty(session_id, session, updates, data)
+        if self.journal:
+            self.journal.append('set', session_id, updates, data)
+        return True
+
+    def _mark_dirty(self, session_id: str, session: Dict[str, Any], updates: Dict[str, Any],
+                    data: Optional[Dict[str, Any]]):
+        """Remember which columns the next checkpoint has to write"""
+        _, columns = self._dirty.setdefault(session_id, (session, set()))
+        columns.update(column for column in updates if column in SESSION_COLUMNS)
+        if data:
+            columns.add('session_data')
+
+    async def sync(self):
+        """Wait until every change made so far is in the journal on disk"""
+        if self.journal:
+            await self.journal.sync()
+
+    @staticmethod
+    def _write_many(conn: sqlite3.Connection, rows: Dict[str, Dict[str, Any]],
+                    inserts: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """INSERT unsaved sessions and UPDATE several session rows in one transaction (DB thread)"""
+        written = 0
+        try:
+            for session_id, row in (inserts or {}).items():
+                columns = ['session_id', *row]
+                conn.execute(
+                    f"INSERT OR REPLACE INTO vidder_quiz_sessions ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' for _ in columns)})",
+                    (session_id, *row.values())
+                )
+                written += 1
+            for session_id, row in rows.items():
+                cursor = conn.execute(
+                    f"UPDATE vidder_quiz_sessions SET {', '.join(f'{column} = ?' for column in row)} "
+                    f"WHERE session_id = ?",
+                    (*row.values(), session_id)
+                )
+                written += cursor.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return written
+
+    async def checkpoint(self) -> int:
+        """
+        Write every staged change in one transaction; returns sessions written
+
+        Checkpoints run one at a time and first wait for write-throughs already in
+        flight, so when one returns every change made before it was called is committed.
+        """
+        if self._checkpoint_lock is None:
+            self._checkpoint_lock = asyncio.Lock()
+        async with self._checkpoint_lock:
+            if self._writes:
+                await asyncio.wait(list(self._writes))
+            if not self._dirty and not self._unsaved:
+                return 0
+
+            # Snapshot current values: later stages land in a fresh dirty map
+            dirty, self._dirty = self._dirty, {}
+            unsaved, self._unsaved = self._unsaved, {}
+            inserts = {session_id: self._encode(session) for session_id, session in unsaved.items()}
+            rows = {
+                session_id: self._encode({column: session.get(column) for column in columns})
+                for session_id, (session, columns) in dirty.items()
+                if session_id not in inserts
+            }
+            try:
+                return await self.executor.write(self._write_many, rows, inserts)
+            except Exception:
+                # Keep the changes staged so the next checkpoint retries them
+                for session_id, session in unsaved.items():
+                    self._unsaved.setdefault(session_id, session)
+                for session_id, (session, columns) in dirty.items():
+                    _, pending = self._dirty.setdefault(session_id, (session, set()))
+                    pending.update(columns)
+                raise
+
+    def pending_checkpoint(self) -> int:
+        """Sessions with staged changes not yet written"""
+        return len(self._dirty) + len(self._unsaved)
+
+    # Crash recovery
+    @staticmethod
+    def _existing_ids(conn: sqlite3.Connection, session_ids: List[str]) -> Set[str]:
+        """Which of the sessions have a row (DB thread)"""
+        existing = set()
+        for start in range(0, len(session_ids), 500):
+            chunk = session_ids[start:start + 500]
+            existing.update(row[0] for row in conn.execute(
+                f"SELECT session_id FROM vidder_quiz_sessions "
+                f"WHERE session_id IN ({', '.join('?' for _ in chunk)})", chunk
+            ))
+        return existing
+
+    @staticmethod
+    def _insert_many(conn: sqlite3.Connection, rows: Dict[str, Dict[str, Any]]) -> int:
+        """INSERT several session rows in one transaction (DB thread)"""
+        try:
+            for session_id, row in rows.items():
+                columns = ['session_id', *row]
+                conn.execute(
+                    f"INSERT OR REPLACE INTO vidder_quiz_sessions ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' for _ in columns)})",
+                    (session_id, *row.values())
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(rows)
+
+    async def replay(self, records: Iterable[List[Any]]) -> int:
+        """Re-apply journaled 'open' and 'set' records on top of load(); checkpoint() persists them"""
+        records = [record for record in records if record[0] in ('open', 'set')]
+        opened = [record[1]['session_id'] for record in records if record[0] == 'open']
+        existing = await self.executor.read(self._existing_ids, opened) if opened else set()
+
+        inserts: Dict[str, Dict[str, Any]] = {}
+        touched: Set[str] = set()
+        for kind, *fields in records:
+            if kind == 'open':
+                session = dict(fields[0])
+                session_id = session['session_id']
+                # A row means the write-through landed; the database copy is at least as new
+                if session_id in existing or session_id in inserts:
+                    continue
+                for column in JSON_COLUMNS:
+                    session.setdefault(column, {})
+                inserts[session_id] = session
+                if session.get('status') in LIVE_STATUSES:
+                    self._index(session)
+                    self._track_status(None, session['status'])
+                touched.add(session_id)
+            else:
+                session_id, updates, data = fields
+                session = self._by_id.get(session_id)
+                # Not live any more: it ended and was checkpointed before the crash
+                if session is None:
+                    continue
+                self._apply(session, updates, data)
+                self._mark_dirty(session_id, session, updates, data)
+                touched.add(session_id)
+
+        if inserts:
+            # The same dicts later records patched, so each row goes in with its final state
+            await self.executor.write(self._insert_many, {
+                session_id: self._encode(session) for session_id, session in inserts.items()
+            })
+        return len(touched)
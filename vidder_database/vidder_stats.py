@@ -0,0 +1,198 @@
+"""
+📈 VidderTech Live Statistics Counters
+Built by VidderTech - The Future of Quiz Bots
+
+Incrementally maintained bot statistics with:
+- Totals seeded once at startup, then updated as events are written
+- Daily / weekly active users without scanning vidder_users
+- O(1) snapshot for /stats and the admin panel
+- Periodic roll-up into vidder_bot_stats
+"""
+
+import asyncio
+import sqlite3
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from .vidder_executor import VidderDatabaseExecutor
+
+# Initialize logger
+logger = logging.getLogger('vidder.database.stats')
+
+# Window for weekly active users
+ACTIVE_WEEK_DAYS = 7
+
+class VidderStatsCounters:
+    """📈 VidderTech Incremental Statistics"""
+
+    def __init__(self, executor: VidderDatabaseExecutor, rollup_interval: float = 300.0):
+        """Initialize empty counters (seeded by start())"""
+        self.executor = executor
+        self.rollup_interval = rollup_interval
+
+        self.totals = {
+            'total_users': 0,
+            'premium_users': 0,
+            'total_quizzes': 0,
+            'active_quizzes': 0,
+            'total_questions': 0,
+            'total_responses': 0
+        }
+
+        # Active-user tracking: last day each user was seen, and how many users were last seen per day
+        self._today = date.today()
+        self._last_seen: Dict[int, date] = {}
+        self._day_counts: Dict[date, int] = {}
+
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    # Seeding
+    @staticmethod
+    def _load(conn: sqlite3.Connection, since: str) -> Dict[str, Any]:
+        """One-time COUNT(*) seed and recent-activity scan (DB thread)"""
+        def count(sql: str) -> int:
+            return conn.execute(sql).fetchone()[0]
+
+        totals = {
+            'total_users': count("SELECT COUNT(*) FROM vidder_users"),
+            'premium_users': count("SELECT COUNT(*) FROM vidder_users WHERE is_premium = 1"),
+            'total_quizzes': count("SELECT COUNT(*) FROM vidder_quizzes"),
+            # Running sessions (one quiz can run in several chats), as the session registry counts them
+            'active_quizzes': count("SELECT COUNT(*) FROM vidder_quiz_sessions WHERE status = 'active'"),
+            'total_questions': count("SELECT COUNT(*) FROM vidder_questions"),
+            'total_responses': count("SELECT COUNT(*) FROM vidder_responses")
+        }
+        recent = conn.execute(
+            "SELECT user_id, last_active FROM vidder_users WHERE last_active >= ?", (since,)
+        ).fetchall()
+        return {'totals': totals, 'recent': [(row[0], row[1]) for row in recent]}
+
+    async def load(self):
+        """Seed counters from the database"""
+        since = (date.today() - timedelta(days=ACTIVE_WEEK_DAYS - 1)).isoformat()
+        seed = await self.executor.read(self._load, since)
+
+        self.totals.update(seed['totals'])
+        for user_id, last_active in seed['recent']:
+            try:
+                self.record_activity(user_id, datetime.fromisoformat(last_active).date())
+            except (TypeError, ValueError):
+                continue
+
+        self._loaded = True
+        logger.info(
+            f"📈 Stats seeded: {self.totals['total_users']} users, "
+            f"{self.totals['total_responses']} responses, {self.active_today()} active today"
+        )
+
+    # Increments
+    def increment(self, counter: str, amount: int = 1):
+        """Adjust a total counter"""
+        self.totals[counter] = self.totals.get(counter, 0) + amount
+
+    def record_activity(self, user_id: int, day: Optional[date] = None):
+        """Mark a user active on a day (defaults to today)"""
+        today = date.today()
+        if today != self._today:
+            self._rollover(today)
+
+        day = day or today
+        previous = self._last_seen.get(user_id)
+        if previous is not None and previous >= day:
+            return
+
+        if previous is not None:
+            self._day_counts[previous] -= 1
+        self._last_seen[user_id] = day
+        self._day_counts[day] = self._day_counts.get(day, 0) + 1
+
+    def _rollover(self, today: date):
+        """Forget users not seen within the weekly window (once per day)"""
+        cutoff = today - timedelta(days=ACTIVE_WEEK_DAYS - 1)
+        self._last_seen = {uid: day for uid, day in self._last_seen.items() if day >= cutoff}
+        self._day_counts = {day: n for day, n in self._day_counts.items() if day >= cutoff}
+        self._today = today
+
+    # Reads
+    def active_today(self) -> int:
+        """Distinct users active today"""
+        return self._day_counts.get(date.today(), 0)
+
+    def active_week(self) -> int:
+        """Distinct users active in the last seven days"""
+        today = date.today()
+        return sum(self._day_counts.get(today - timedelta(days=i), 0) for i in range(ACTIVE_WEEK_DAYS))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current statistics, served from memory"""
+        return {
+            **self.totals,
+            'active_today': self.active_today(),
+            'active_week': self.active_week(),
+            'last_updated': datetime.now().isoformat()
+        }
+
+    # Roll-up
+    @staticmethod
+    def _write_rollup(conn: sqlite3.Connection, snapshot: Dict[str, Any]):
+        """Upsert today's row in vidder_bot_stats (DB thread)"""
+        values = (
+            snapshot['total_users'], snapshot['active_today'], snapshot['premium_users'],
+            snapshot['total_quizzes'], snapshot['active_quizzes'], snapshot['total_questions'],
+            snapshot['total_responses'], snapshot['last_updated']
+        )
+        today = date.today().isoformat()
+
+        cursor = conn.execute("""
+            UPDATE vidder_bot_stats SET
+                total_users = ?, active_users = ?, premium_users = ?,
+                total_quizzes = ?, active_quizzes = ?, total_questions = ?,
+                total_responses = ?, updated_at = ?
+            WHERE date = ?
+        """, (*values, today))
+        if cursor.rowcount == 0:
+            conn.execute("""
+                INSERT INTO vidder_bot_stats
+                (total_users, active_users, premium_users, total_quizzes, active_quizzes,
+                 total_questions, total_responses, updated_at, date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (*values, today))
+        conn.commit()
+
+    async def rollup(self):
+        """Persist the current snapshot into vidder_bot_stats"""
+        if self._loaded:
+            await self.executor.write(self._write_rollup, self.snapshot())
+
+    async def _rollup_loop(self):
+        """Periodic roll-up task"""
+        while True:
+            await asyncio.sleep(self.rollup_interval)
+            try:
+                await self.rollup()
+            except Exception as e:
+                logger.error(f"❌ Stats roll-up error: {e}")
+
+    async def start(self):
+        """Seed counters and start periodic roll-up"""
+        if not self._loaded:
+            await self.load()
+        if self._task is None:
+            self._task = asyncio.create_task(self._rollup_loop())
+
+    async def stop(self):
+        """Stop roll-up task and write a final snapshot"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.rollup()
+        except Exception as e:
+            logger.error(f"❌ Final stats roll-up error: {e}")
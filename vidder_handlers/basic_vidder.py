@@ -20,6 +20,7 @@ from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
 from telegram.constants import ParseMode
 
 from vidder_config import config, Messages, CallbackData
+from vidder_database.vidder_database import db_manager
 
 # Initialize logger
 logger = logging.getLogger('vidder.handlers.basic')
@@ -168,16 +169,20 @@ class VidderBasicHandlers:
         try:
             user_id = update.effective_user.id
             
-            # Mock statistics (will be replaced with real database calls)
+            # Live counters maintained in memory by the database layer
+            bot_stats = await db_manager.get_bot_stats()
+            
             stats_message = f"""
 📊 **VidderTech Analytics Dashboard**
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 🌟 **Global Statistics:**
-👥 Total Users: `50,000+`
-📝 Total Quizzes: `25,000+`
-❓ Total Questions: `500,000+`
-⚡ Active Quizzes: `1,200+`
+👥 Total Users: `{bot_stats.get('total_users', 0):,}`
+🟢 Active Today / This Week: `{bot_stats.get('active_today', 0):,}` / `{bot_stats.get('active_week', 0):,}`
+📝 Total Quizzes: `{bot_stats.get('total_quizzes', 0):,}`
+❓ Total Questions: `{bot_stats.get('total_questions', 0):,}`
+✍️ Total Responses: `{bot_stats.get('total_responses', 0):,}`
+⚡ Active Quizzes: `{bot_stats.get('active_quizzes', 0):,}`
 
 👤 **Your Statistics:**
 🎯 Quizzes Created: `0`
@@ -28,6 +28,8 @@ from telegram.constants import ParseMode, ChatAction
 
 from vidder_config import config, messages, states, callbacks
 from vidder_database.vidder_database import db_manager
+from vidder_core.vidder_scheduler import vidder_scheduler, VidderTimer
+from vidder_core.vidder_actors import vidder_actors
 
 # Setup logging
 logger = logging.getLogger('vidder.handlers.control')
@@ -64,8 +66,8 @@ class VidderQuizControlHandlers:
             user_id = update.effective_user.id
             chat_id = update.effective_chat.id
             
-            # Find active quiz session in this chat
-            active_session = await self._get_active_quiz_session(chat_id)
+            # Find live (active or paused) quiz session in this chat
+            active_session = await self._get_current_quiz_session(chat_id)
             
             if not active_session:
                 await update.message.reply_text(
@@ -117,21 +119,9 @@ class VidderQuizControlHandlers:
             questions_completed = current_question
             questions_remaining = quiz.get('total_questions', 0) - current_question
             
-            # Update session status
-            pause_updates = {
-                'status': 'paused',
-                'paused_at': pause_time.isoformat(),
-                'session_data': json.dumps({
-                    **json.loads(session.get('session_data', '{}')),
-                    'pause_reason': 'manual',
-                    'pause_duration_start': pause_time.isoformat(),
-                    'questions_at_pause': current_question
-                })
-            }
-            
-            success = await db_manager.update_quiz_session(session_id, pause_updates)
-            if not success:
-                await update.message.reply_text("❌ Failed to pause quiz. Please try again.")
+            # Applied by the chat's actor, in order with other commands, answers and timer ticks
+            if not await vidder_actors.ask(update.effective_chat.id, self._apply_pause, session_id, pause_time):
+                await update.message.reply_text("⏸️ This quiz is no longer running, so there is nothing to pause.")
                 return
             
             # Create comprehensive pause confirmation
@@ -208,7 +198,7 @@ class VidderQuizControlHandlers:
             await self._notify_participants_pause(session, quiz, pause_time)
             
             # Log analytics
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "quiz_paused",
                 update.effective_user.id,
                 quiz_id=quiz_id,
@@ -270,38 +260,16 @@ class VidderQuizControlHandlers:
             session_id = session['session_id']
             quiz_id = session['quiz_id']
             
-            # Calculate pause duration
-            paused_at = session.get('paused_at')
-            resume_time = datetime.now()
-            
-            pause_duration = None
-            if paused_at:
-                try:
-                    pause_start = datetime.fromisoformat(paused_at)
-                    pause_duration = (resume_time - pause_start).total_seconds()
-                except:
-                    pause_duration = 0
-            
             # Get quiz details
             quiz = await db_manager.get_quiz(quiz_id)
             current_question = session.get('current_question', 0)
             
-            # Prepare resume data
-            resume_updates = {
-                'status': 'active',
-                'resumed_at': resume_time.isoformat(),
-                'session_data': json.dumps({
-                    **json.loads(session.get('session_data', '{}')),
-                    'resume_time': resume_time.isoformat(),
-                    'pause_duration_seconds': pause_duration,
-                    'total_pause_time': json.loads(session.get('session_data', '{}')).get('total_pause_time', 0) + (pause_duration or 0)
-                })
-            }
-            
-            # Update session
-            success = await db_manager.update_quiz_session(session_id, resume_updates)
-            if not success:
-                await update.message.reply_text("❌ Failed to resume quiz. Please try again.")
+            # Applied by the chat's actor; the question timer continues from the time it had left
+            pause_duration = await vidder_actors.ask(
+                update.effective_chat.id, self._apply_resume, session_id, datetime.now(), quiz or {}
+            )
+            if pause_duration is None:
+                await update.message.reply_text("▶️ This quiz is not paused any more.")
                 return
             
             # Format pause duration for display
@@ -370,13 +338,10 @@ class VidderQuizControlHandlers:
             # Notify all participants
             await self._notify_participants_resume(session, quiz, pause_duration_str)
             
-            # Continue quiz execution
-            await self._continue_quiz_execution(context, session)
-            
             # Log analytics
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "quiz_resumed",
-                user_id,
+                update.effective_user.id,
                 quiz_id=quiz_id,
                 session_id=session_id,
                 metadata={
@@ -659,8 +624,8 @@ class VidderQuizControlHandlers:
                 
                 # Premium feature for lightning speed
                 if multiplier >= 3.0:
-                    user_data = await db_manager.get_user(update.effective_user.id)
-                    if not user_data or not user_data.get('is_premium'):
+                    access = await db_manager.get_user_access(update.effective_user.id)
+                    if not access or not access.is_premium:
                         button_text += " 💎"
                 
                 keyboard.append([
@@ -719,24 +684,12 @@ class VidderQuizControlHandlers:
         try:
             session_id = session['session_id']
             quiz_id = session['quiz_id']
-            old_speed = session.get('speed_multiplier', 1.0)
-            
-            # Update session speed
-            speed_updates = {
-                'speed_multiplier': new_speed,
-                'session_data': json.dumps({
-                    **json.loads(session.get('session_data', '{}')),
-                    'speed_changes': json.loads(session.get('session_data', '{}')).get('speed_changes', []) + [{
-                        'timestamp': datetime.now().isoformat(),
-                        'old_speed': old_speed,
-                        'new_speed': new_speed,
-                        'changed_by': update.effective_user.id
-                    }]
-                })
-            }
-            
-            success = await db_manager.update_quiz_session(session_id, speed_updates)
-            if not success:
+            
+            # Applied by the chat's actor; the change itself is recorded in analytics below
+            old_speed = await vidder_actors.ask(
+                update.effective_chat.id, self._apply_speed, session_id, new_speed, update.effective_user.id
+            )
+            if old_speed is None:
                 await update.message.reply_text("❌ Failed to change quiz speed.")
                 return
             
@@ -820,7 +773,7 @@ class VidderQuizControlHandlers:
             await self._notify_participants_speed_change(session, old_speed, new_speed, speed_name)
             
             # Log analytics
-            await db_manager._log_analytics(
+            db_manager._log_analytics(
                 "quiz_speed_changed",
                 update.effective_user.id,
                 quiz_id=quiz_id,
@@ -828,6 +781,7 @@ class VidderQuizControlHandlers:
                 metadata={
                     "old_speed": old_speed,
                     "new_speed": new_speed,
+                    "changed_by": update.effective_user.id,
                     "speed_name": speed_name,
                     "new_time_per_question": new_time_per_question
                 }
@@ -837,65 +791,163 @@ class VidderQuizControlHandlers:
             logger.error(f"❌ Error executing speed change: {e}")
             await update.message.reply_text("❌ Error changing quiz speed.")
     
-    # Helper Methods
+    # Answers
     
-    async def _get_active_quiz_session(self, chat_id: int) -> Optional[Dict[str, Any]]:
-        """Get active quiz session for a chat"""
+    async def record_answer(self, chat_id: int, response_data: Dict[str, Any]) -> bool:
+        """Record a quiz answer through the chat's actor; True once it is journaled"""
         try:
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM vidder_quiz_sessions 
-                    WHERE group_id = ? AND status = 'active'
-                    ORDER BY created_at DESC LIMIT 1
-                """, (chat_id,))
-                
-                row = cursor.fetchone()
-                if row:
-                    session_data = dict(row)
-                    # Parse JSON fields
-                    if session_data.get('session_data'):
-                        session_data['session_data'] = json.loads(session_data['session_data'])
-                    if session_data.get('answers'):
-                        session_data['answers'] = json.loads(session_data['answers'])
-                    return session_data
-                
-                return None
-                
+            # Ordered with /stop and timer ticks: the board cannot be finished mid-answer
+            return await vidder_actors.ask(chat_id, db_manager.apply_response, response_data) is not None
         except Exception as e:
-            logger.error(f"❌ Error getting active session: {e}")
+            logger.error(f"❌ Error recording answer in chat {chat_id}: {e}")
+            return False
+    
+    # Session State (runs inside the chat's actor)
+    
+    def _apply_pause(self, session_id: str, pause_time: datetime) -> bool:
+        """Pause a running session and freeze its question timer"""
+        session = db_manager.sessions.get_by_id(session_id)
+        if not session or session['status'] != 'active':
+            return False
+        
+        # The scheduler keeps the time the question had left
+        vidder_scheduler.pause(session_id)
+        return db_manager.sessions.stage(session_id, {
+            'status': 'paused',
+            'paused_at': pause_time.isoformat()
+        }, data={
+            'pause_reason': 'manual',
+            'pause_duration_start': pause_time.isoformat(),
+            'questions_at_pause': session.get('current_question', 0)
+        })
+    
+    def _apply_resume(self, session_id: str, resume_time: datetime, quiz: Dict[str, Any]) -> Optional[float]:
+        """Resume a paused session; returns how long it was paused (seconds)"""
+        session = db_manager.sessions.get_by_id(session_id)
+        if not session or session['status'] != 'paused':
             return None
+        
+        pause_duration = 0.0
+        if session.get('paused_at'):
+            try:
+                pause_duration = (resume_time - datetime.fromisoformat(session['paused_at'])).total_seconds()
+            except ValueError:
+                pass
+        
+        db_manager.sessions.stage(session_id, {'status': 'active'}, data={
+            'resume_time': resume_time.isoformat(),
+            'pause_duration_seconds': pause_duration,
+            'total_pause_time': (session.get('session_data') or {}).get('total_pause_time', 0) + pause_duration
+        })
+        self._continue_quiz_execution(session, quiz)
+        return pause_duration
     
-    async def _get_paused_quiz_session(self, chat_id: int) -> Optional[Dict[str, Any]]:
-        """Get paused quiz session for a chat"""
-        try:
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM vidder_quiz_sessions 
-                    WHERE group_id = ? AND status = 'paused'
-                    ORDER BY paused_at DESC LIMIT 1
-                """, (chat_id,))
-                
-                row = cursor.fetchone()
-                if row:
-                    return dict(row)
-                
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Error getting paused session: {e}")
+    def _apply_speed(self, session_id: str, new_speed: float, changed_by: int) -> Optional[float]:
+        """Re-rate a running session's question timer; returns the previous speed"""
+        session = db_manager.sessions.get_by_id(session_id)
+        if not session or session['status'] != 'active':
             return None
+        
+        old_speed = session.get('speed_multiplier', 1.0)
+        vidder_scheduler.rerate(session_id, new_speed)
+        db_manager.sessions.stage(session_id, {'speed_multiplier': new_speed}, data={
+            'speed_changes': (session.get('session_data') or {}).get('speed_changes', []) + [{
+                'timestamp': datetime.now().isoformat(),
+                'old_speed': old_speed,
+                'new_speed': new_speed,
+                'changed_by': changed_by
+            }]
+        })
+        return old_speed
+    
+    def _apply_question_timeout(self, timer: VidderTimer):
+        """Move a running session to its next question, or complete it after the last one"""
+        session = db_manager.sessions.get_by_id(timer.key)
+        # Paused (or stopped) after the timer fired but before this tick was applied
+        if not session or session['status'] != 'active':
+            return
+        
+        next_question = (session.get('current_question') or 0) + 1
+        total_questions = session.get('total_questions') or 0
+        # Without a question count there is no next question to move to, so the quiz ends here
+        if not total_questions or next_question >= total_questions:
+            # Final ranks are written once, with the completion
+            results, standings = db_manager.scoreboards.finish(session)
+            db_manager.sessions.stage(timer.key, {
+                **results,
+                'current_question': next_question,
+                'status': 'completed',
+                'completed_at': datetime.now().isoformat()
+            }, data=standings)
+        else:
+            db_manager.sessions.stage(timer.key, {'current_question': next_question})
+            self._schedule_question_timer(timer.key, timer.payload, timer.rate)
+    
+    def _apply_recovered(self, session_id: str):
+        """Give a session recovered after a restart a fresh timer for its current question"""
+        session = db_manager.sessions.get_by_id(session_id)
+        if session and session['status'] == 'active' and session_id not in vidder_scheduler:
+            self._continue_quiz_execution(session, {})
+    
+    # Question Timers
+    
+    def resume_live_sessions(self) -> int:
+        """Restart question timers for every active session after a restart (paused ones wait for /resume)"""
+        resumed = 0
+        for session in db_manager.sessions.get_all():
+            if session['status'] != 'active':
+                continue
+            chat_id = session.get('group_id') or session.get('participant_id')
+            vidder_actors.tell(chat_id, self._apply_recovered, session['session_id'])
+            resumed += 1
+        
+        if resumed:
+            logger.info(f"▶️ Restarting question timers for {resumed} recovered quizzes")
+        return resumed
+    
+    def _schedule_question_timer(self, session_id: str, base_time: float, speed: float):
+        """Start the timer that moves a session to its next question"""
+        vidder_scheduler.schedule(
+            session_id, base_time, self._on_question_timeouts,
+            payload=base_time, rate=speed or 1.0
+        )
+    
+    def _continue_quiz_execution(self, session: Dict[str, Any], quiz: Dict[str, Any]):
+        """Resume the paused question timer, or start a full one if none survived (e.g. a restart)"""
+        session_id = session['session_id']
+        if vidder_scheduler.resume(session_id):
+            return
+        if not session.get('total_questions'):
+            # The timer could never tell when the quiz is over
+            logger.warning(f"⚠️ Session {session_id} has no question count; not starting a question timer")
+            return
+        self._schedule_question_timer(
+            session_id,
+            quiz.get('time_per_question') or config.DEFAULT_QUESTION_TIME,
+            session.get('speed_multiplier', 1.0)
+        )
+    
+    async def _on_question_timeouts(self, timers: List[VidderTimer]):
+        """Hand each expired question timer to its chat's actor (one tick's batch)"""
+        for timer in timers:
+            session = db_manager.sessions.get_by_id(timer.key)
+            if session:
+                chat_id = session.get('group_id') or session.get('participant_id')
+                vidder_actors.tell(chat_id, self._apply_question_timeout, timer)
+    
+    # Helper Methods
+    
+    async def _get_active_quiz_session(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """Get active quiz session for a chat (served from the session registry)"""
+        return db_manager.sessions.get_active(chat_id)
+    
+    async def _get_paused_quiz_session(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """Get paused quiz session for a chat (served from the session registry)"""
+        return db_manager.sessions.get_paused(chat_id)
     
     async def _get_current_quiz_session(self, chat_id: int) -> Optional[Dict[str, Any]]:
         """Get current (active or paused) quiz session"""
-        # Try active first
-        session = await self._get_active_quiz_session(chat_id)
-        if session:
-            return session
-        
-        # Try paused
-        return await self._get_paused_quiz_session(chat_id)
+        return db_manager.sessions.get(chat_id)
 
 # Register all control handlers
 def register_control_handlers(app):
@@ -911,6 +963,7 @@ def register_control_handlers(app):
     app.add_handler(CommandHandler("normal", handler.normal_quiz_command))
     
     logger.info("✅ VidderTech Control Handlers registered successfully")
+    return handler
 
 # Export handler class
 __all__ = ['VidderQuizControlHandlers', 'register_control_handlers']
\ No newline at end of file
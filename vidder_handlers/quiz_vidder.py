@@ -169,7 +169,8 @@ async def handle_quiz_creation_text(update: Update, context: ContextTypes.DEFAUL
     """Handle text input during quiz creation"""
     try:
         state = context.user_data.get('vidder_state')
-        text = update.message.text.strip()
+        # Titles and questions are stored without the words the user filters out
+        text = (await vidder_db.apply_user_filters(update.effective_user.id, update.message.text)).strip()
         
         if state == QuizStates.CREATING_QUIZ:
             # Handle title input
@@ -10,10 +10,9 @@ Advanced utility functions and helpers for:
 - Performance optimization
 """
 
-from .text_processor_vidder import VidderTextProcessor
-from .vidder_helpers import VidderHelpers
-from .security_vidder import VidderSecurity
-from .lang_vidder import VidderLanguage
+from .text_processor_vidder import VidderTextProcessor, vidder_text_processor
+from .filter_engine_vidder import VidderFilterAutomaton, compile_filters
+from .fingerprint_vidder import VidderQuestionFingerprint, fingerprint_question
 
 # Version info
 __version__ = "2.0.0"
@@ -22,7 +21,9 @@ __author__ = "VidderTech Utils Team"
 # Export main components
 __all__ = [
     'VidderTextProcessor',
-    'VidderHelpers',
-    'VidderSecurity', 
-    'VidderLanguage'
+    'vidder_text_processor',
+    'VidderFilterAutomaton',
+    'compile_filters',
+    'VidderQuestionFingerprint',
+    'fingerprint_question'
 ]
\ No newline at end of file
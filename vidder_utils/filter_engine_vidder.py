@@ -0,0 +1,181 @@
+"""
+🧹 VidderTech Filter Engine
+Built by VidderTech - The Future of Quiz Bots
+
+Compiled content filters with:
+- Aho-Corasick automaton for plain words (one scan, any number of words)
+- str.find per word for small sets, where C-level scans beat a Python loop
+- "regex:" entries compiled once per filter set (no re module cache lookups or evictions)
+- Compiled filters cached by filter set, shared by users with the same set
+"""
+
+import re
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Pattern, Tuple
+
+# Initialize logger
+logger = logging.getLogger('vidder.filter_engine')
+
+# Entries with this prefix are regular expressions; everything else is a literal
+REGEX_PREFIX = 'regex:'
+
+# Distinct filter sets kept compiled
+FILTER_CACHE_SIZE = 256
+
+# Below this many words one str.find pass per word is faster than walking the automaton
+AUTOMATON_MIN_WORDS = 128
+
+class VidderFilterAutomaton:
+    """🧹 Compiled filter set: removes every literal and pattern match in two passes"""
+
+    __slots__ = ('words', 'patterns', '_delta', '_out', '_compiled')
+
+    def __init__(self, filters: Iterable[str]):
+        """Split filters into literals and regexes and compile both"""
+        words = set()
+        patterns = set()
+        for entry in filters:
+            if not entry:
+                continue
+            if entry.startswith(REGEX_PREFIX):
+                if entry[len(REGEX_PREFIX):]:
+                    patterns.add(entry[len(REGEX_PREFIX):])
+            else:
+                words.add(entry)
+
+        self.words: Tuple[str, ...] = tuple(sorted(words))
+        self.patterns: Tuple[str, ...] = tuple(sorted(patterns))
+
+        # Full transition table (goto plus failure links folded in) and, per state,
+        # the length of the longest word ending there (0: none)
+        self._delta: List[Dict[str, int]] = []
+        self._out: List[int] = []
+        if len(self.words) >= AUTOMATON_MIN_WORDS:
+            self._build_automaton()
+
+        self._compiled: Tuple[Pattern, ...] = self._compile_patterns(self.patterns)
+
+    def _build_automaton(self):
+        """Build the trie, link failure transitions breadth-first and fold them into a DFA"""
+        goto: List[Dict[str, int]] = [{}]
+        out = [0]
+        for word in self.words:
+            state = 0
+            for ch in word:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    out.append(0)
+                state = next_state
+            out[state] = len(word)
+
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{}] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Parents are finished before children, so the failure state's row is complete
+            if state:
+                delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                # A state's own word is its longest; otherwise inherit the longest suffix word
+                if not out[child]:
+                    out[child] = out[fail[child]]
+
+        self._delta = delta
+        self._out = out
+
+    @staticmethod
+    def _compile_patterns(patterns: Iterable[str]) -> Tuple[Pattern, ...]:
+        """
+        Compile each pattern once, skipping invalid ones
+        
+        Patterns run one after another: sre gains nothing from a combined
+        alternation (it disables per-pattern prefix scans), and separate
+        patterns keep user backreferences and inline flags meaningful.
+        """
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                logger.warning(f"⚠️ Skipping invalid filter pattern {pattern!r}: {e}")
+        return tuple(compiled)
+
+    @staticmethod
+    def _add_span(spans: List[Tuple[int, int]], start: int, end: int):
+        """Append a span, absorbing earlier spans it overlaps or touches"""
+        while spans and start <= spans[-1][1]:
+            start = min(start, spans.pop()[0])
+        spans.append((start, end))
+
+    def find_words(self, text: str) -> List[Tuple[int, int]]:
+        """Merged (start, end) spans covered by any literal word"""
+        if not self.words:
+            return []
+        if not self._delta:
+            return self._find_words_small(text)
+
+        delta, out = self._delta, self._out
+        spans: List[Tuple[int, int]] = []
+        state = 0
+        for end, ch in enumerate(text, 1):
+            state = delta[state].get(ch, 0)
+            length = out[state]
+            if length:
+                self._add_span(spans, end - length, end)
+        return spans
+
+    def _find_words_small(self, text: str) -> List[Tuple[int, int]]:
+        """Same spans as the automaton, one str.find scan per word"""
+        found = []
+        for word in self.words:
+            index = text.find(word)
+            while index != -1:
+                found.append((index, index + len(word)))
+                index = text.find(word, index + 1)
+        if not found:
+            return []
+
+        found.sort()
+        spans: List[Tuple[int, int]] = [found[0]]
+        for start, end in found[1:]:
+            if start <= spans[-1][1]:
+                if end > spans[-1][1]:
+                    spans[-1] = (spans[-1][0], end)
+            else:
+                spans.append((start, end))
+        return spans
+
+    def apply(self, text: str) -> str:
+        """Remove every filtered word, then every filtered pattern"""
+        spans = self.find_words(text)
+        if spans:
+            pieces = []
+            position = 0
+            for start, end in spans:
+                pieces.append(text[position:start])
+                position = end
+            pieces.append(text[position:])
+            text = ''.join(pieces)
+
+        for compiled in self._compiled:
+            text = compiled.sub('', text)
+        return text
+
+    def __len__(self) -> int:
+        return len(self.words) + len(self.patterns)
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def compile_filters(filters: FrozenSet[str]) -> VidderFilterAutomaton:
+    """Compiled automaton for a filter set (cached by the set's hash)"""
+    automaton = VidderFilterAutomaton(filters)
+    logger.debug(f"🧹 Compiled filter set: {len(automaton.words)} words, {len(automaton.patterns)} patterns")
+    return automaton
@@ -8,26 +8,206 @@ Advanced text processing system with:
 - Multi-format support
 - Smart validation
 - Content optimization
+- Streaming bulk import from files and chunk iterators
+- Process-pool parallel parsing for large imports
 """
 
+import os
 import re
+import codecs
+import asyncio
+import inspect
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, AsyncIterator, Deque, Iterable, Optional, Tuple, Union
+
+from .filter_engine_vidder import compile_filters
+from .fingerprint_vidder import fingerprint_question
 from datetime import datetime
 
 # Initialize logger
 logger = logging.getLogger('vidder.text_processor')
 
+# Patterns are compiled once at import, not per line or per call
+QUESTION_PATTERNS = {
+    'mcq': re.compile(r'^(.+\?)\s*\n((?:[A-Za-z]\)\s*.+\n?)+)$'),
+    'true_false': re.compile(r'^(.+\?)\s*\n(?:A\)\s*True|True)\s*([✅❌]?)\s*\n(?:B\)\s*False|False)\s*([✅❌]?)$'),
+    'fill_blank': re.compile(r'^(.+)(_____+)(.*)$')
+}
+
+# Option lines open with a letter and ")"; explanations with "Explanation:", "Explain:" or "Note:"
+OPTION_LETTERS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz')
+EXPLANATION_RE = re.compile(r'(?:explanation|explain|note):', re.IGNORECASE)
+
+# "[1/10]" counters and "Question 3:" prefixes left over from forwarded quizzes
+# (two literal-prefixed patterns scan faster than one alternation)
+QUIZ_COUNTER_RE = re.compile(r'\[\d+/\d+\]')
+QUIZ_NUMBER_RE = re.compile(r'Question\s+\d+:', re.IGNORECASE)
+
+# Zero-width characters are dropped; CR, VT, FF, NEL and Unicode line/paragraph separators become "\n"
+ZERO_WIDTH_CHARS = '\u200b\u200c\u200d\u2060\ufeff'
+LINE_BREAK_CHARS = '\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+NORMALIZE_TABLE = str.maketrans({
+    **dict.fromkeys(ZERO_WIDTH_CHARS),
+    **dict.fromkeys(LINE_BREAK_CHARS, '\n')
+})
+# str.translate is slow on non-ASCII text, so it only runs when one of those characters is present
+NEEDS_NORMALIZE_RE = re.compile(f'[{re.escape(ZERO_WIDTH_CHARS + LINE_BREAK_CHARS)}]')
+
+# Removed when the caller has no filters of their own
+DEFAULT_FILTER_WORDS = frozenset({
+    '@', 'http://', 'https://', 't.me/', 'telegram.me/',
+    'follow us', 'subscribe', 'like', 'share'
+})
+
+# Line token kinds
+TOKEN_QUESTION = 'question'
+TOKEN_OPTION = 'option'
+TOKEN_EXPLANATION = 'explanation'
+TOKEN_TEXT = 'text'
+
+# Most options a question may carry
+MAX_OPTIONS = 6
+
+# Characters (or bytes) requested per read() when streaming from a file-like object
+STREAM_CHUNK_SIZE = 64 * 1024
+
+async def iter_text_chunks(source: Any, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[str]:
+    """Yield text chunks from a str/bytes, a (sync or async) file-like object or a chunk iterator"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def decode(chunk: Union[str, bytes]) -> str:
+        return decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+
+    if isinstance(source, (str, bytes, bytearray)):
+        yield decode(source)
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if inspect.isawaitable(chunk):
+                chunk = await chunk
+            if not chunk:
+                break
+            yield decode(chunk)
+    elif hasattr(source, '__aiter__'):
+        async for chunk in source:
+            yield decode(chunk)
+    else:
+        for chunk in source:
+            yield decode(chunk)
+
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+async def iter_question_blocks(source: Any, delimiter: str = "---",
+                               chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[Tuple[int, int, str]]:
+    """Yield (block_number, offset, block) for every non-empty delimited block, holding one block at a time"""
+    if not delimiter:
+        raise ValueError("Delimiter must not be empty")
+    
+    buffer = ""
+    offset = 0
+    block_number = 0
+    
+    async for chunk in iter_text_chunks(source, chunk_size):
+        # A delimiter may straddle two chunks: rescan only the tail it could start in
+        search_from = max(0, len(buffer) - len(delimiter) + 1)
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(delimiter, search_from)
+            if end == -1:
+                break
+            block_number += 1
+            offset += end + len(delimiter) - start
+            block = buffer[start:end].strip()
+            if block:
+                yield block_number, offset, block
+            start = search_from = end + len(delimiter)
+        buffer = buffer[start:]
+        # Let other handlers run between chunks of a large import
+        await asyncio.sleep(0)
+    
+    block_number += 1
+    offset += len(buffer)
+    block = buffer.strip()
+    if block:
+        yield block_number, offset, block
+
+# Blocks sent to a worker process per task (amortises pickling and IPC)
+PARALLEL_BATCH_SIZE = 250
+
+def _add_fingerprint(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the duplicate-detection fingerprint to a successfully parsed question"""
+    if 'error' not in parsed:
+        parsed['fingerprint'] = fingerprint_question(parsed['question_text'], parsed['options'])
+    return parsed
+
+def _mark_repeat(seen: Dict[int, int], parsed: Dict[str, Any]):
+    """Flag exact repeats inside one import (near duplicates are caught when stored)"""
+    fingerprint = parsed.get('fingerprint')
+    if fingerprint is None:
+        return
+    first = seen.setdefault(fingerprint.exact_hash, parsed['order_index'])
+    if first != parsed['order_index']:
+        parsed['duplicate_of'] = first
+        parsed['similarity'] = 1.0
+
+def _parse_block_batch(batch: List[Tuple[int, int, str]]) -> List[Dict[str, Any]]:
+    """Worker entry point: parse and fingerprint a batch of (block_number, offset, block)"""
+    results = []
+    for block_number, offset, block in batch:
+        parsed = _add_fingerprint(vidder_text_processor.parse_question_block(block))
+        parsed['block_number'] = block_number
+        parsed['offset'] = offset
+        results.append(parsed)
+    return results
+
+def _pool_context():
+    """fork where available: spawn/forkserver would re-import the bot's __main__ (and its database) per worker"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+def tokenize_lines(text: str) -> List[Tuple[str, str]]:
+    """Classify every non-empty line in a single pass: first line is the question"""
+    tokens = []
+    explanation = EXPLANATION_RE.match
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if not tokens:
+            tokens.append((TOKEN_QUESTION, line))
+            continue
+
+        # Dispatch on the first characters so most lines never reach the regex engine
+        if line[1:2] == ')' and line[0] in OPTION_LETTERS:
+            option_text = line[2:].strip()
+            if option_text:
+                tokens.append((TOKEN_OPTION, option_text))
+                continue
+        elif line[0] in 'EeNn':
+            found = explanation(line)
+            if found is not None:
+                tokens.append((TOKEN_EXPLANATION, line[found.end():].strip()))
+                continue
+        tokens.append((TOKEN_TEXT, line))
+    return tokens
+
 class VidderTextProcessor:
     """📝 VidderTech Advanced Text Processing Engine"""
     
-    def __init__(self):
-        """Initialize VidderTech text processor"""
-        self.question_patterns = {
-            'mcq': r'^(.+\?)\s*\n((?:[A-Za-z]\)\s*.+\n?)+)$',
-            'true_false': r'^(.+\?)\s*\n(?:A\)\s*True|True)\s*([✅❌]?)\s*\n(?:B\)\s*False|False)\s*([✅❌]?)$',
-            'fill_blank': r'^(.+)(_____+)(.*)$'
-        }
+    def __init__(self, workers: Optional[int] = None, batch_size: int = PARALLEL_BATCH_SIZE):
+        """Initialize VidderTech text processor (the worker pool is created on first parallel import)"""
+        self.question_patterns = QUESTION_PATTERNS
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self._pool: Optional[ProcessPoolExecutor] = None
         
         logger.info("📝 VidderTech Text Processor initialized")
     
@@ -41,18 +221,21 @@ class VidderTextProcessor:
         - Fill in the blanks
         - Short answer questions
         """
+        return self.parse_question_block(text)
+    
+    def parse_question_block(self, text: str) -> Dict[str, Any]:
+        """Parse one question block (synchronous core of parse_single_question)"""
         try:
-            text = self.clean_text(text)
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
+            tokens = tokenize_lines(self.clean_text(text))
             
-            if len(lines) < 3:
+            if len(tokens) < 3:
                 return {
                     "error": "Invalid format. Need question and at least 2 options.",
                     "suggestion": "Use format: Question?\nA) Option 1\nB) Option 2 ✅"
                 }
             
             # Extract question text
-            question_text = lines[0].strip()
+            question_text = tokens[0][1]
             if not question_text.endswith('?'):
                 question_text += '?'
             
@@ -61,27 +244,20 @@ class VidderTextProcessor:
             correct_answer = -1
             explanation = None
             
-            for i, line in enumerate(lines[1:], 0):
-                line = line.strip()
-                
-                # Check for explanation
-                if line.lower().startswith(('explanation:', 'explain:', 'note:')):
-                    explanation = line.split(':', 1)[1].strip()
+            for kind, value in tokens[1:]:
+                if kind == TOKEN_EXPLANATION:
+                    explanation = value
                     continue
                 
-                # Parse option
-                option_match = re.match(r'^[A-Za-z]\)\s*(.+)$', line)
-                if option_match:
-                    option_text = option_match.group(1).strip()
-                    
+                if kind == TOKEN_OPTION:
                     # Check for correct answer marker
-                    if '✅' in option_text:
-                        option_text = option_text.replace('✅', '').strip()
+                    if '✅' in value:
+                        value = value.replace('✅', '').strip()
                         correct_answer = len(options)
                     
-                    options.append(option_text)
+                    options.append(value)
                     
-                    if len(options) >= 6:  # Max 6 options
+                    if len(options) >= MAX_OPTIONS:
                         break
             
             # Validation
@@ -120,27 +296,118 @@ class VidderTextProcessor:
     async def parse_bulk_questions(self, text: str, delimiter: str = "---") -> List[Dict[str, Any]]:
         """Parse multiple questions from bulk text"""
         try:
-            questions = []
-            question_blocks = text.split(delimiter)
+            questions = [parsed async for parsed in self.iter_bulk_questions(text, delimiter)]
             
-            for i, block in enumerate(question_blocks, 1):
-                block = block.strip()
-                if not block:
+            logger.info(f"📝 Parsed {len(questions)} questions from bulk text")
+            return questions
+            
+        except Exception as e:
+            logger.error(f"❌ Error parsing bulk questions: {e}")
+            return []
+    
+    async def iter_bulk_questions(self, source: Any, delimiter: str = "---",
+                                  chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream parsed questions as soon as each block is complete
+        
+        source may be a str/bytes, a sync or async file-like object (text or
+        binary, read in chunk_size pieces) or a sync/async iterator of chunks.
+        Only the block being assembled is held in memory. Every result carries
+        block_number and order_index (as in parse_bulk_questions) plus offset,
+        the number of input characters consumed so far, for progress reporting.
+        Parsed questions also carry a fingerprint for db_manager.add_questions(),
+        and exact repeats within the import are marked with duplicate_of.
+        """
+        seen: Dict[int, int] = {}
+        order_index = 0
+        async for block_number, offset, block in iter_question_blocks(source, delimiter, chunk_size):
+            parsed = _add_fingerprint(self.parse_question_block(block))
+            parsed['block_number'] = block_number
+            parsed['order_index'] = order_index
+            parsed['offset'] = offset
+            _mark_repeat(seen, parsed)
+            order_index += 1
+            yield parsed
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Worker pool, created lazily and shared by all parallel imports"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+            logger.info(f"📝 Text processor pool started with {self.workers} workers")
+        return self._pool
+    
+    async def iter_bulk_questions_parallel(self, source: Any, delimiter: str = "---",
+                                           chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like iter_bulk_questions, but parse in a process pool
+        
+        Blocks are submitted in batches of batch_size with at most two batches
+        per worker in flight, and results are yielded in input order. The event
+        loop only splits blocks and awaits futures, so chats stay responsive;
+        fingerprints are computed in the workers too.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        in_flight: Deque[asyncio.Future] = deque()
+        max_in_flight = self.workers * 2
+        seen: Dict[int, int] = {}
+        order_index = 0
+        batch: List[Tuple[int, int, str]] = []
+        
+        def submit():
+            in_flight.append(loop.run_in_executor(pool, _parse_block_batch, batch))
+        
+        try:
+            async for item in iter_question_blocks(source, delimiter, chunk_size):
+                batch.append(item)
+                if len(batch) < self.batch_size:
                     continue
+                submit()
+                batch = []
                 
-                parsed = await self.parse_single_question(block)
-                parsed['block_number'] = i
-                parsed['order_index'] = len(questions)
-                
-                questions.append(parsed)
+                # Backpressure: wait for the oldest batch before reading further
+                while len(in_flight) >= max_in_flight:
+                    for parsed in await in_flight.popleft():
+                        parsed['order_index'] = order_index
+                        _mark_repeat(seen, parsed)
+                        order_index += 1
+                        yield parsed
             
-            logger.info(f"📝 Parsed {len(questions)} questions from bulk text")
+            if batch:
+                submit()
+            while in_flight:
+                for parsed in await in_flight.popleft():
+                    parsed['order_index'] = order_index
+                    _mark_repeat(seen, parsed)
+                    order_index += 1
+                    yield parsed
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next import
+            self._pool = None
+            raise
+        finally:
+            # Caller stopped early or a worker failed: drop batches not yet started
+            for future in in_flight:
+                future.cancel()
+    
+    async def parse_bulk_questions_parallel(self, source: Any, delimiter: str = "---") -> List[Dict[str, Any]]:
+        """Parse a large bulk import across worker processes (same results as parse_bulk_questions)"""
+        try:
+            questions = [parsed async for parsed in self.iter_bulk_questions_parallel(source, delimiter)]
+            
+            logger.info(f"📝 Parsed {len(questions)} questions from bulk text with {self.workers} workers")
             return questions
             
         except Exception as e:
-            logger.error(f"❌ Error parsing bulk questions: {e}")
+            logger.error(f"❌ Error parsing bulk questions in parallel: {e}")
             return []
     
+    def close(self):
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+    
     async def validate_question(self, question_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate question using VidderTech standards"""
         try:
@@ -197,36 +464,27 @@ class VidderTextProcessor:
         if not text:
             return ""
         
-        # Remove unwanted characters
-        text = text.replace('\u200c', '')  # Zero-width non-joiner
-        text = text.replace('\u200d', '')  # Zero-width joiner
-        text = text.replace('\ufeff', '')  # Byte order mark
-        
-        # Normalize whitespace
-        text = ' '.join(text.split())
+        # One pass for zero-width characters and every line break flavour
+        if '\r\n' in text:
+            text = text.replace('\r\n', '\n')
+        if NEEDS_NORMALIZE_RE.search(text):
+            text = text.translate(NORMALIZE_TABLE)
         
-        # Remove common quiz artifacts
-        text = re.sub(r'\[\d+/\d+\]', '', text)  # Remove [1/10] patterns
-        text = re.sub(r'Question \d+:', '', text, flags=re.IGNORECASE)
+        # Remove common quiz artifacts ([1/10] counters, "Question 3:" prefixes with any spacing)
+        text = QUIZ_COUNTER_RE.sub('', text)
+        text = QUIZ_NUMBER_RE.sub('', text)
         
-        return text.strip()
+        # Collapse whitespace within each line but keep the line structure
+        return '\n'.join([' '.join(line.split()) for line in text.split('\n')]).strip()
     
-    def remove_unwanted_words(self, text: str, filter_words: List[str] = None) -> str:
-        """Remove unwanted words and patterns"""
+    def remove_unwanted_words(self, text: str, filter_words: Optional[Iterable[str]] = None) -> str:
+        """Remove unwanted words and patterns (compiled once per filter set)"""
         if not filter_words:
-            filter_words = [
-                '@', 'http://', 'https://', 't.me/', 'telegram.me/',
-                'follow us', 'subscribe', 'like', 'share'
-            ]
-        
-        for word in filter_words:
-            if word.startswith('regex:'):
-                pattern = word[6:]
-                text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-            else:
-                text = text.replace(word, '')
+            filter_words = DEFAULT_FILTER_WORDS
+        elif not isinstance(filter_words, frozenset):
+            filter_words = frozenset(filter_words)
         
-        return self.clean_text(text)
+        return self.clean_text(compile_filters(filter_words).apply(text))
     
     def _detect_question_type(self, question: str, options: List[str]) -> str:
         """Detect question type from content"""